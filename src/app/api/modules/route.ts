@@ -14,7 +14,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import prisma from '@/lib/prisma';
 import { ensureDefaultUser } from '@/lib/default-user';
-import { getBatchPrices, getDailyPrices, calculateMA, calculateADX, calculateATR, getMarketRegime, normalizeBatchPricesToGBP } from '@/lib/market-data';
+import { getBatchPrices, getDailyPrices, benchmarkMa200, calculateADX, calculateATR, getMarketRegime, normalizeBatchPricesToGBP } from '@/lib/market-data';
 import { calculateRMultiple } from '@/lib/position-sizer';
 import { getRiskBudget, canPyramid, calculatePyramidAddSize } from '@/lib/risk-gates';
 import { generateStopRecommendations } from '@/lib/stop-manager';
@@ -63,6 +63,9 @@ export async function GET(request: NextRequest) {
 
     // ── Phase 1: DB lookups (parallelised) ──
     const t1 = Date.now();
+    // Single "now" for this request — used as the missing-exitDate fallback
+    // and the 30-day trade window, instead of a fresh Date per row.
+    const requestNow = new Date(t1);
 
     const [user, openPositions, closedPositions, latestScan, activeStocks] =
       await Promise.all([
@@ -139,6 +142,9 @@ export async function GET(request: NextRequest) {
 
     const totalPortfolioValue = enrichedOpen.reduce((s, p) => s + p.value, 0);
 
+    // Stock currency by position id — one pass instead of a find per module row
+    const stockCurrencyById = new Map(openPositions.map(op => [op.id, op.stock.currency]));
+
     // ── Sync CPU-only modules (no network) ──
     const laggards = detectLaggards(
       enrichedOpen.map(p => ({
@@ -151,7 +157,7 @@ export async function GET(request: NextRequest) {
         initialRisk: p.initialRisk,
         shares: p.shares,
         // Currency from the original position's stock record
-        currency: openPositions.find(op => op.id === p.id)?.stock.currency || 'USD',
+        currency: stockCurrencyById.get(p.id) || 'USD',
         sleeve: p.sleeve,
       }))
     );
@@ -165,23 +171,15 @@ export async function GET(request: NextRequest) {
         status: r.status,
       }));
 
-    const heatChecks = runHeatCheck(
-      enrichedOpen.map(p => ({
-        ticker: p.ticker,
-        cluster: p.cluster,
-        rMultiple: p.rMultiple,
-      })),
-      scanCandidates.map(c => ({
-        ticker: c.ticker,
-        cluster: c.cluster,
-        rankScore: c.rankScore,
-      }))
-    );
+    // Enriched positions and scan candidates already carry the ticker,
+    // cluster and momentum fields heat-check reads — pass them through
+    // rather than re-projecting both lists per request
+    const heatChecks = runHeatCheck(enrichedOpen, scanCandidates);
 
     const whipsawBlocks = checkWhipsawBlocks(
       closedPositions.map(p => ({
         ticker: p.stock.ticker,
-        exitDate: p.exitDate || new Date(),
+        exitDate: p.exitDate || requestNow,
         exitReason: p.exitReason,
         whipsawCount: p.whipsawCount ?? 0,
       }))
@@ -203,7 +201,7 @@ export async function GET(request: NextRequest) {
     const t3 = Date.now();
 
     const universeTickers = activeStocks.map(s => s.ticker);
-    const thirtyDaysAgo = new Date(Date.now() - 30 * 24 * 60 * 60 * 1000);
+    const thirtyDaysAgo = new Date(requestNow.getTime() - 30 * 24 * 60 * 60 * 1000);
 
     const [
       regimeResult,
@@ -238,7 +236,7 @@ export async function GET(request: NextRequest) {
           .filter(p => p.exitReason !== 'STOP_HIT' && p.exitProfitR && p.exitProfitR > 0.5)
           .map(p => ({
             ticker: p.stock.ticker,
-            exitDate: p.exitDate || new Date(),
+            exitDate: p.exitDate || requestNow,
             exitProfitR: p.exitProfitR,
             exitReason: p.exitReason,
           }))
@@ -289,7 +287,7 @@ export async function GET(request: NextRequest) {
             select: { id: true },
           });
           if (!latestSnapshot) return [];
-          const heldTickers = new Set(enrichedOpen.map(p => p.ticker));
+          const heldTickers = new Set(openTickers);
           const triggeredRows = await prisma.snapshotTicker.findMany({
             where: {
               snapshotId: latestSnapshot.id,
@@ -364,9 +362,10 @@ export async function GET(request: NextRequest) {
     let dualRegime;
     if (spyBars.length >= 200 && vwrlBars.length >= 200) {
       const spyPrice = spyBars[0].close;
-      const spyMa200 = calculateMA(spyBars.map(b => b.close), 200);
+      // Same symbol-keyed memo getMarketRegime() uses — no full close-array copy
+      const spyMa200 = benchmarkMa200('SPY', spyBars);
       const vwrlPrice = vwrlBars[0].close;
-      const vwrlMa200 = calculateMA(vwrlBars.map(b => b.close), 200);
+      const vwrlMa200 = benchmarkMa200('VWRL.L', vwrlBars);
       dualRegime = detectDualRegime(spyPrice, spyMa200, vwrlPrice, vwrlMa200);
     }
     if (!dualRegime) {
@@ -381,21 +380,15 @@ export async function GET(request: NextRequest) {
 
     // ── Swap suggestions (needs regime) ──
     const swapSuggestions = findSwapSuggestions(
-      enrichedOpen.map(p => ({
-        id: p.id,
-        ticker: p.ticker,
-        cluster: p.cluster,
-        sleeve: p.sleeve,
-        value: p.value,
-        rMultiple: p.rMultiple,
-      })),
+      enrichedOpen,
       scanCandidates,
       totalPortfolioValue,
       riskProfile
     );
 
-    // ── Breadth Safety ──
-    const { maxPositions } = getRiskBudget(
+    // ── Risk budget (breadth safety + action card) ──
+    // Same positions, equity and profile feed both consumers, so compute once
+    const budget = getRiskBudget(
       enrichedOpen.map(p => ({
         id: p.id,
         ticker: p.ticker,
@@ -412,6 +405,10 @@ export async function GET(request: NextRequest) {
       equity,
       riskProfile
     );
+
+    const { maxPositions } = budget;
+
+    // ── Breadth Safety ──
     const breadthSafety = checkBreadthSafety(breadthPct, maxPositions);
 
     // ── Turnover ──
@@ -424,24 +421,6 @@ export async function GET(request: NextRequest) {
       tradeCount30d
     );
 
-    // ── Risk budget for action card ──
-    const budget = getRiskBudget(
-      enrichedOpen.map(p => ({
-        id: p.id,
-        ticker: p.ticker,
-        sleeve: p.sleeve,
-        sector: p.sector,
-        cluster: p.cluster,
-        value: p.value,
-        riskDollars: p.riskDollars,
-        shares: p.shares,
-        entryPrice: p.entryPrice,
-        currentStop: p.currentStop,
-        currentPrice: p.currentPrice,
-      })),
-      equity,
-      riskProfile
-    );
     const riskBudgetPct = budget.maxRiskPercent > 0
       ? (budget.usedRiskPercent / budget.maxRiskPercent) * 100
       : 0;
@@ -473,8 +452,7 @@ export async function GET(request: NextRequest) {
         const atr = atrResult.status === 'fulfilled' ? atrResult.value : null;
         const isUK = p.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.ticker);
         // Use actual stock currency — not just UK/USD binary
-        const stockRecord = openPositions.find(op => op.id === p.id);
-        const priceCurrency = isUK ? 'GBX' : (stockRecord?.stock.currency || 'USD').toUpperCase();
+        const priceCurrency = isUK ? 'GBX' : (stockCurrencyById.get(p.id) || 'USD').toUpperCase();
         const currentAdds = addsMap.get(p.id) ?? 0;
         const pyramidCheck = canPyramid(
           p.currentPrice,
@@ -557,16 +535,20 @@ export async function GET(request: NextRequest) {
       }));
 
     // ── Module Statuses ──
+    // Derive each flag once; the status/summary pair and the response share it
+    const blockedHeatChecks = heatChecks.filter(h => h.blocked);
+    const heatBlocked = blockedHeatChecks.length > 0;
+    const superClusterBreached = superClusterResults.some(s => s.breached);
     const moduleStatuses: ModuleStatus[] = [
       { id: 2, name: 'Early Bird Entry', status: regime === 'BULLISH' ? 'GREEN' : 'INACTIVE', summary: regime === 'BULLISH' ? 'Active — bullish regime' : 'Inactive — not bullish' },
       { id: 3, name: 'Laggard Purge', status: laggards.length > 0 ? 'YELLOW' : 'GREEN', summary: laggards.length > 0 ? `${laggards.length} laggard(s) flagged` : 'No laggards' },
       { id: 5, name: 'Climax Top Exit', status: climaxSignals.length > 0 ? 'RED' : 'GREEN', summary: climaxSignals.length > 0 ? `${climaxSignals.length} climax signal(s)` : 'No climax detected' },
       { id: 7, name: 'Heat-Map Swap', status: swapSuggestions.length > 0 ? 'YELLOW' : 'GREEN', summary: swapSuggestions.length > 0 ? `${swapSuggestions.length} swap(s) suggested` : 'No swaps needed' },
-      { id: 8, name: 'Heat Check', status: heatChecks.some(h => h.blocked) ? 'RED' : 'GREEN', summary: heatChecks.some(h => h.blocked) ? 'Some entries blocked' : 'No concentration issues' },
+      { id: 8, name: 'Heat Check', status: heatBlocked ? 'RED' : 'GREEN', summary: heatBlocked ? 'Some entries blocked' : 'No concentration issues' },
       { id: 9, name: 'Fast-Follower Re-Entry', status: 'DISABLED', summary: 'Disabled — re-entry after stop-hit fights the tape at 4-position account size' },
       { id: 10, name: 'Breadth Safety Valve', status: breadthSafety.isRestricted ? 'RED' : 'GREEN', summary: breadthSafety.reason },
       { id: 11, name: 'Whipsaw Kill Switch', status: whipsawBlocks.length > 0 ? 'RED' : 'GREEN', summary: whipsawBlocks.length > 0 ? `${whipsawBlocks.length} ticker(s) blocked` : 'No blocks active' },
-      { id: 12, name: 'Super-Cluster Cap', status: superClusterResults.some(s => s.breached) ? 'RED' : 'GREEN', summary: superClusterResults.some(s => s.breached) ? 'Breach detected' : 'Within limits' },
+      { id: 12, name: 'Super-Cluster Cap', status: superClusterBreached ? 'RED' : 'GREEN', summary: superClusterBreached ? 'Breach detected' : 'Within limits' },
       { id: 13, name: 'Momentum Expansion', status: 'DISABLED', summary: 'Disabled — procyclical risk expansion, adds risk near end of moves not middle' },
       { id: 14, name: 'Climax Trim/Tighten', status: climaxSignals.length > 0 ? 'YELLOW' : 'GREEN', summary: climaxSignals.length > 0 ? 'Action needed' : 'No action' },
       { id: 15, name: 'Trades Log', status: 'GREEN', summary: `${recentTrades.length} recent trades` },
@@ -585,7 +567,7 @@ export async function GET(request: NextRequest) {
       laggards,
       climaxSignals,
       swapSuggestions,
-      heatChecks: heatChecks.filter(h => h.blocked),
+      heatChecks: blockedHeatChecks,
       fastFollowers,
       breadthSafety,
       whipsawBlocks,
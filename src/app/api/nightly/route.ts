@@ -3,7 +3,7 @@
  * Consumed by: /api/nightly
  * Consumes: health-check.ts, stop-manager.ts, telegram.ts, market-data.ts, equity-snapshot.ts, snapshot-sync.ts, laggard-detector.ts, breakout-failure-detector.ts, alert-service.ts, modules/*, risk-gates.ts, position-sizer.ts, prisma.ts, @/types
  * Risk-sensitive: YES
- * Last modified: 2026-03-01
+ * Last modified: 2026-10-14
  * Notes: API nightly should continue on partial failures.
  */
 export const dynamic = 'force-dynamic';
@@ -17,7 +17,7 @@ import type { NightlyPositionDetail, NightlyStopChange, NightlyReadyCandidate, N
 import { detectBreakoutFailures } from '@/lib/breakout-failure-detector';
 import type { BreakoutFailureResult } from '@/lib/breakout-failure-detector';
 import { sendAlert } from '@/lib/alert-service';
-import { normalizeBatchPricesToGBP, getDailyPrices, calculateADX, calculateATR, preCacheHistoricalData } from '@/lib/market-data';
+import { normalizeBatchPricesToGBP, getDailyPrices, calculateADX, calculateATR, preCacheHistoricalData, displayCurrency } from '@/lib/market-data';
 import { fetchWithFallback, toPriceRecord } from '@/lib/data-provider';
 import type { DataSourceHealth } from '@/lib/data-provider';
 import { recordEquitySnapshot } from '@/lib/equity-snapshot';
@@ -121,8 +121,14 @@ export async function POST(request: NextRequest) {
       console.warn('[Nightly] Live price fetch failed:', (error as Error).message);
     }
     const stockCurrencies: Record<string, string | null> = {};
+    // Display currency per ticker, resolved once (UK tickers quote in GBX) —
+    // the stop, breakout, laggard, pyramid and Telegram steps all reuse it
+    const displayCurrencyByTicker = new Map<string, string>();
     for (const p of positions) {
       stockCurrencies[p.stock.ticker] = p.stock.currency;
+      if (!displayCurrencyByTicker.has(p.stock.ticker)) {
+        displayCurrencyByTicker.set(p.stock.ticker, displayCurrency(p.stock.ticker, p.stock.currency));
+      }
     }
     let gbpPrices: Record<string, number> = {};
     try {
@@ -136,6 +142,16 @@ export async function POST(request: NextRequest) {
       console.warn('[Nightly] FX normalisation failed, using raw prices as fallback:', (error as Error).message);
     }
 
+    // Per-position native + GBP pricing — derived once and shared by swap
+    // enrichment, open risk, pyramids, P&L details and portfolio value below
+    // (matches cron version).
+    const pricingById = new Map<string, { rawPrice: number; gbpPrice: number; fxRatio: number }>();
+    for (const p of positions) {
+      const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
+      const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
+      pricingById.set(p.id, { rawPrice, gbpPrice, fxRatio: rawPrice > 0 ? gbpPrice / rawPrice : 1 });
+    }
+
     // Step 3: Generate R-based stop recommendations
     // Pre-fetch ATRs for open positions so LOCK_1R_TRAIL trailing stops
     // use the same ATR-adjusted formula as the bat-file nightly path.
@@ -175,9 +191,7 @@ export async function POST(request: NextRequest) {
     // when running via API route instead of the .bat file.
     const stopChanges: NightlyStopChange[] = [];
     for (const rec of stopRecs) {
-      const pos = positions.find((p) => p.id === rec.positionId);
-      const isUK = rec.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(rec.ticker);
-      const cur = isUK ? 'GBX' : (pos?.stock.currency || 'USD').toUpperCase();
+      const cur = displayCurrencyByTicker.get(rec.ticker)!;
       try {
         await updateStopLoss(rec.positionId, rec.newStop, rec.reason, rec.newLevel);
         stopChanges.push({
@@ -222,8 +236,7 @@ export async function POST(request: NextRequest) {
     try {
       const bfInput = positions.map((p) => {
         const currentPrice = livePrices[p.stock.ticker];
-        const isUK = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-        const currency = isUK ? 'GBX' : (p.stock.currency || 'USD').toUpperCase();
+        const currency = displayCurrencyByTicker.get(p.stock.ticker)!;
         return {
           id: p.id,
           ticker: p.stock.ticker,
@@ -299,8 +312,7 @@ export async function POST(request: NextRequest) {
     try {
       const laggardInput = positions.map((p) => {
         const currentPrice = livePrices[p.stock.ticker] || p.entryPrice;
-        const isUK = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-        const currency = isUK ? 'GBX' : (p.stock.currency || 'USD').toUpperCase();
+        const currency = displayCurrencyByTicker.get(p.stock.ticker)!;
         return {
           id: p.id,
           ticker: p.stock.ticker,
@@ -366,8 +378,7 @@ export async function POST(request: NextRequest) {
     // Shared data for risk-signal modules
     const riskProfile = (user?.riskProfile || 'BALANCED') as RiskProfileType;
     const enrichedForSwap = positions.map((p) => {
-      const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
-      const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
+      const { rawPrice, gbpPrice } = pricingById.get(p.id)!;
       const rMultiple = calculateRMultiple(rawPrice, p.entryPrice, p.initialRisk);
       return {
         id: p.id,
@@ -385,10 +396,20 @@ export async function POST(request: NextRequest) {
       const latestScan = await prisma.scan.findFirst({
         where: { userId },
         orderBy: { runDate: 'desc' },
-        include: { results: { include: { stock: true } } },
+        // Only READY rows feed the swap check — filter and project in the
+        // query rather than loading every result with its full stock row
+        select: {
+          results: {
+            where: { status: 'READY' },
+            select: {
+              status: true,
+              rankScore: true,
+              stock: { select: { ticker: true, cluster: true } },
+            },
+          },
+        },
       });
       const scanCandidates = (latestScan?.results || [])
-        .filter((r) => r.status === 'READY')
         .map((r) => ({
           ticker: r.stock.ticker,
           cluster: r.stock.cluster || 'General',
@@ -445,11 +466,10 @@ export async function POST(request: NextRequest) {
     try {
       const stocks = await prisma.stock.findMany({ where: { active: true }, select: { ticker: true } });
       const universeTickers = stocks.map((s) => s.ticker);
-      // Sample up to 30 tickers for breadth — avoids 266 sequential Yahoo calls (matches cron version)
-      const sampleSize = Math.min(30, universeTickers.length);
-      const shuffled = [...universeTickers].sort(() => Math.random() - 0.5);
-      const breadthSample = shuffled.slice(0, sampleSize);
-      const breadthPct = breadthSample.length > 0 ? await calculateBreadth(breadthSample) : 100;
+      // calculateBreadth draws its own random 30-ticker sample (partial
+      // Fisher–Yates), so the universe is passed as-is rather than shuffled
+      // and sliced here first (matches cron version)
+      const breadthPct = await calculateBreadth(universeTickers);
 
       const { maxPositions } = getRiskBudget(
         enrichedForSwap.map((p) => ({
@@ -493,9 +513,7 @@ export async function POST(request: NextRequest) {
       const openRisk = positions
         .filter((p) => p.stock.sleeve !== 'HEDGE')
         .reduce((sum, p) => {
-          const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
-          const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
-          const fxRatio = rawPrice > 0 ? gbpPrice / rawPrice : 1;
+          const { gbpPrice, fxRatio } = pricingById.get(p.id)!;
           const currentStopGbp = p.currentStop * fxRatio;
           const risk = Math.max(0, (gbpPrice - currentStopGbp) * p.shares);
           return sum + risk;
@@ -550,13 +568,10 @@ export async function POST(request: NextRequest) {
         );
 
         if (pyramidCheck.allowed) {
-          const isUK = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-          const currency = isUK ? 'GBX' : (p.stock.currency || 'USD').toUpperCase();
+          const currency = displayCurrencyByTicker.get(p.stock.ticker)!;
 
           // Compute scaled add sizing
-          const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
-          const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
-          const fxRatio = rawPrice > 0 ? gbpPrice / rawPrice : 1;
+          const { fxRatio } = pricingById.get(p.id)!;
           const addSizing = calculatePyramidAddSize({
             equity,
             riskProfile,
@@ -595,14 +610,11 @@ export async function POST(request: NextRequest) {
     // Step 6: Build position detail for Telegram
     // Use GBP-normalised prices for consistent cross-currency P&L aggregation
     const positionDetails: NightlyPositionDetail[] = positions.map((p) => {
-      const currentPrice = livePrices[p.stock.ticker] || p.entryPrice;
-      const gbpPrice = gbpPrices[p.stock.ticker] ?? currentPrice;
-      const fxRatio = currentPrice > 0 ? gbpPrice / currentPrice : 1;
+      const { rawPrice: currentPrice, gbpPrice, fxRatio } = pricingById.get(p.id)!;
       const pnlValue = (gbpPrice - p.entryPrice * fxRatio) * p.shares;
       const pnlPercent = p.entryPrice > 0 ? ((currentPrice - p.entryPrice) / p.entryPrice) * 100 : 0;
       const rMultiple = p.initialRisk > 0 ? (currentPrice - p.entryPrice) / p.initialRisk : 0;
-      const isUK = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-      const currency = isUK ? 'GBX' : (p.stock.currency || 'USD').toUpperCase();
+      const currency = displayCurrencyByTicker.get(p.stock.ticker)!;
 
       return {
         ticker: p.stock.ticker,
@@ -639,16 +651,43 @@ export async function POST(request: NextRequest) {
     if (snapshotSync.snapshotId) {
       try {
         // Get tickers the user already holds to exclude them
-        const heldTickers = new Set(positions.map((p) => p.stock.ticker));
-
-        const readyRows = await prisma.snapshotTicker.findMany({
-          where: {
-            snapshotId: snapshotSync.snapshotId,
-            status: 'READY',
-          },
-          orderBy: { distanceTo20dHighPct: 'asc' },
-          take: 15,
-        });
+        const heldTickers = new Set(openTickers);
+
+        // The two snapshot queries are independent — run them concurrently, but
+        // settle each on its own so one failing doesn't drop the other's results
+        const [readyResult, triggeredResult] = await Promise.allSettled([
+          prisma.snapshotTicker.findMany({
+            where: {
+              snapshotId: snapshotSync.snapshotId,
+              status: 'READY',
+            },
+            orderBy: { distanceTo20dHighPct: 'asc' },
+            take: 15,
+          }),
+          prisma.snapshotTicker.findMany({
+            where: {
+              snapshotId: snapshotSync.snapshotId,
+              status: { in: ['READY', 'WATCH'] },
+              entryTrigger: { gt: 0 },
+              adx14: { gte: 20 },
+            },
+            orderBy: { distanceTo20dHighPct: 'asc' },
+            select: {
+              ticker: true, name: true, sleeve: true, close: true, entryTrigger: true,
+              stopLevel: true, atr14: true, adx14: true, currency: true,
+            },
+          }),
+        ]);
+        if (readyResult.status === 'rejected') {
+          hadFailure = true;
+          console.warn('[Nightly] Failed to query READY tickers:', (readyResult.reason as Error).message);
+        }
+        if (triggeredResult.status === 'rejected') {
+          hadFailure = true;
+          console.warn('[Nightly] Failed to query trigger-met tickers:', (triggeredResult.reason as Error).message);
+        }
+        const readyRows = readyResult.status === 'fulfilled' ? readyResult.value : [];
+        const allTriggeredRows = triggeredResult.status === 'fulfilled' ? triggeredResult.value : [];
 
         readyToBuy = readyRows
           .filter((r) => !heldTickers.has(r.ticker) && r.adx14 >= 20)
@@ -669,15 +708,11 @@ export async function POST(request: NextRequest) {
           }));
 
         // Detect trigger-met candidates: close >= entryTrigger and not already held
-        const allTriggeredRows = await prisma.snapshotTicker.findMany({
-          where: {
-            snapshotId: snapshotSync.snapshotId,
-            status: { in: ['READY', 'WATCH'] },
-          },
-          orderBy: { distanceTo20dHighPct: 'asc' },
-        });
+        // Scalar thresholds are applied in the query above and only the columns the
+        // candidate needs are loaded; the held-ticker and close-vs-trigger checks
+        // (a column comparison) stay in JS.
         triggerMetCandidates = allTriggeredRows
-          .filter((r) => !heldTickers.has(r.ticker) && r.close >= r.entryTrigger && r.entryTrigger > 0 && r.adx14 >= 20)
+          .filter((r) => !heldTickers.has(r.ticker) && r.close >= r.entryTrigger)
           .map((r) => ({
             ticker: r.ticker,
             name: r.name || r.ticker,
@@ -709,12 +744,8 @@ export async function POST(request: NextRequest) {
         stopsUpdated: stopRecs.length,
         readyCandidates: readyToBuy.length,
         alerts,
-        // Portfolio value in GBP for multi-currency consistency
-        portfolioValue: positions.reduce((sum, p) => {
-          const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
-          const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
-          return sum + gbpPrice * p.shares;
-        }, 0),
+        // Portfolio value in GBP (same sum as the swap enrichment above)
+        portfolioValue: totalPortfolioValue,
         dailyChange: 0,
         dailyChangePercent: 0,
         equity,
@@ -13,6 +13,13 @@ interface DistributionItem {
   color?: string;
 }
 
+// Sleeve code → distribution label; anything unlisted is bucketed as High-Risk
+const SLEEVE_LABELS = new Map<string, string>([
+  ['CORE', 'Core Stocks'],
+  ['ETF', 'Core ETFs'],
+  ['HEDGE', 'Hedge'],
+]);
+
 function buildDistribution(items: Array<{ key: string; value: number }>, maxItems = 6): DistributionItem[] {
   const sorted = [...items].sort((a, b) => b.value - a.value);
   const head = sorted.slice(0, maxItems);
@@ -124,14 +131,7 @@ export async function GET(request: NextRequest) {
     const levelMap = new Map<string, number>();
 
     for (const p of enriched) {
-      const sleeveLabel =
-        p.sleeve === 'CORE'
-          ? 'Core Stocks'
-          : p.sleeve === 'ETF'
-          ? 'Core ETFs'
-          : p.sleeve === 'HEDGE'
-          ? 'Hedge'
-          : 'High-Risk';
+      const sleeveLabel = SLEEVE_LABELS.get(p.sleeve) ?? 'High-Risk';
       sleeveMap.set(sleeveLabel, (sleeveMap.get(sleeveLabel) || 0) + p.value);
 
       // Use sector as fallback when cluster is missing
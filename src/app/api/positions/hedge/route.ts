@@ -26,10 +26,8 @@ export async function GET(request: NextRequest) {
         status: 'OPEN',
         stock: { sleeve: 'HEDGE' },
       },
-      include: {
-        stock: true,
-        stopHistory: { orderBy: { createdAt: 'desc' }, take: 3 },
-      },
+      // stopHistory isn't part of the hedge response — don't join it
+      include: { stock: true },
       orderBy: { updatedAt: 'desc' },
     });
 
@@ -70,10 +68,11 @@ export async function GET(request: NextRequest) {
 
       const value = currentPriceGBP * shares;
       const pnl = (currentPriceGBP - entryPriceGBP) * shares;
-      const pnlPercent = p.entryPrice > 0 ? ((rawPrice - p.entryPrice) / p.entryPrice) * 100 : 0;
-      // R-multiple uses raw native prices (currency-independent)
+      // Native price move feeds both % change and R-multiple (currency-independent)
+      const priceMove = rawPrice - p.entryPrice;
+      const pnlPercent = p.entryPrice > 0 ? (priceMove / p.entryPrice) * 100 : 0;
       const initialRisk = p.entryPrice - p.stopLoss;
-      const rMultiple = initialRisk > 0 ? (rawPrice - p.entryPrice) / initialRisk : 0;
+      const rMultiple = initialRisk > 0 ? priceMove / initialRisk : 0;
       const currentLevel = (p.protectionLevel || 'INITIAL') as ProtectionLevel;
 
       // Calculate stop guidance using native prices (currency-independent)
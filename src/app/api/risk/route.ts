@@ -47,10 +47,14 @@ export async function GET(request: NextRequest) {
 
     const enriched = await Promise.all(positions.map(async (p) => {
       const currentPriceRaw = livePrices[p.stock.ticker] || p.entryPrice;
-      const currentPriceGbp = gbpPrices[p.stock.ticker]
-        ?? await normalizePriceToGBP(currentPriceRaw, p.stock.ticker, p.stock.currency);
-      const entryPriceGbp = await normalizePriceToGBP(p.entryPrice, p.stock.ticker, p.stock.currency);
-      const currentStopGbp = await normalizePriceToGBP(p.currentStop, p.stock.ticker, p.stock.currency);
+      // The three conversions are independent — run them concurrently so a
+      // cold FX lookup costs one round-trip per position, not three
+      const [currentPriceGbp, entryPriceGbp, currentStopGbp] = await Promise.all([
+        gbpPrices[p.stock.ticker]
+          ?? normalizePriceToGBP(currentPriceRaw, p.stock.ticker, p.stock.currency),
+        normalizePriceToGBP(p.entryPrice, p.stock.ticker, p.stock.currency),
+        normalizePriceToGBP(p.currentStop, p.stock.ticker, p.stock.currency),
+      ]);
       const fxRatio = currentPriceRaw > 0 ? currentPriceGbp / currentPriceRaw : 1;
       const rMultiple = calculateRMultiple(currentPriceRaw, p.entryPrice, p.initialRisk);
       const initialStop = p.entryPrice - p.initialRisk;
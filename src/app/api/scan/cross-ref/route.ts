@@ -6,6 +6,7 @@ import type { ScanCandidate } from '@/types';
 import { apiError } from '@/lib/api-response';
 import { getPassedGateCounts, reconstructCandidatesFromDbRows } from '@/lib/scan-db-reconstruction';
 import { calcBPSFromSnapshot, computeRsPercentiles } from '@/lib/breakout-probability';
+import { createCsvScoreCache } from '@/lib/csv-score-cache';
 import * as fs from 'fs';
 import * as path from 'path';
 
@@ -17,6 +18,8 @@ const PLANNING_LOCAL = path.resolve(process.cwd(), 'Planning');
 const PLANNING_DIR = fs.existsSync(PLANNING_SIBLING) ? PLANNING_SIBLING : PLANNING_LOCAL;
 const CSV_PATH = path.join(PLANNING_DIR, 'master_snapshot.csv');
 
+const loadScoredCsv = createCsvScoreCache();
+
 function splitCSVLine(line: string): string[] {
   const result: string[] = [];
   let current = '';
@@ -45,8 +48,9 @@ function parseCSV(text: string): Record<string, string>[] {
     const values = splitCSVLine(lines[i]);
     if (values.length < 2) continue;
     const row: Record<string, string> = {};
+    // splitCSVLine already trims every field — no second pass needed
     headers.forEach((h, j) => {
-      row[h] = (values[j] ?? '').trim();
+      row[h] = values[j] ?? '';
     });
     rows.push(row);
   }
@@ -118,14 +122,15 @@ async function getDualScoreTickers(): Promise<ScoredTicker[]> {
     }
   }
 
-  // Fallback to CSV
+  // Fallback to CSV — reuse the scored rows while the file is unchanged
   if (fs.existsSync(CSV_PATH)) {
-    const csvText = fs.readFileSync(CSV_PATH, 'utf-8');
-    const rawRows = parseCSV(csvText);
-    const snapshotRows: SnapshotRow[] = rawRows.map((r) =>
-      normaliseRow(r as unknown as Record<string, unknown>)
-    );
-    return scoreAll(snapshotRows);
+    return loadScoredCsv(CSV_PATH, (csvText) => {
+      const rawRows = parseCSV(csvText);
+      const snapshotRows: SnapshotRow[] = rawRows.map((r) =>
+        normaliseRow(r as unknown as Record<string, unknown>)
+      );
+      return scoreAll(snapshotRows);
+    }).scored;
   }
   return [];
 }
@@ -166,17 +171,29 @@ async function getScanDataWithFallback(): Promise<CachedScanResult | null> {
     // Reconstruct scan result shape from DB rows
     const candidates = reconstructCandidatesFromDbRows(latestScan.results);
 
-    const passedFilters = candidates.filter((c) => c.passesAllFilters);
     const gateCounts = getPassedGateCounts(candidates);
 
+    // Status counts in one pass over the reconstructed candidates
+    let passedFilters = 0;
+    let readyCount = 0;
+    let watchCount = 0;
+    let farCount = 0;
+    for (const c of candidates) {
+      if (c.status === 'FAR') farCount++;
+      if (!c.passesAllFilters) continue;
+      passedFilters++;
+      if (c.status === 'READY') readyCount++;
+      else if (c.status === 'WATCH') watchCount++;
+    }
+
     const dbResult: CachedScanResult = {
       regime: latestScan.regime,
       candidates,
-      readyCount: passedFilters.filter((c) => c.status === 'READY').length,
-      watchCount: passedFilters.filter((c) => c.status === 'WATCH').length,
-      farCount: candidates.filter((c) => c.status === 'FAR').length,
+      readyCount,
+      watchCount,
+      farCount,
       totalScanned: candidates.length,
-      passedFilters: passedFilters.length,
+      passedFilters,
       passedRiskGates: gateCounts.passedRiskGates,
       passedAntiChase: gateCounts.passedAntiChase,
       cachedAt: latestScan.runDate.toISOString(),
@@ -247,6 +264,15 @@ interface CrossRefTicker {
   };
 }
 
+// Match-type sort order — module-level so it is built once, not per request
+const MATCH_TYPE_ORDER: Record<CrossRefTicker['matchType'], number> = {
+  BOTH_RECOMMEND: 0,
+  CONFLICT: 1,
+  SCAN_ONLY: 2,
+  DUAL_ONLY: 3,
+  BOTH_REJECT: 4,
+};
+
 export async function GET() {
   try {
     // ── Load both datasets ──────────────────────────────────
@@ -397,34 +423,35 @@ export async function GET() {
       });
     }
 
-    // Sort: trigger-met first → BOTH_RECOMMEND → others, then by agreement score desc
-    const typeOrder: Record<string, number> = {
-      BOTH_RECOMMEND: 0,
-      CONFLICT: 1,
-      SCAN_ONLY: 2,
-      DUAL_ONLY: 3,
-      BOTH_REJECT: 4,
-    };
-    crossRef.sort((a, b) => {
+    // Sort: trigger-met first → BOTH_RECOMMEND → others, then by agreement score desc.
+    // The group code is computed once per row, so comparisons are integer compares.
+    const keyed = crossRef.map((row) => {
       // Trigger-met candidates float to the very top (actionable now)
-      const aTriggerMet = a.scanPrice != null && a.scanEntryTrigger != null && a.scanPrice >= a.scanEntryTrigger;
-      const bTriggerMet = b.scanPrice != null && b.scanEntryTrigger != null && b.scanPrice >= b.scanEntryTrigger;
-      if (aTriggerMet !== bTriggerMet) return aTriggerMet ? -1 : 1;
-      // Then by match type
-      const oa = typeOrder[a.matchType] ?? 5;
-      const ob = typeOrder[b.matchType] ?? 5;
-      if (oa !== ob) return oa - ob;
-      return b.agreementScore - a.agreementScore;
+      const triggerMet = row.scanPrice != null && row.scanEntryTrigger != null && row.scanPrice >= row.scanEntryTrigger;
+      const group = (triggerMet ? 0 : 10) + (MATCH_TYPE_ORDER[row.matchType] ?? 5);
+      return { row, group };
     });
+    keyed.sort((a, b) => a.group - b.group || b.row.agreementScore - a.row.agreementScore);
+    for (let i = 0; i < keyed.length; i++) crossRef[i] = keyed[i].row;
 
     // ── Summary stats ───────────────────────────────────────
+    // One pass over crossRef tallies every match type
+    const matchCounts: Record<CrossRefTicker['matchType'], number> = {
+      BOTH_RECOMMEND: 0,
+      SCAN_ONLY: 0,
+      DUAL_ONLY: 0,
+      BOTH_REJECT: 0,
+      CONFLICT: 0,
+    };
+    for (const row of crossRef) matchCounts[row.matchType]++;
+
     const summary = {
       total: crossRef.length,
-      bothRecommend: crossRef.filter((c) => c.matchType === 'BOTH_RECOMMEND').length,
-      conflict: crossRef.filter((c) => c.matchType === 'CONFLICT').length,
-      scanOnly: crossRef.filter((c) => c.matchType === 'SCAN_ONLY').length,
-      dualOnly: crossRef.filter((c) => c.matchType === 'DUAL_ONLY').length,
-      bothReject: crossRef.filter((c) => c.matchType === 'BOTH_REJECT').length,
+      bothRecommend: matchCounts.BOTH_RECOMMEND,
+      conflict: matchCounts.CONFLICT,
+      scanOnly: matchCounts.SCAN_ONLY,
+      dualOnly: matchCounts.DUAL_ONLY,
+      bothReject: matchCounts.BOTH_REJECT,
       hasScanData: !!hasScanData,
       hasDualData,
       scanCachedAt: scanCache?.cachedAt ?? null,
@@ -264,6 +264,19 @@ export async function GET() {
 
     const passedFilters = candidates.filter((c) => c.passesAllFilters);
 
+    // Tally the summary counts in one pass — pass flags are boolean | undefined,
+    // so a plain truthiness test matches the old `=== true` filters.
+    let readyCount = 0;
+    let watchCount = 0;
+    let passedRiskGates = 0;
+    let passedAntiChase = 0;
+    for (const c of passedFilters) {
+      if (c.status === 'READY') readyCount++;
+      else if (c.status === 'WATCH' || c.status === 'WAIT_PULLBACK') watchCount++;
+      if (c.passesRiskGates) passedRiskGates++;
+      if (c.passesAntiChase) passedAntiChase++;
+    }
+
     // Look up actual user profile/equity so DB fallback uses real values
     const scanUser = await prisma.user.findUnique({
       where: { id: latestScan.userId },
@@ -273,13 +286,13 @@ export async function GET() {
     const dbResult = {
       regime: latestScan.regime,
       candidates,
-      readyCount: passedFilters.filter((c) => c.status === 'READY').length,
-      watchCount: passedFilters.filter((c) => c.status === 'WATCH' || c.status === 'WAIT_PULLBACK').length,
+      readyCount,
+      watchCount,
       farCount: candidates.filter((c) => c.status === 'FAR').length,
       totalScanned: candidates.length,
       passedFilters: passedFilters.length,
-      passedRiskGates: passedFilters.filter((c) => c.passesRiskGates === true).length,
-      passedAntiChase: passedFilters.filter((c) => c.passesAntiChase === true).length,
+      passedRiskGates,
+      passedAntiChase,
       cachedAt: latestScan.runDate.toISOString(),
       userId: latestScan.userId,
       riskProfile: scanUser?.riskProfile || 'BALANCED',
@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import prisma from '@/lib/prisma';
 import { scoreAll, normaliseRow, type SnapshotRow, type ScoredTicker } from '@/lib/dual-score';
 import { apiError } from '@/lib/api-response';
+import { createCsvScoreCache } from '@/lib/csv-score-cache';
 import * as fs from 'fs';
 import * as path from 'path';
 
@@ -13,6 +14,8 @@ const PLANNING_LOCAL = path.resolve(process.cwd(), 'Planning');
 const PLANNING_DIR = fs.existsSync(PLANNING_SIBLING) ? PLANNING_SIBLING : PLANNING_LOCAL;
 const CSV_PATH = path.join(PLANNING_DIR, 'master_snapshot.csv');
 
+const loadScoredCsv = createCsvScoreCache();
+
 // ── CSV parser (handles quoted fields) ──────────────────────
 function splitCSVLine(line: string): string[] {
   const result: string[] = [];
@@ -42,8 +45,9 @@ function parseCSV(text: string): Record<string, string>[] {
     const values = splitCSVLine(lines[i]);
     if (values.length < 2) continue;
     const row: Record<string, string> = {};
+    // splitCSVLine already trims every field — no second pass needed
     headers.forEach((h, j) => {
-      row[h] = (values[j] ?? '').trim();
+      row[h] = values[j] ?? '';
     });
     rows.push(row);
   }
@@ -97,16 +101,30 @@ function dbRowToSnapshotRow(row: Record<string, unknown>): SnapshotRow {
 
 // ── Helper: build standard API response from scored tickers ──
 function buildResponse(scored: ScoredTicker[], updatedAt: string, source: string) {
-  const autoYes = scored.filter((r) => r.NCS >= 70 && r.FWS <= 30).length;
-  const autoNo = scored.filter((r) => r.FWS > 65).length;
+  // One pass for the classification counts, score sums and filter options —
+  // no intermediate filtered/mapped arrays per summary field
+  let autoYes = 0;
+  let autoNo = 0;
+  let sumNCS = 0;
+  let sumBQS = 0;
+  let sumFWS = 0;
+  const sleeveSet = new Set<string>();
+  const statusSet = new Set<string>();
+  for (const r of scored) {
+    if (r.NCS >= 70 && r.FWS <= 30) autoYes++;
+    if (r.FWS > 65) autoNo++;
+    sumNCS += r.NCS;
+    sumBQS += r.BQS;
+    sumFWS += r.FWS;
+    if (r.sleeve) sleeveSet.add(r.sleeve);
+    if (r.status) statusSet.add(r.status);
+  }
   const conditional = scored.length - autoYes - autoNo;
-  const avg = (arr: ScoredTicker[], key: 'NCS' | 'BQS' | 'FWS') =>
-    arr.length > 0
-      ? Math.round((arr.reduce((s, r) => s + r[key], 0) / arr.length) * 10) / 10
-      : 0;
+  const avg = (sum: number) =>
+    scored.length > 0 ? Math.round((sum / scored.length) * 10) / 10 : 0;
 
-  const sleeves = Array.from(new Set(scored.map((r) => r.sleeve).filter(Boolean))).sort();
-  const statuses = Array.from(new Set(scored.map((r) => r.status).filter(Boolean))).sort();
+  const sleeves = Array.from(sleeveSet).sort();
+  const statuses = Array.from(statusSet).sort();
 
   return {
     tickers: scored,
@@ -115,9 +133,9 @@ function buildResponse(scored: ScoredTicker[], updatedAt: string, source: string
       autoYes,
       autoNo,
       conditional,
-      avgNCS: avg(scored, 'NCS'),
-      avgBQS: avg(scored, 'BQS'),
-      avgFWS: avg(scored, 'FWS'),
+      avgNCS: avg(sumNCS),
+      avgBQS: avg(sumBQS),
+      avgFWS: avg(sumFWS),
     },
     filters: { sleeves, statuses },
     source,
@@ -162,17 +180,18 @@ export async function GET(request: NextRequest) {
 
     // ── Strategy 2: Fallback to CSV file ────────────────────
     if (fs.existsSync(CSV_PATH)) {
-      const stat = fs.statSync(CSV_PATH);
-      const csvText = fs.readFileSync(CSV_PATH, 'utf-8');
-      const rawRows = parseCSV(csvText);
-      const snapshotRows: SnapshotRow[] = rawRows.map((r) =>
-        normaliseRow(r as unknown as Record<string, unknown>)
-      );
-      const scored = scoreAll(snapshotRows);
-      scored.sort((a, b) => b.NCS - a.NCS);
+      const { scored, mtime } = loadScoredCsv(CSV_PATH, (csvText) => {
+        const rawRows = parseCSV(csvText);
+        const snapshotRows: SnapshotRow[] = rawRows.map((r) =>
+          normaliseRow(r as unknown as Record<string, unknown>)
+        );
+        const rows = scoreAll(snapshotRows);
+        rows.sort((a, b) => b.NCS - a.NCS);
+        return rows;
+      });
 
       return NextResponse.json(
-        buildResponse(scored, stat.mtime.toISOString(), 'csv')
+        buildResponse(scored, mtime.toISOString(), 'csv')
       );
     }
 
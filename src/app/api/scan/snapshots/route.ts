@@ -15,8 +15,9 @@ function parseCSV(text: string): Record<string, string>[] {
     const values = splitCSVLine(lines[i]);
     if (values.length < 2) continue;
     const row: Record<string, string> = {};
+    // splitCSVLine already trims every field — no second pass needed
     headers.forEach((h, j) => {
-      row[h] = (values[j] ?? '').trim();
+      row[h] = values[j] ?? '';
     });
     rows.push(row);
   }
@@ -170,13 +171,11 @@ export async function POST(request: NextRequest) {
         rawJson: JSON.stringify(raw),
       }));
 
-      // SQLite doesn't support createMany efficiently, so batch in chunks
-      const BATCH = 50;
-      for (let i = 0; i < tickerData.length; i += BATCH) {
-        const batch = tickerData.slice(i, i + BATCH);
-        for (const data of batch) {
-          await tx.snapshotTicker.create({ data });
-        }
+      // SQLite doesn't support createMany efficiently, so insert row by row.
+      // Inserts already run sequentially inside this one transaction, so the
+      // rows are walked in place rather than copied into per-chunk slices.
+      for (let i = 0; i < tickerData.length; i++) {
+        await tx.snapshotTicker.create({ data: tickerData[i] });
       }
 
       return snap;
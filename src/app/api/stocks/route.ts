@@ -55,14 +55,14 @@ export async function GET(request: NextRequest) {
       orderBy: [{ sleeve: 'asc' }, { sector: 'asc' }, { ticker: 'asc' }],
     });
 
-    // Build summary stats
-    const summary = {
-      total: stocks.length,
-      core: stocks.filter((s) => s.sleeve === 'CORE').length,
-      etf: stocks.filter((s) => s.sleeve === 'ETF').length,
-      highRisk: stocks.filter((s) => s.sleeve === 'HIGH_RISK').length,
-      hedge: stocks.filter((s) => s.sleeve === 'HEDGE').length,
-    };
+    // Build summary stats — one pass, each stock's sleeve compared once
+    const summary = { total: stocks.length, core: 0, etf: 0, highRisk: 0, hedge: 0 };
+    for (const s of stocks) {
+      if (s.sleeve === 'CORE') summary.core++;
+      else if (s.sleeve === 'ETF') summary.etf++;
+      else if (s.sleeve === 'HIGH_RISK') summary.highRisk++;
+      else if (s.sleeve === 'HEDGE') summary.hedge++;
+    }
 
     // Stock list changes infrequently — cache for 5 minutes, serve stale for 1 min while revalidating
     return NextResponse.json({ stocks, summary }, {
@@ -20,6 +20,31 @@ import * as path from 'path';
 // PUT  — Apply trailing stop recommendations (auto-update stops)
 // ============================================================
 
+// Ticker variants used by CSV ↔ DB matching, derived once per ticker
+// so the pairwise match does no string allocation.
+interface TickerMatchKey {
+  raw: string;
+  upper: string;
+  endsLowerL: boolean;
+  endsDotL: boolean;
+  upperWithoutLastChar: string;
+  withoutDotL: string;
+  upperWithoutDotL: string;
+}
+
+function tickerMatchKey(ticker: string): TickerMatchKey {
+  const withoutDotL = ticker.replace('.L', '');
+  return {
+    raw: ticker,
+    upper: ticker.toUpperCase(),
+    endsLowerL: ticker.endsWith('l'),
+    endsDotL: ticker.endsWith('.L'),
+    upperWithoutLastChar: ticker.slice(0, -1).toUpperCase(),
+    withoutDotL,
+    upperWithoutDotL: withoutDotL.toUpperCase(),
+  };
+}
+
 /**
  * GET — Generate trailing ATR stop recommendations
  * Calculates where trailing stops SHOULD be based on price action + ATR
@@ -117,27 +142,24 @@ export async function POST(request: NextRequest) {
       newStop: number;
     }[] = [];
 
+    const positionKeys = positions.map((p) => ({ position: p, key: tickerMatchKey(p.stock.ticker) }));
+
     for (const csvRow of csvStops) {
       // Match by ticker — handle .L suffix and T212 lowercase-l format
-      const matchedPosition = positions.find((p) => {
-        const dbTicker = p.stock.ticker;
-        const csv = csvRow.ticker;
-        if (dbTicker === csv) return true;
-        if (dbTicker.toUpperCase() === csv.toUpperCase()) return true;
+      const csv = tickerMatchKey(csvRow.ticker);
+      const matchedPosition = positionKeys.find(({ key: db }) => {
+        if (db.raw === csv.raw) return true;
+        if (db.upper === csv.upper) return true;
         // T212: BATSl → BATS.L
-        if (dbTicker.endsWith('l') && csv.endsWith('.L')) {
-          if (dbTicker.slice(0, -1).toUpperCase() === csv.replace('.L', '').toUpperCase()) return true;
-        }
+        if (db.endsLowerL && csv.endsDotL && db.upperWithoutLastChar === csv.upperWithoutDotL) return true;
         // Reverse
-        if (csv.endsWith('l') && dbTicker.endsWith('.L')) {
-          if (csv.slice(0, -1).toUpperCase() === dbTicker.replace('.L', '').toUpperCase()) return true;
-        }
+        if (csv.endsLowerL && db.endsDotL && csv.upperWithoutLastChar === db.upperWithoutDotL) return true;
         // Strip .L
-        if (dbTicker.replace('.L', '') === csv.replace('.L', '')) return true;
+        if (db.withoutDotL === csv.withoutDotL) return true;
         // GSK (csv) matches GSKl (db)
-        if (dbTicker.endsWith('l') && dbTicker.slice(0, -1).toUpperCase() === csv.toUpperCase()) return true;
+        if (db.endsLowerL && db.upperWithoutLastChar === csv.upper) return true;
         return false;
-      });
+      })?.position;
 
       if (!matchedPosition) continue;
 
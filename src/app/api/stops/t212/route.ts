@@ -2,7 +2,7 @@ export const dynamic = 'force-dynamic';
 
 import { NextRequest, NextResponse } from 'next/server';
 import prisma from '@/lib/prisma';
-import { Trading212Client, Trading212Error } from '@/lib/trading212';
+import { Trading212Client, Trading212Error, type T212PendingOrder } from '@/lib/trading212';
 import type { T212AccountType } from '@/lib/trading212-dual';
 import { ensureDefaultUser } from '@/lib/default-user';
 import { updateStopLoss, StopLossError } from '@/lib/stop-manager';
@@ -120,14 +120,22 @@ export async function GET(request: NextRequest) {
     }
 
     // Collect results, keyed by account type
-    const stopOrdersByAccount = new Map<T212AccountType, Awaited<ReturnType<Trading212Client['getPendingOrders']>>>();
+    const stopOrdersByAccount = new Map<T212AccountType, T212PendingOrder[]>();
     const fetchResults = await Promise.allSettled(
       pendingOrderFetches.map(async ({ acctType, promise }) => ({ acctType, orders: await promise }))
     );
+    // Per-account ticker → first stop order, so each position match is a
+    // lookup instead of a scan of that account's orders
+    const stopOrderByTicker = new Map<T212AccountType, Map<string, T212PendingOrder>>();
     for (const result of fetchResults) {
       if (result.status === 'fulfilled') {
         const stops = result.value.orders.filter((o) => o.type === 'STOP' && o.side === 'SELL');
         stopOrdersByAccount.set(result.value.acctType, stops);
+        const byTicker = new Map<string, T212PendingOrder>();
+        for (const o of stops) {
+          if (!byTicker.has(o.ticker)) byTicker.set(o.ticker, o);
+        }
+        stopOrderByTicker.set(result.value.acctType, byTicker);
       }
     }
 
@@ -135,8 +143,7 @@ export async function GET(request: NextRequest) {
     const matched = await Promise.all(positions.map(async (pos) => {
       const posAcctType: T212AccountType = pos.accountType === 'isa' ? 'isa' : 'invest';
       const t212Ticker = pos.t212Ticker || pos.stock.t212Ticker || '';
-      const accountStops = stopOrdersByAccount.get(posAcctType) ?? [];
-      const matchedOrder = accountStops.find((o) => o.ticker === t212Ticker);
+      const matchedOrder = stopOrderByTicker.get(posAcctType)?.get(t212Ticker);
       const t212Stop = matchedOrder?.stopPrice ?? 0;
 
       // If T212 has a higher stop than the DB, sync the DB UP (monotonic)
@@ -180,9 +187,8 @@ export async function GET(request: NextRequest) {
 
     // Collect unmatched stop orders across all accounts
     const allStopOrders = Array.from(stopOrdersByAccount.values()).flat();
-    const unmatched = allStopOrders.filter(
-      (o) => !positions.some((p) => (p.t212Ticker || p.stock.t212Ticker) === o.ticker)
-    );
+    const positionT212Tickers = new Set(positions.map((p) => p.t212Ticker || p.stock.t212Ticker));
+    const unmatched = allStopOrders.filter((o) => !positionT212Tickers.has(o.ticker));
 
     return NextResponse.json({
       positions: matched,
@@ -593,15 +599,31 @@ export async function PUT(request: NextRequest) {
       }
     }
 
-    const accountCorrectedCount = results.filter((r) => r.action === 'PLACED_ACCOUNT_CORRECTED').length;
+    // Tally outcomes in one pass — each action is classified once instead of
+    // being re-tested by a separate filter per summary bucket.
+    let placedCount = 0;
+    let accountCorrectedCount = 0;
+    let skippedCount = 0;
+    let staleCount = 0;
+    let notOwnedCount = 0;
+    let failedCount = 0;
+    for (const { action } of results) {
+      if (action === 'PLACED') placedCount++;
+      else if (action === 'PLACED_ACCOUNT_CORRECTED') { placedCount++; accountCorrectedCount++; }
+      else if (action === 'STALE_STOP') staleCount++;
+      else if (action.startsWith('SKIPPED')) {
+        skippedCount++;
+        if (action === 'SKIPPED_NOT_OWNED') notOwnedCount++;
+      } else if (action.startsWith('FAILED')) failedCount++;
+    }
 
     return NextResponse.json({
       total: positions.length,
-      placed: results.filter((r) => r.action === 'PLACED' || r.action === 'PLACED_ACCOUNT_CORRECTED').length,
-      skipped: results.filter((r) => r.action.startsWith('SKIPPED')).length,
-      stale: results.filter((r) => r.action === 'STALE_STOP').length,
-      notOwned: results.filter((r) => r.action === 'SKIPPED_NOT_OWNED').length,
-      failed: results.filter((r) => r.action.startsWith('FAILED')).length,
+      placed: placedCount,
+      skipped: skippedCount,
+      stale: staleCount,
+      notOwned: notOwnedCount,
+      failed: failedCount,
       ...(accountCorrectedCount > 0 ? { accountCorrected: accountCorrectedCount } : {}),
       results,
       timestamp: new Date().toISOString(),
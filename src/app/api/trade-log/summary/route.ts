@@ -24,6 +24,9 @@ function parseDate(value: string | null): Date | null {
 
 function parseTags(tags: string | null): string[] {
   if (!tags) return [];
+  // Only a JSON array can yield tags — skip the parse (and its exception on
+  // malformed input) for anything that can't be one
+  if (tags.trimStart()[0] !== '[') return [];
 
   try {
     const parsed = JSON.parse(tags);
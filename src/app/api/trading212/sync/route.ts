@@ -3,7 +3,7 @@
  * Consumed by: /api/trading212/sync
  * Consumes: trading212.ts, trading212-dual.ts, default-user.ts, equity-snapshot.ts, risk-gates.ts, market-data.ts, prisma.ts, @/types
  * Risk-sensitive: YES
- * Last modified: 2026-02-23
+ * Last modified: 2026-10-14
  * Notes: Dual-account broker sync — fetches Invest + ISA in parallel via DualT212Client.
  *        Positions are kept SEPARATE with accountType tagging. Never aggregates.
  */
@@ -261,18 +261,21 @@ export async function POST(request: NextRequest) {
       }
     }
 
-    const fxCache = new Map<string, number>();
-    const getFxToGbp = async (currency: string | null, ticker: string): Promise<number> => {
+    // Cache the in-flight lookup per currency — positions resolve in parallel,
+    // so caching only the settled rate let every position miss and refetch.
+    const fxCache = new Map<string, Promise<number>>();
+    const getFxToGbp = (currency: string | null, ticker: string): Promise<number> => {
       const curr = (currency || 'USD').toUpperCase();
-      if (curr === 'GBX' || curr === 'GBp') return 0.01;
-      if (curr === 'GBP') return 1;
+      if (curr === 'GBX') return Promise.resolve(0.01);
+      if (curr === 'GBP') return Promise.resolve(1);
       const isUk = ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(ticker);
-      if (isUk && (!currency || currency === '')) return 0.01;
-      const cached = fxCache.get(curr);
-      if (cached != null) return cached;
-      const rate = await getFXRate(curr, 'GBP');
-      fxCache.set(curr, rate);
-      return rate;
+      if (isUk && (!currency || currency === '')) return Promise.resolve(0.01);
+      let pending = fxCache.get(curr);
+      if (!pending) {
+        pending = getFXRate(curr, 'GBP');
+        fxCache.set(curr, pending);
+      }
+      return pending;
     };
 
     try {
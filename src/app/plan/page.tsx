@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useMemo } from 'react';
 import Navbar from '@/components/shared/Navbar';
 import RegimeBadge from '@/components/shared/RegimeBadge';
 import PhaseTimeline from '@/components/plan/PhaseTimeline';
@@ -155,6 +155,8 @@ interface PositionData {
 export default function PlanPage() {
   const { weeklyPhase, marketRegime } = useStore();
   const [positions, setPositions] = useState<PositionData[]>([]);
+  // Held-ticker lookup for ReadyCandidates, rebuilt only when positions change
+  const heldTickers = useMemo(() => new Set(positions.map(p => p.ticker)), [positions]);
   const [scanCandidates, setScanCandidates] = useState<ReadyCandidate[]>([]);
   const [loading, setLoading] = useState(true);
   const [healthReport, setHealthReport] = useState<HealthReportData | null>(null);
@@ -413,7 +415,7 @@ export default function PlanPage() {
 
               {/* Middle Column */}
               <div className="space-y-6">
-                <ReadyCandidates candidates={candidates} heldTickers={new Set(positions.map(p => p.ticker))} />
+                <ReadyCandidates candidates={candidates} heldTickers={heldTickers} />
                 <PositionSizerWidget />
               </div>
 
@@ -1,6 +1,6 @@
 'use client';
 
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useMemo, useRef, useState } from 'react';
 import Navbar from '@/components/shared/Navbar';
 import StageFunnel from '@/components/scan/StageFunnel';
 import TechnicalFilterGrid from '@/components/scan/TechnicalFilterGrid';
@@ -39,6 +39,21 @@ interface ScanApiResult {
   source?: string;
 }
 
+/** Identity of a scan result for sessionStorage — null when it has no cache timestamp */
+function scanStorageKey(result: ScanApiResult): string | null {
+  return result.cachedAt ? `${result.cachedAt}|${result.source ?? ''}` : null;
+}
+
+/** Write a scan result to sessionStorage unless the stored copy is already this scan */
+function persistScanResult(data: ScanApiResult, storedKeyRef: { current: string | null }): void {
+  const key = scanStorageKey(data);
+  if (key !== null && key === storedKeyRef.current) return;
+  try {
+    sessionStorage.setItem('scanResult', JSON.stringify(data));
+    storedKeyRef.current = key;
+  } catch {}
+}
+
 /** Shape of the /api/risk response budget */
 interface RiskBudgetSummary {
   budget?: {
@@ -70,6 +85,9 @@ export default function ScanPage() {
   const [livePricesFetchedAt, setLivePricesFetchedAt] = useState<string | null>(null);
   const [isLoadingLive, setIsLoadingLive] = useState(false);
   const { marketRegime, riskProfile, equity } = useStore();
+  // Identity (cachedAt + source) of the scan result held in sessionStorage,
+  // so an unchanged cache isn't re-serialised and re-written on every visit
+  const storedScanKeyRef = useRef<string | null>(null);
 
   const stages = [
     { num: 1, label: 'Universe' },
@@ -172,6 +190,7 @@ export default function ScanPage() {
         const parsed = JSON.parse(stored);
         setScanResult(parsed);
         setCachedAt(parsed.cachedAt || null);
+        storedScanKeyRef.current = scanStorageKey(parsed);
       }
     } catch {
       // ignore corrupt sessionStorage
@@ -194,8 +213,9 @@ export default function ScanPage() {
         if (data.hasCache) {
           setScanResult(data);
           setCachedAt(data.cachedAt || null);
-          // Persist to sessionStorage for instant recovery on navigation
-          try { sessionStorage.setItem('scanResult', JSON.stringify(data)); } catch {}
+          // Persist to sessionStorage for instant recovery on navigation —
+          // skipped when the stored copy is already this cached scan
+          persistScanResult(data, storedScanKeyRef);
         }
       } catch {
         // Silent fail — no cache yet
@@ -222,7 +242,7 @@ export default function ScanPage() {
       setScanResult(data);
       setCachedAt(data.cachedAt || new Date().toISOString());
       // Persist to sessionStorage for instant recovery on navigation
-      try { sessionStorage.setItem('scanResult', JSON.stringify(data)); } catch {}
+      persistScanResult(data, storedScanKeyRef);
     } catch {
       // Silent fail
     } finally {
@@ -9,9 +9,20 @@ export default function PyramidAlertsWidget() {
   const { data: modulesData, loading } = useModulesData();
   const pyramidAlerts = modulesData?.pyramidAlerts ?? [];
 
-  // Split into actionable (allowed) and upcoming (not yet triggered)
-  const actionable = pyramidAlerts.filter(a => a.allowed);
-  const upcoming = pyramidAlerts.filter(a => !a.allowed && a.triggerPrice !== null && a.rMultiple > 0);
+  // Split into actionable (allowed) and upcoming (not yet triggered) in one pass.
+  // Upcoming rows carry their distance to the next add level so render is lookup-only.
+  const actionable: typeof pyramidAlerts = [];
+  const upcoming: { alert: (typeof pyramidAlerts)[number]; distancePct: number | null }[] = [];
+  for (const a of pyramidAlerts) {
+    if (a.allowed) {
+      actionable.push(a);
+    } else if (a.triggerPrice !== null && a.rMultiple > 0) {
+      const distancePct = a.triggerPrice && a.currentPrice > 0
+        ? ((a.triggerPrice - a.currentPrice) / a.currentPrice) * 100
+        : null;
+      upcoming.push({ alert: a, distancePct });
+    }
+  }
 
   if (loading) {
     return (
@@ -103,10 +114,7 @@ export default function PyramidAlertsWidget() {
           <p className="text-[10px] text-muted-foreground uppercase tracking-wider font-medium">
             Approaching Trigger
           </p>
-          {upcoming.slice(0, 5).map((a) => {
-            const distancePct = a.triggerPrice && a.currentPrice > 0
-              ? ((a.triggerPrice - a.currentPrice) / a.currentPrice) * 100
-              : null;
+          {upcoming.slice(0, 5).map(({ alert: a, distancePct }) => {
             return (
               <div
                 key={`${a.ticker}-upcoming`}
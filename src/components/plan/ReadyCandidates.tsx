@@ -51,6 +51,12 @@ const matchTypeBadge: Record<string, { label: string; color: string; icon: typeo
   CONFLICT: { label: 'CONFLICT', color: 'text-amber-400 bg-amber-500/15 border-amber-500/30', icon: AlertTriangle },
 };
 
+// Match-type display order for READY candidates (unknown types sort last)
+const READY_TYPE_ORDER: Record<string, number> = { BOTH_RECOMMEND: 0, SCAN_ONLY: 1, DUAL_ONLY: 2, CONFLICT: 3 };
+
+// Shared default so a missing heldTickers prop doesn't allocate a Set per render
+const NO_HELD_TICKERS = new Set<string>();
+
 function downloadCsv(rows: Candidate[]) {
   const headers = ['Ticker','Name','Sleeve','Status','Price','Entry Trigger','Stop','Distance %','Match Type','Agreement %','BQS','FWS','NCS','Dual Action','Shares','Risk £'];
   const csvRows = rows.map(c => [
@@ -74,26 +80,29 @@ function downloadCsv(rows: Candidate[]) {
   URL.revokeObjectURL(url);
 }
 
-export default function ReadyCandidates({ candidates, heldTickers = new Set() }: ReadyCandidatesProps) {
+export default function ReadyCandidates({ candidates, heldTickers = NO_HELD_TICKERS }: ReadyCandidatesProps) {
   const [showScoreHelp, setShowScoreHelp] = useState(false);
-  const ready = candidates.filter(c => c.status === 'READY');
-  const watch = candidates.filter(c => c.status === 'WATCH');
 
-  // Sort: BOTH_RECOMMEND first, then by agreement score
-  const sortedReady = [...ready].sort((a, b) => {
-    // Trigger-met candidates first
-    const aTriggerMet = a.price > 0 && a.entryTrigger > 0 && a.price >= a.entryTrigger ? 1 : 0;
-    const bTriggerMet = b.price > 0 && b.entryTrigger > 0 && b.price >= b.entryTrigger ? 1 : 0;
-    if (bTriggerMet !== aTriggerMet) return bTriggerMet - aTriggerMet;
-    const typeOrder: Record<string, number> = { BOTH_RECOMMEND: 0, SCAN_ONLY: 1, DUAL_ONLY: 2, CONFLICT: 3 };
-    const oa = typeOrder[a.matchType || 'SCAN_ONLY'] ?? 4;
-    const ob = typeOrder[b.matchType || 'SCAN_ONLY'] ?? 4;
-    if (oa !== ob) return oa - ob;
-    return (b.agreementScore || 0) - (a.agreementScore || 0);
-  });
+  // One pass over READY candidates: the trigger-met and held flags and the
+  // match-type rank are derived once per row, then shared by the sort, the
+  // counts and the cards
+  const readyRows: { c: Candidate; triggerMet: boolean; isHeld: boolean; typeRank: number }[] = [];
+  let bothCount = 0;
+  let triggerMetCount = 0;
+  for (const c of candidates) {
+    if (c.status !== 'READY') continue;
+    const triggerMet = c.price > 0 && c.entryTrigger > 0 && c.price >= c.entryTrigger;
+    if (triggerMet) triggerMetCount++;
+    if (c.matchType === 'BOTH_RECOMMEND') bothCount++;
+    readyRows.push({ c, triggerMet, isHeld: heldTickers.has(c.ticker), typeRank: READY_TYPE_ORDER[c.matchType || 'SCAN_ONLY'] ?? 4 });
+  }
 
-  const bothCount = ready.filter(c => c.matchType === 'BOTH_RECOMMEND').length;
-  const triggerMetCount = ready.filter(c => c.price > 0 && c.entryTrigger > 0 && c.price >= c.entryTrigger).length;
+  // Sort: trigger-met first, then BOTH_RECOMMEND first, then by agreement score
+  readyRows.sort((a, b) => {
+    if (a.triggerMet !== b.triggerMet) return a.triggerMet ? -1 : 1;
+    if (a.typeRank !== b.typeRank) return a.typeRank - b.typeRank;
+    return (b.c.agreementScore || 0) - (a.c.agreementScore || 0);
+  });
 
   return (
     <div className="card-surface p-4">
@@ -104,11 +113,11 @@ export default function ReadyCandidates({ candidates, heldTickers = new Set() }:
         </h3>
         <div className="flex items-center gap-2">
           <span className="text-xs text-muted-foreground">
-            {ready.length} ready{bothCount > 0 ? ` (${bothCount} confirmed)` : ''}{triggerMetCount > 0 ? ` · ${triggerMetCount} triggered` : ''}
+            {readyRows.length} ready{bothCount > 0 ? ` (${bothCount} confirmed)` : ''}{triggerMetCount > 0 ? ` · ${triggerMetCount} triggered` : ''}
           </span>
-          {ready.length > 0 && (
+          {readyRows.length > 0 && (
             <button
-              onClick={() => downloadCsv(sortedReady)}
+              onClick={() => downloadCsv(readyRows.map((r) => r.c))}
               className="inline-flex items-center gap-1 px-1.5 py-0.5 rounded text-[10px] font-medium text-muted-foreground hover:text-foreground bg-navy-700 hover:bg-navy-600 border border-navy-600 transition-colors"
               title="Download ready candidates as CSV"
             >
@@ -134,7 +143,7 @@ export default function ReadyCandidates({ candidates, heldTickers = new Set() }:
         </span>
       </div>
 
-      {sortedReady.length === 0 ? (
+      {readyRows.length === 0 ? (
         <div className="text-center py-8 text-muted-foreground text-sm">
           <Clock className="w-8 h-8 mx-auto mb-2 opacity-50" />
           No candidates ready for entry
@@ -142,11 +151,9 @@ export default function ReadyCandidates({ candidates, heldTickers = new Set() }:
         </div>
       ) : (
         <div className="space-y-3">
-          {sortedReady.map((c) => {
+          {readyRows.map(({ c, triggerMet: isTriggerMet, isHeld }) => {
             const badge = matchTypeBadge[c.matchType || 'SCAN_ONLY'] || matchTypeBadge.SCAN_ONLY;
             const BadgeIcon = badge.icon;
-            const isHeld = heldTickers.has(c.ticker);
-            const isTriggerMet = c.price > 0 && c.entryTrigger > 0 && c.price >= c.entryTrigger;
             const isBuyReady = c.matchType === 'BOTH_RECOMMEND'
               && !isHeld
               && isTriggerMet
@@ -8,6 +8,12 @@ import { canPyramid, PYRAMID_CONFIG } from '@/lib/risk-gates';
 import { apiRequest } from '@/lib/api-client';
 import { Bell, BellOff, Lock, Plus, ArrowUpDown, ChevronDown, X, AlertTriangle, TrendingUp, LogOut, Send, Loader2, CheckCircle, XCircle, RefreshCw, Layers } from 'lucide-react';
 
+// Display labels for bulk stop-push skip codes surfaced alongside failures
+const BULK_SKIP_LABELS = new Map<string, string>([
+  ['SKIPPED_PRICE_TOO_FAR', 'Stop too far from market price'],
+  ['SKIPPED_NOT_OWNED', 'Not found on T212 account (wrong ISA/Invest?)'],
+]);
+
 interface Position {
   id: string;
   ticker: string;
@@ -146,10 +152,14 @@ export default function PositionsTable({ positions, onUpdateStop, onExitPosition
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({}),
               });
-              // Extract failure details for display (include price-too-far)
-              const failedDetails = (data.results ?? [])
-                .filter((r) => r.action.startsWith('FAILED') || r.action === 'SKIPPED_PRICE_TOO_FAR' || r.action === 'SKIPPED_NOT_OWNED')
-                .map((r) => `${r.ticker}: ${r.action.replace('FAILED: ', '').replace('SKIPPED_PRICE_TOO_FAR', 'Stop too far from market price').replace('SKIPPED_NOT_OWNED', 'Not found on T212 account (wrong ISA/Invest?)')}`);
+              // Extract failure details for display (include price-too-far) —
+              // one pass: skip codes map straight to a label, failures lose their prefix
+              const failedDetails: string[] = [];
+              for (const r of data.results ?? []) {
+                const detail = BULK_SKIP_LABELS.get(r.action)
+                  ?? (r.action.startsWith('FAILED') ? r.action.replace('FAILED: ', '') : null);
+                if (detail !== null) failedDetails.push(`${r.ticker}: ${detail}`);
+              }
               setBulkSyncResult({
                 placed: data.placed,
                 failed: data.failed,
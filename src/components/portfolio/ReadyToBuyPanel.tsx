@@ -5,7 +5,7 @@
  *           src/hooks/useWeeklyPhase.ts, src/hooks/useRiskProfile.ts,
  *           src/components/portfolio/BuyConfirmationModal.tsx
  * Risk-sensitive: NO (display only — risk gates enforced server-side on POST /api/positions)
- * Last modified: 2026-02-28
+ * Last modified: 2026-10-14
  * Notes: Consumes existing /api/scan/cross-ref and /api/risk endpoints. No new APIs.
  */
 
@@ -20,7 +20,6 @@ import { getDayOfWeek } from '@/lib/utils';
 import {
   filterTriggerMet,
   getSnapshotAge,
-  getClusterWarnings,
   getBuyButtonState,
   type CrossRefTicker,
   type TriggerMetCandidate,
@@ -197,6 +196,19 @@ export default function ReadyToBuyPanel({
     return triggerMet.filter((c) => !heldTickers.has(c.ticker));
   }, [crossRefData, openPositions]);
 
+  // Open tickers grouped by cluster, so each card's overlap check is a map
+  // lookup instead of a rescan of the open positions
+  const openTickersByCluster = useMemo(() => {
+    const byCluster = new Map<string, string[]>();
+    for (const p of openPositions) {
+      if (!p.cluster) continue;
+      const list = byCluster.get(p.cluster);
+      if (list) list.push(p.ticker);
+      else byCluster.set(p.cluster, [p.ticker]);
+    }
+    return byCluster;
+  }, [openPositions]);
+
   const snapshotAge = useMemo(() => {
     return getSnapshotAge(crossRefData?.summary?.scanCachedAt ?? null);
   }, [crossRefData]);
@@ -218,12 +230,18 @@ export default function ReadyToBuyPanel({
     : false;
 
   // ── Buy button disable reasons (per-candidate) ───────────
+  // The first five gates don't depend on the candidate, so the winning
+  // reason is resolved once per render; only the dual-score check runs per row.
+  const sharedDisableReason: string | null =
+    !buttonState.enabled ? buttonState.tooltip
+    : positionCapReached ? `Maximum ${riskBudget?.maxPositions ?? 4} positions reached`
+    : riskBudgetFull ? `Risk budget exhausted (${riskBudget?.maxRiskPercent ?? 10}%)`
+    : noT212Connected ? 'Connect Trading 212 in Settings'
+    : snapshotAge.critical ? 'Snapshot too stale — run a fresh scan'
+    : null;
+
   function getCandidateDisableReason(candidate: TriggerMetCandidate): string | null {
-    if (!buttonState.enabled) return buttonState.tooltip;
-    if (positionCapReached) return `Maximum ${riskBudget?.maxPositions ?? 4} positions reached`;
-    if (riskBudgetFull) return `Risk budget exhausted (${riskBudget?.maxRiskPercent ?? 10}%)`;
-    if (noT212Connected) return 'Connect Trading 212 in Settings';
-    if (snapshotAge.critical) return 'Snapshot too stale — run a fresh scan';
+    if (sharedDisableReason !== null) return sharedDisableReason;
     if (candidate.dualAction === 'Auto-No') return 'Rejected by dual-score (FWS > 65)';
     return null;
   }
@@ -378,28 +396,8 @@ export default function ReadyToBuyPanel({
                   const isDisabled = disableReason !== null;
                   const badge = actionBadge(candidate.dualAction);
                   const sleeve = sleeveBadge(candidate.sleeve);
-                  const clusterWarnings = getClusterWarnings(
-                    candidate.ticker,
-                    candidate.scanStatus === 'READY' ? (crossRefData?.tickers.find(t => t.ticker === candidate.ticker) as CrossRefTicker & { clusterName?: string })?.sleeve : undefined,
-                    undefined,
-                    openPositions
-                  );
-                  // Use cross-ref data for cluster name — it's in the dual score fields
-                  const candidateCluster = crossRefData?.tickers.find(t => t.ticker === candidate.ticker);
-                  const realClusterWarnings = getClusterWarnings(
-                    candidate.ticker,
-                    (candidateCluster as CrossRefTicker & { clusterName?: string })?.sleeve,
-                    undefined,
-                    openPositions
-                  );
-                  // Check open positions for cluster match directly
-                  const positionClusterWarnings: string[] = [];
-                  for (const pos of openPositions) {
-                    if (pos.ticker === candidate.ticker) continue;
-                    if (pos.cluster && candidate.sleeve && pos.cluster === candidate.sleeve) {
-                      // This would be sleeve matching, not cluster — skip
-                    }
-                  }
+                  const sleeveOverlap = (openTickersByCluster.get(candidate.sleeve) ?? [])
+                    .some((t) => t !== candidate.ticker);
 
                   return (
                     <div
@@ -493,11 +491,7 @@ export default function ReadyToBuyPanel({
                       )}
 
                       {/* Cluster warnings */}
-                      {openPositions.some(
-                        (p) => p.cluster && p.ticker !== candidate.ticker
-                      ) && openPositions.filter(
-                        (p) => p.cluster && p.cluster === candidate.sleeve && p.ticker !== candidate.ticker
-                      ).length > 0 && (
+                      {sleeveOverlap && (
                         <div className="text-[10px] text-amber-400 flex items-center gap-1">
                           <AlertTriangle className="w-3 h-3" />
                           Sleeve overlap with open positions
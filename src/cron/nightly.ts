@@ -3,7 +3,7 @@
  * Consumed by: nightly-task.bat
  * Consumes: health-check.ts, stop-manager.ts, telegram.ts, market-data.ts, equity-snapshot.ts, snapshot-sync.ts, laggard-detector.ts, modules/*, risk-gates.ts, position-sizer.ts, prisma.ts, @/types
  * Risk-sensitive: YES
- * Last modified: 2026-02-24
+ * Last modified: 2026-10-14
  * Notes: Nightly automation should continue on partial failures.
  */
 /**
@@ -31,7 +31,7 @@ import { runHealthCheck } from '@/lib/health-check';
 import { generateStopRecommendations, generateTrailingStopRecommendations, updateStopLoss } from '@/lib/stop-manager';
 import { sendNightlySummary } from '@/lib/telegram';
 import type { NightlyPositionDetail, NightlyStopChange, NightlyReadyCandidate, NightlyTriggerMetCandidate, NightlyLaggardAlert, NightlyClimaxAlert, NightlySwapAlert, NightlyWhipsawAlert, NightlyBreadthAlert, NightlyMomentumAlert, NightlyPyramidAlert, NightlyGapRiskAlert, NightlyBreakoutFailureAlert } from '@/lib/telegram';
-import { getBatchQuotes, normalizeBatchPricesToGBP, getDailyPrices, calculateADX, calculateATR, calculateMA, preCacheHistoricalData } from '@/lib/market-data';
+import { getBatchQuotes, normalizeBatchPricesToGBP, getDailyPrices, calculateADX, calculateATR, calculateMA, preCacheHistoricalData, displayCurrency } from '@/lib/market-data';
 import { fetchWithFallback, toPriceRecord } from '@/lib/data-provider';
 import type { DataSourceHealth } from '@/lib/data-provider';
 import { recordEquitySnapshot } from '@/lib/equity-snapshot';
@@ -129,6 +129,12 @@ async function runNightlyProcess() {
     }
 
     const openTickers = positions.map((p) => p.stock.ticker);
+    // Native price currency per held ticker — resolved once here instead of
+    // re-running the UK-suffix check + uppercasing in every later step.
+    const priceCurrencyByTicker = new Map<string, string>();
+    for (const p of positions) {
+      priceCurrencyByTicker.set(p.stock.ticker, displayCurrency(p.stock.ticker, p.stock.currency));
+    }
     let livePrices: Record<string, number> = {};
     try {
       if (openTickers.length > 0) {
@@ -170,6 +176,15 @@ async function runNightlyProcess() {
     }
     console.log(`        ${positions.length} positions, ${Object.keys(livePrices).length} prices fetched`);
 
+    // Per-position native + GBP pricing — derived once and shared by open risk,
+    // pyramids, swap enrichment, P&L details and portfolio value below.
+    const pricingById = new Map<string, { rawPrice: number; gbpPrice: number; fxRatio: number }>();
+    for (const p of positions) {
+      const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
+      const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
+      pricingById.set(p.id, { rawPrice, gbpPrice, fxRatio: rawPrice > 0 ? gbpPrice / rawPrice : 1 });
+    }
+
     // Step 3: Generate stop recommendations (isolated)
     console.log('  [3/9] Generating stop recommendations...');
     const livePriceMap = new Map(Object.entries(livePrices));
@@ -198,8 +213,7 @@ async function runNightlyProcess() {
 
       for (const rec of stopRecs) {
         const pos = positions.find((p) => p.id === rec.positionId);
-        const isUK = rec.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(rec.ticker);
-        const cur = isUK ? 'GBX' : (pos?.stock.currency || 'USD').toUpperCase();
+        const cur = priceCurrencyByTicker.get(rec.ticker) ?? displayCurrency(rec.ticker, pos?.stock.currency);
         try {
           await updateStopLoss(rec.positionId, rec.newStop, rec.reason, rec.newLevel);
           stopChanges.push({
@@ -261,8 +275,7 @@ async function runNightlyProcess() {
           const threshold = atrPercent * 2;
           // Flag if absolute gap exceeds 2× ATR%
           if (Math.abs(gapPercent) > threshold) {
-            const isUK = pos.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(pos.stock.ticker);
-            const currency = isUK ? 'GBX' : (pos.stock.currency || 'USD').toUpperCase();
+            const currency = priceCurrencyByTicker.get(pos.stock.ticker) ?? 'USD';
             gapRiskAlerts.push({ ticker: pos.stock.ticker, gapPercent, atrPercent, threshold, currency });
           }
         }
@@ -279,8 +292,7 @@ async function runNightlyProcess() {
         const currentPrice = livePrices[p.stock.ticker];
         if (!currentPrice || currentPrice <= 0) continue;
         if (currentPrice <= p.currentStop) {
-          const isUK = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-          const currency = isUK ? 'GBX' : (p.stock.currency || 'USD').toUpperCase();
+          const currency = priceCurrencyByTicker.get(p.stock.ticker) ?? 'USD';
           stopHitPositions.push({
             ticker: p.stock.ticker,
             name: p.stock.name || p.stock.ticker,
@@ -314,8 +326,7 @@ async function runNightlyProcess() {
     try {
       const bfInput = positions.map((p) => {
         const currentPrice = livePrices[p.stock.ticker];
-        const isUK = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-        const currency = isUK ? 'GBX' : (p.stock.currency || 'USD').toUpperCase();
+        const currency = priceCurrencyByTicker.get(p.stock.ticker) ?? 'USD';
         return {
           id: p.id,
           ticker: p.stock.ticker,
@@ -332,11 +343,13 @@ async function runNightlyProcess() {
       const failures = detectBreakoutFailures(bfInput);
 
       // Persist the detection timestamp on newly-flagged positions
+      // (one timestamp for the whole run — every flag comes from the same pass)
+      const detectedAt = new Date();
       for (const f of failures) {
         try {
           await prisma.position.update({
             where: { id: f.positionId },
-            data: { breakoutFailureDetectedAt: new Date() },
+            data: { breakoutFailureDetectedAt: detectedAt },
           });
         } catch {
           // Non-critical — flag best-effort
@@ -411,8 +424,7 @@ async function runNightlyProcess() {
 
       const laggardInput = positions.map((p) => {
         const currentPrice = livePrices[p.stock.ticker] || p.entryPrice;
-        const isUK = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-        const currency = isUK ? 'GBX' : (p.stock.currency || 'USD').toUpperCase();
+        const currency = priceCurrencyByTicker.get(p.stock.ticker) ?? 'USD';
         const extras = laggardExtras.get(p.stock.ticker);
         return {
           id: p.id,
@@ -482,8 +494,7 @@ async function runNightlyProcess() {
     // Shared data for risk modules — computed once, used by swap/whipsaw/breadth/momentum
     const riskProfile = (user?.riskProfile || 'BALANCED') as RiskProfileType;
     const enrichedForSwap = positions.map((p) => {
-      const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
-      const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
+      const { rawPrice, gbpPrice } = pricingById.get(p.id)!;
       const rMultiple = calculateRMultiple(rawPrice, p.entryPrice, p.initialRisk);
       return {
         id: p.id,
@@ -501,10 +512,20 @@ async function runNightlyProcess() {
       const latestScan = await prisma.scan.findFirst({
         where: { userId },
         orderBy: { runDate: 'desc' },
-        include: { results: { include: { stock: true } } },
+        // Only READY rows feed the swap check — filter and project in the
+        // query rather than loading every result with its full stock row
+        select: {
+          results: {
+            where: { status: 'READY' },
+            select: {
+              status: true,
+              rankScore: true,
+              stock: { select: { ticker: true, cluster: true } },
+            },
+          },
+        },
       });
       const scanCandidates = (latestScan?.results || [])
-        .filter((r) => r.status === 'READY')
         .map((r) => ({
           ticker: r.stock.ticker,
           cluster: r.stock.cluster || 'General',
@@ -536,10 +557,11 @@ async function runNightlyProcess() {
         orderBy: { exitDate: 'desc' },
         take: 50,
       });
+      const exitFallback = new Date();
       const blocks = checkWhipsawBlocks(
         closedPositions.map((p) => ({
           ticker: p.stock.ticker,
-          exitDate: p.exitDate || new Date(),
+          exitDate: p.exitDate || exitFallback,
           exitReason: p.exitReason,
           whipsawCount: p.whipsawCount ?? 0,
         }))
@@ -561,12 +583,12 @@ async function runNightlyProcess() {
     try {
       const stocks = await prisma.stock.findMany({ where: { active: true }, select: { ticker: true } });
       const universeTickers = stocks.map((s) => s.ticker);
-      // Sample up to 30 tickers for breadth — avoids 266 sequential Yahoo calls
+      // Sample up to 30 tickers for breadth — avoids 266 sequential Yahoo calls.
+      // calculateBreadth draws that sample itself (partial Fisher–Yates), so
+      // the universe is passed as-is rather than shuffled and sliced here first.
       const sampleSize = Math.min(30, universeTickers.length);
-      const shuffled = [...universeTickers].sort(() => Math.random() - 0.5);
-      const breadthSample = shuffled.slice(0, sampleSize);
-      console.log(`        Breadth sample: ${breadthSample.length} of ${universeTickers.length} tickers`);
-      const breadthPct = breadthSample.length > 0 ? await calculateBreadth(breadthSample) : 100;
+      console.log(`        Breadth sample: ${sampleSize} of ${universeTickers.length} tickers`);
+      const breadthPct = await calculateBreadth(universeTickers);
 
       const { maxPositions } = getRiskBudget(
         enrichedForSwap.map((p) => ({
@@ -637,9 +659,7 @@ async function runNightlyProcess() {
       const openRisk = positions
         .filter((p) => p.stock.sleeve !== 'HEDGE')
         .reduce((sum, p) => {
-          const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
-          const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
-          const fxRatio = rawPrice > 0 ? gbpPrice / rawPrice : 1;
+          const { gbpPrice, fxRatio } = pricingById.get(p.id)!;
           const currentStopGbp = p.currentStop * fxRatio;
           const risk = Math.max(0, (gbpPrice - currentStopGbp) * p.shares);
           return sum + risk;
@@ -668,18 +688,24 @@ async function runNightlyProcess() {
       const maxOpenRiskPct = RISK_PROFILES[riskProfile].maxOpenRisk;
       const openRiskRatio = maxOpenRiskPct > 0 ? openRiskPercent / maxOpenRiskPct : 1;
 
-      for (const p of positions) {
-        if (p.stock.sleeve === 'HEDGE') continue;
-        const currentPrice = livePrices[p.stock.ticker] || p.entryPrice;
-        if (currentPrice <= p.entryPrice) continue;
+      // Only non-hedge positions in profit can pyramid — fetch their ATRs in
+      // parallel up front rather than awaiting one chart call per loop turn.
+      const pyramidCandidates = positions.filter(
+        (p) => p.stock.sleeve !== 'HEDGE' && pricingById.get(p.id)!.rawPrice > p.entryPrice
+      );
+      const pyramidAtrs = await Promise.all(
+        pyramidCandidates.map(async (p): Promise<number | null> => {
+          try {
+            const bars = await getDailyPrices(p.stock.ticker, 'compact');
+            return bars.length >= 15 ? calculateATR(bars, 14) : null;
+          } catch { return null; /* ATR unavailable */ }
+        })
+      );
 
-        let atr: number | null = null;
-        try {
-          const bars = await getDailyPrices(p.stock.ticker, 'compact');
-          if (bars.length >= 15) {
-            atr = calculateATR(bars, 14);
-          }
-        } catch { /* ATR unavailable */ }
+      for (let i = 0; i < pyramidCandidates.length; i++) {
+        const p = pyramidCandidates[i];
+        const { rawPrice: currentPrice, fxRatio } = pricingById.get(p.id)!;
+        const atr = pyramidAtrs[i];
 
         const pyramidCheck = canPyramid(
           currentPrice,
@@ -691,13 +717,9 @@ async function runNightlyProcess() {
         );
 
         if (pyramidCheck.allowed) {
-          const isUK = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-          const currency = isUK ? 'GBX' : (p.stock.currency || 'USD').toUpperCase();
+          const currency = priceCurrencyByTicker.get(p.stock.ticker) ?? 'USD';
 
           // Compute scaled add sizing
-          const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
-          const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
-          const fxRatio = rawPrice > 0 ? gbpPrice / rawPrice : 1;
           const addSizing = calculatePyramidAddSize({
             equity,
             riskProfile,
@@ -755,15 +777,12 @@ async function runNightlyProcess() {
     // Step 7: Sync snapshot + query READY candidates
     console.log('  [7/9] Syncing snapshot data...');
     const positionDetails: NightlyPositionDetail[] = positions.map((p) => {
-      const currentPrice = livePrices[p.stock.ticker] || p.entryPrice;
-      const gbpPrice = gbpPrices[p.stock.ticker] ?? currentPrice;
-      const fxRatio = currentPrice > 0 ? gbpPrice / currentPrice : 1;
+      const { rawPrice: currentPrice, gbpPrice, fxRatio } = pricingById.get(p.id)!;
       // Use GBP-normalised prices for cross-currency PnL aggregation
       const pnlValue = (gbpPrice - p.entryPrice * fxRatio) * p.shares;
       const pnlPercent = p.entryPrice > 0 ? ((currentPrice - p.entryPrice) / p.entryPrice) * 100 : 0;
       const rMultiple = p.initialRisk > 0 ? (currentPrice - p.entryPrice) / p.initialRisk : 0;
-      const isUK = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-      const currency = isUK ? 'GBX' : (p.stock.currency || 'USD').toUpperCase();
+      const currency = priceCurrencyByTicker.get(p.stock.ticker) ?? 'USD';
       return {
         ticker: p.stock.ticker,
         sleeve: p.stock.sleeve,
@@ -797,12 +816,39 @@ async function runNightlyProcess() {
     let triggerMetCandidates: NightlyTriggerMetCandidate[] = [];
     if (snapshotSync.snapshotId) {
       try {
-        const heldTickers = new Set(positions.map((p) => p.stock.ticker));
-        const readyRows = await prisma.snapshotTicker.findMany({
-          where: { snapshotId: snapshotSync.snapshotId, status: 'READY' },
-          orderBy: { distanceTo20dHighPct: 'asc' },
-          take: 15,
-        });
+        const heldTickers = new Set(openTickers);
+        // The two snapshot queries are independent — run them concurrently, but
+        // settle each on its own so one failing doesn't drop the other's results
+        const [readyResult, triggeredResult] = await Promise.allSettled([
+          prisma.snapshotTicker.findMany({
+            where: { snapshotId: snapshotSync.snapshotId, status: 'READY' },
+            orderBy: { distanceTo20dHighPct: 'asc' },
+            take: 15,
+          }),
+          prisma.snapshotTicker.findMany({
+            where: {
+              snapshotId: snapshotSync.snapshotId,
+              status: { in: ['READY', 'WATCH'] },
+              entryTrigger: { gt: 0 },
+              adx14: { gte: 20 },
+            },
+            orderBy: { distanceTo20dHighPct: 'asc' },
+            select: {
+              ticker: true, name: true, sleeve: true, close: true, entryTrigger: true,
+              stopLevel: true, atr14: true, adx14: true, currency: true,
+            },
+          }),
+        ]);
+        if (readyResult.status === 'rejected') {
+          hadFailure = true;
+          console.warn('  [7b] Failed to query READY tickers:', (readyResult.reason as Error).message);
+        }
+        if (triggeredResult.status === 'rejected') {
+          hadFailure = true;
+          console.warn('  [7b] Failed to query trigger-met tickers:', (triggeredResult.reason as Error).message);
+        }
+        const readyRows = readyResult.status === 'fulfilled' ? readyResult.value : [];
+        const allTriggeredRows = triggeredResult.status === 'fulfilled' ? triggeredResult.value : [];
         readyToBuy = readyRows
           .filter((r) => !heldTickers.has(r.ticker) && r.adx14 >= 20)
           .map((r) => ({
@@ -822,15 +868,11 @@ async function runNightlyProcess() {
           }));
 
         // Detect trigger-met candidates: close >= entryTrigger and not already held
-        const allTriggeredRows = await prisma.snapshotTicker.findMany({
-          where: {
-            snapshotId: snapshotSync.snapshotId,
-            status: { in: ['READY', 'WATCH'] },
-          },
-          orderBy: { distanceTo20dHighPct: 'asc' },
-        });
+        // Scalar thresholds are applied in the query above and only the columns the
+        // candidate needs are loaded; the held-ticker and close-vs-trigger checks
+        // (a column comparison) stay in JS.
         triggerMetCandidates = allTriggeredRows
-          .filter((r) => !heldTickers.has(r.ticker) && r.close >= r.entryTrigger && r.entryTrigger > 0 && r.adx14 >= 20)
+          .filter((r) => !heldTickers.has(r.ticker) && r.close >= r.entryTrigger)
           .map((r) => ({
             ticker: r.ticker,
             name: r.name || r.ticker,
@@ -926,14 +968,10 @@ async function runNightlyProcess() {
           : 'Neutral —';
 
         // Position tickers as comma-separated
-        const positionTickers = positions.map((p) => p.stock.ticker).join(', ') || 'None';
+        const positionTickers = openTickers.join(', ') || 'None';
 
-        // Portfolio value in GBP
-        const portfolioValue = positions.reduce((sum, p) => {
-          const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
-          const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
-          return sum + gbpPrice * p.shares;
-        }, 0);
+        // Portfolio value in GBP (same sum as the swap enrichment above)
+        const portfolioValue = totalPortfolioValue;
 
         // Closest to triggering (top 3 from readyToBuy)
         const closest = readyToBuy.slice(0, 3);
@@ -973,11 +1011,7 @@ async function runNightlyProcess() {
       readyCandidates: readyToBuy.length,
       alerts,
       // Portfolio value in GBP for multi-currency consistency
-      portfolioValue: positions.reduce((sum, p) => {
-        const rawPrice = livePrices[p.stock.ticker] || p.entryPrice;
-        const gbpPrice = gbpPrices[p.stock.ticker] ?? rawPrice;
-        return sum + gbpPrice * p.shares;
-      }, 0),
+      portfolioValue: totalPortfolioValue,
       dailyChange: 0,
       dailyChangePercent: 0,
       equity,
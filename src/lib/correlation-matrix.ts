@@ -3,7 +3,7 @@
  * Consumed by: nightly.ts, /api/risk/correlation/route.ts, /api/risk/correlation-scalar/route.ts, heatmap-swap.ts
  * Consumes: market-data.ts, prisma.ts
  * Risk-sensitive: YES (correlation data now drives position size reduction via correlation-scalar.ts)
- * Last modified: 2026-03-01
+ * Last modified: 2026-10-14
  * Notes: Computes pairwise Pearson correlation on 90 days of daily returns.
  *        Flags pairs > 0.75 as HIGH_CORR. Runs nightly only (not real-time).
  */
@@ -57,27 +57,23 @@ function pearsonCorrelation(
   returnsA: Map<string, number>,
   returnsB: Map<string, number>
 ): number | null {
-  // Find overlapping dates
-  const commonDates: string[] = [];
-  const datesA = Array.from(returnsA.keys());
-  for (const date of datesA) {
-    if (returnsB.has(date)) commonDates.push(date);
-  }
-
-  if (commonDates.length < MIN_OVERLAP_DAYS) return null;
-
-  const n = commonDates.length;
+  // Accumulate over overlapping dates in one pass — no intermediate
+  // date list, and each return is read from its map exactly once
+  let n = 0;
   let sumA = 0, sumB = 0, sumAB = 0, sumA2 = 0, sumB2 = 0;
 
-  for (const date of commonDates) {
-    const a = returnsA.get(date)!;
-    const b = returnsB.get(date)!;
+  returnsA.forEach((a, date) => {
+    const b = returnsB.get(date);
+    if (b === undefined) return;
+    n++;
     sumA += a;
     sumB += b;
     sumAB += a * b;
     sumA2 += a * a;
     sumB2 += b * b;
-  }
+  });
+
+  if (n < MIN_OVERLAP_DAYS) return null;
 
   const denominator = Math.sqrt(
     (n * sumA2 - sumA * sumA) * (n * sumB2 - sumB * sumB)
@@ -245,10 +241,12 @@ export async function checkCorrelationWarnings(
 
   const flags = await getCorrelationFlags(candidateTicker);
   const warnings: { ticker: string; correlation: number }[] = [];
+  // Membership set so each flag is an O(1) check, not a scan of openTickers
+  const openSet = new Set(openTickers);
 
   for (const flag of flags) {
     const otherTicker = flag.tickerA === candidateTicker ? flag.tickerB : flag.tickerA;
-    if (openTickers.includes(otherTicker)) {
+    if (openSet.has(otherTicker)) {
       warnings.push({ ticker: otherTicker, correlation: flag.correlation });
     }
   }
@@ -0,0 +1,34 @@
+// ============================================================
+// Snapshot CSV Score Cache
+// ============================================================
+// master_snapshot.csv is only rewritten by the external pipeline,
+// so the scored rows are kept per file version (mtime + size) and
+// the file is only re-read, re-parsed and re-scored when it changes.
+// Each caller owns its own cache, since routes post-process the
+// scored rows differently (e.g. the scores route sorts by NCS).
+
+import * as fs from 'fs';
+import type { ScoredTicker } from './dual-score';
+
+export interface CsvScoreResult {
+  scored: ScoredTicker[];
+  mtime: Date;
+}
+
+/**
+ * Create a cached loader for a scored snapshot CSV.
+ * `score` turns the raw CSV text into scored rows and only runs when the
+ * file's mtime or size differs from the cached version.
+ */
+export function createCsvScoreCache(): (csvPath: string, score: (csvText: string) => ScoredTicker[]) => CsvScoreResult {
+  let cached: { mtimeMs: number; size: number; scored: ScoredTicker[] } | null = null;
+
+  return (csvPath, score) => {
+    const stat = fs.statSync(csvPath);
+    if (!cached || cached.mtimeMs !== stat.mtimeMs || cached.size !== stat.size) {
+      const csvText = fs.readFileSync(csvPath, 'utf-8');
+      cached = { mtimeMs: stat.mtimeMs, size: stat.size, scored: score(csvText) };
+    }
+    return { scored: cached.scored, mtime: stat.mtime };
+  };
+}
@@ -3,7 +3,7 @@
  * Consumed by: nightly.ts, snapshot-sync.ts, /api/nightly/route.ts
  * Consumes: market-data.ts, prisma.ts
  * Risk-sensitive: YES — data source affects stop management + scan accuracy
- * Last modified: 2026-03-01
+ * Last modified: 2026-10-14
  * Notes: Three-tier fallback chain. Yahoo → optional providers → DB cache.
  *        Works with ZERO API keys (cache always available).
  */
@@ -276,6 +276,8 @@ export async function fetchWithFallback(
     allPrices.set(ticker, data);
   });
 
+  // Each later tier only narrows the failures of the one before it, so
+  // re-filter the (small) remaining list rather than the full universe
   let remaining = tickers.filter((t) => !allPrices.has(t));
   if (remaining.length > 0) {
     console.warn(`[DataProvider] [${context}] Yahoo failed for ${remaining.length}/${tickers.length} tickers`);
@@ -288,7 +290,7 @@ export async function fetchWithFallback(
       avResults.forEach((data, ticker) => {
         allPrices.set(ticker, data);
       });
-      remaining = tickers.filter((t) => !allPrices.has(t));
+      remaining = remaining.filter((t) => !allPrices.has(t));
     }
   }
 
@@ -299,7 +301,7 @@ export async function fetchWithFallback(
       eodResults.forEach((data, ticker) => {
         allPrices.set(ticker, data);
       });
-      remaining = tickers.filter((t) => !allPrices.has(t));
+      remaining = remaining.filter((t) => !allPrices.has(t));
     }
   }
 
@@ -321,10 +323,16 @@ export async function fetchWithFallback(
   }
 
   // ── Determine health status ──
-  const yahooCount = Array.from(allPrices.values()).filter((d) => d.source === 'YAHOO').length;
+  // Per-source counts in one walk of the map — no filtered copies just to count
+  let yahooCount = 0;
+  let avCount = 0;
+  let eodCount = 0;
+  allPrices.forEach((d) => {
+    if (d.source === 'YAHOO') yahooCount++;
+    else if (d.source === 'ALPHA_VANTAGE') avCount++;
+    else if (d.source === 'EODHD') eodCount++;
+  });
   const cacheCount = staleTickers.length;
-  const avCount = Array.from(allPrices.values()).filter((d) => d.source === 'ALPHA_VANTAGE').length;
-  const eodCount = Array.from(allPrices.values()).filter((d) => d.source === 'EODHD').length;
 
   let health: DataSourceHealth;
   if (cacheCount === 0) {
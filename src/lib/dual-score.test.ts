@@ -366,6 +366,24 @@ describe('normaliseRow', () => {
     expect(row.rs_vs_benchmark_pct).toBe(3);
   });
 
+  it('coerces numeric strings and falls back to defaults for blank or invalid values', () => {
+    const row = normaliseRow({
+      ticker: 'TEST',
+      close: '101.5',
+      vol_ratio: '',
+      atr_14: 'n/a',
+      liquidity_ok: '',
+      earnings_in_next_5d: 'no',
+      market_regime: '',
+    });
+    expect(row.close).toBe(101.5);
+    expect(row.vol_ratio).toBe(1);
+    expect(row.atr_14).toBe(0);
+    expect(row.liquidity_ok).toBe(true);
+    expect(row.earnings_in_next_5d).toBe(false);
+    expect(row.market_regime).toBe('NEUTRAL');
+  });
+
   it('uses ticker as name fallback', () => {
     const row = normaliseRow({ ticker: 'AAPL', name: '' });
     expect(row.name).toBe('AAPL');
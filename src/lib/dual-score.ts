@@ -3,7 +3,7 @@
  * Consumed by: /api/scan/scores/route.ts, /api/scan/cross-ref/route.ts
  * Consumes: (standalone — no internal imports)
  * Risk-sensitive: NO
- * Last modified: 2026-02-24
+ * Last modified: 2026-10-14
  * Notes: Weights are intentional. Do not rebalance without explicit instruction.
  *        calcDualRegimeScore() replaces marketTailwind() — consolidates directional
  *        regime, volRegime, and SPY/VWRL alignment into a single 0-20 BQS component.
@@ -449,6 +449,16 @@ const NUMERIC_COLS: string[] = [
   'hurst_exponent',
 ];
 
+// [column, default, coercion] for every defaulted column, resolved once so
+// normaliseRow fills and coerces each column in a single visit instead of
+// separate defaults / bool / numeric passes over the row.
+type ColumnCoercion = 'bool' | 'number' | null;
+const DEFAULT_COLUMNS: ReadonlyArray<readonly [string, unknown, ColumnCoercion]> = Object.entries(DEFAULTS)
+  .map(([key, def]) => {
+    const coercion: ColumnCoercion = BOOL_COLS.includes(key) ? 'bool' : NUMERIC_COLS.includes(key) ? 'number' : null;
+    return [key, def, coercion] as const;
+  });
+
 /**
  * Normalise a raw CSV row (any column names) into a canonical SnapshotRow.
  */
@@ -462,21 +472,12 @@ export function normaliseRow(raw: Record<string, unknown>): SnapshotRow {
     mapped[canonical] = value;
   }
 
-  // fill defaults
-  for (const [key, def] of Object.entries(DEFAULTS)) {
-    if (mapped[key] == null || mapped[key] === '') {
-      mapped[key] = def;
-    }
-  }
-
-  // coerce bools
-  for (const col of BOOL_COLS) {
-    mapped[col] = safeBool(mapped[col], DEFAULTS[col] as boolean);
-  }
-
-  // coerce numerics
-  for (const col of NUMERIC_COLS) {
-    mapped[col] = safeNum(mapped[col], DEFAULTS[col] as number);
+  // fill defaults, then coerce bools / numerics — one visit per column
+  for (const [key, def, coercion] of DEFAULT_COLUMNS) {
+    const value = mapped[key] == null || mapped[key] === '' ? def : mapped[key];
+    if (coercion === 'bool') mapped[key] = safeBool(value, def as boolean);
+    else if (coercion === 'number') mapped[key] = safeNum(value, def as number);
+    else mapped[key] = value;
   }
 
   // days_to_earnings → number | null
@@ -3,7 +3,7 @@
  * Consumed by: nightly.ts, /api/health-check/route.ts, /api/nightly/route.ts
  * Consumes: prisma.ts, market-data.ts, @/types
  * Risk-sensitive: NO
- * Last modified: 2026-02-22
+ * Last modified: 2026-10-14
  * Notes: 16-point health audit — used in nightly Step 1 and dashboard.
  */
 // ============================================================
@@ -258,24 +258,28 @@ function checkPositionSizes(
     return { id: 'C3', label: 'Valid Position Sizes', category: 'Risk', status: 'GREEN', message: 'Too few positions for size check' };
   }
   const caps = getProfileCaps(riskProfile);
-  // Use mark-to-market prices (GBP-normalised where available) rather than stale entry prices
-  const totalValue = positions.reduce((sum: number, p: HealthCheckPosition) => {
+  // Use mark-to-market prices (GBP-normalised where available) rather than stale entry prices.
+  // Resolve each position's mark value once — the size pass below reuses it
+  // instead of re-walking the gbp → live → entry fallback chain.
+  const positionValues: number[] = new Array(positions.length);
+  let totalValue = 0;
+  for (let i = 0; i < positions.length; i++) {
+    const p = positions[i];
     const ticker = p.stock?.ticker;
     const markPrice = ticker ? (gbpPrices?.[ticker] ?? livePrices?.[ticker] ?? p.entryPrice) : p.entryPrice;
-    return sum + markPrice * p.shares;
-  }, 0);
-  const oversized = positions.filter((p: HealthCheckPosition) => {
-    const ticker = p.stock?.ticker;
-    const markPrice = ticker ? (gbpPrices?.[ticker] ?? livePrices?.[ticker] ?? p.entryPrice) : p.entryPrice;
-    const posValue = markPrice * p.shares;
-    const pct = totalValue > 0 ? posValue / totalValue : 0;
-    const sleeve = p.stock?.sleeve || 'CORE';
+    positionValues[i] = markPrice * p.shares;
+    totalValue += positionValues[i];
+  }
+  let oversizedCount = 0;
+  for (let i = 0; i < positions.length; i++) {
+    const pct = totalValue > 0 ? positionValues[i] / totalValue : 0;
+    const sleeve = positions[i].stock?.sleeve || 'CORE';
     const cap = caps.positionSizeCaps[sleeve] ?? 0.16;
-    return pct > cap;
-  });
+    if (pct > cap) oversizedCount++;
+  }
 
-  if (oversized.length > 0) {
-    return { id: 'C3', label: 'Valid Position Sizes', category: 'Risk', status: 'YELLOW', message: `${oversized.length} position(s) exceed size limits (mark-to-market)` };
+  if (oversizedCount > 0) {
+    return { id: 'C3', label: 'Valid Position Sizes', category: 'Risk', status: 'YELLOW', message: `${oversizedCount} position(s) exceed size limits (mark-to-market)` };
   }
   return { id: 'C3', label: 'Valid Position Sizes', category: 'Risk', status: 'GREEN', message: 'All positions within size limits (mark-to-market)' };
 }
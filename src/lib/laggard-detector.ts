@@ -24,7 +24,7 @@
  * Consumed by: /api/scan/route.ts, nightly.ts, modules/laggard-purge.ts
  * Consumes: (standalone — no imports)
  * Risk-sensitive: NO — flags only, no auto-action
- * Last modified: 2026-02-24
+ * Last modified: 2026-10-14
  * Notes: MA20 + ADX fields are optional; callers must supply them for recovery exemption to activate
  */
 
@@ -36,6 +36,8 @@ export const LAGGARD_CONFIG = {
   deadMoneyMaxR: 0.5,       // R-multiple threshold (stalled if < 0.5R)
 } as const;
 
+const MS_PER_DAY = 1000 * 60 * 60 * 24;
+
 export interface LaggardResult {
   positionId: string;
   ticker: string;
@@ -73,12 +75,12 @@ export function detectLaggards(
 ): LaggardResult[] {
   if (!LAGGARD_CONFIG.enabled) return [];
 
-  const now = new Date();
+  const nowMs = Date.now();
   const results: LaggardResult[] = [];
 
   for (const pos of positions) {
     const daysHeld = Math.floor(
-      (now.getTime() - new Date(pos.entryDate).getTime()) / (1000 * 60 * 60 * 24)
+      (nowMs - new Date(pos.entryDate).getTime()) / MS_PER_DAY
     );
 
     const rMultiple = pos.initialRisk > 0
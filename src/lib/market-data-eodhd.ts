@@ -11,7 +11,7 @@
 // Consumed by: market-data.ts (provider routing)
 // Consumes: types/index.ts
 // Risk-sensitive: YES — prices feed position sizing + stop logic
-// Last modified: 2026-02-20
+// Last modified: 2026-10-14
 // Notes: UK stocks on EODHD use GBX (pence) just like Yahoo.
 //        Verify after first live run.
 // ============================================================
@@ -37,7 +37,14 @@ interface CacheEntry<T> {
 
 const quoteCache = new Map<string, CacheEntry<StockQuote>>();
 const historicalCache = new Map<string, CacheEntry<DailyBar[]>>();
-const fxCache = new Map<string, CacheEntry<number>>();
+// FX rates persist on globalThis for the same reason as the Yahoo provider's
+const globalForFx = globalThis as unknown as {
+  __eodhdFxCache: Map<string, CacheEntry<number>> | undefined;
+};
+if (!globalForFx.__eodhdFxCache) {
+  globalForFx.__eodhdFxCache = new Map<string, CacheEntry<number>>();
+}
+const fxCache = globalForFx.__eodhdFxCache;
 const QUOTE_TTL = 30 * 60_000;       // 30 minutes
 const HISTORICAL_TTL = 86_400_000;   // 24 hours
 const FX_TTL = 30 * 60_000;          // 30 minutes
@@ -0,0 +1,20 @@
+import { describe, expect, it } from 'vitest';
+import { benchmarkMa200 } from './market-data';
+
+const benchmarkBars = (latestClose: number) =>
+  Array.from({ length: 250 }, (_, i) => ({
+    date: `bar-${250 - i}`,
+    open: 100,
+    high: 101,
+    low: 99,
+    close: i === 0 ? latestClose : 100,
+    volume: 1_000,
+  }));
+
+describe('benchmarkMa200 memo', () => {
+  it('recomputes when today\'s close updates intraday on the same bar date', () => {
+    expect(benchmarkMa200('MEMO_TEST', benchmarkBars(100))).toBe(100);
+    // Same newest date and bar count, different last close
+    expect(benchmarkMa200('MEMO_TEST', benchmarkBars(300))).toBe(101);
+  });
+});
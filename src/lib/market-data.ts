@@ -7,7 +7,7 @@
 //              /api/scan/route.ts, /api/market-data/route.ts
 // Consumes: yahoo-finance2, market-data-eodhd.ts, types/index.ts
 // Risk-sensitive: YES — prices feed position sizing + stop logic
-// Last modified: 2026-02-20
+// Last modified: 2026-10-14
 //
 // Provider routing:
 //   Default: Yahoo Finance (no API key needed)
@@ -105,7 +105,7 @@ export interface YahooCalendarEvents {
 
 /** Shape of the yahoo-finance2 instance */
 interface YahooFinanceInstance {
-  quote(ticker: string): Promise<YahooQuoteResult | null>;
+  quote(ticker: string, queryOptions?: { fields: string[] }): Promise<YahooQuoteResult | null>;
   quote(tickers: string[]): Promise<YahooQuoteResult[]>;
   chart(ticker: string, opts: { period1: string; period2: string; interval: string }): Promise<{ quotes: YahooChartBar[] }>;
   quoteSummary(ticker: string, opts: { modules: string[] }): Promise<{ calendarEvents?: YahooCalendarEvents } | null>;
@@ -120,9 +120,13 @@ interface CacheEntry<T> {
 const quoteCache = new Map<string, CacheEntry<StockQuote>>();
 const historicalCache = new Map<string, CacheEntry<DailyBar[]>>();
 const weeklyCache = new Map<string, CacheEntry<DailyBar[]>>();
+// In-flight daily-bar fetches keyed like historicalCache — dedupes cold-cache bursts
+const historicalInflight = new Map<string, Promise<DailyBar[]>>();
 const QUOTE_TTL = 30 * 60_000;     // 30 minutes — prices fetched once per session, manual refresh available
 const HISTORICAL_TTL = 86_400_000; // 24 hours (daily bars don't change intraday)
 const FX_TTL = 30 * 60_000;        // 30 minutes — FX rates move slowly
+const COMPACT_LOOKBACK_DAYS = 120; // calendar days requested for 'compact' daily bars
+const FULL_LOOKBACK_DAYS = 400;    // calendar days requested for 'full' daily bars
 
 // ── Rate-limited chart queue ──
 // Serialises yf.chart() calls with a configurable delay to avoid rate-limiting.
@@ -140,7 +144,16 @@ function enqueueChartCall<T>(fn: () => Promise<T>): Promise<T> {
 }
 
 // ── FX rate cache ──
-const fxCache = new Map<string, CacheEntry<number>>();
+// Persisted on globalThis (same pattern as the Prisma singleton and scan cache)
+// so Next.js hot-reloads and separately bundled route handlers in the same
+// process share one set of rates instead of each refetching from Yahoo.
+const globalForFx = globalThis as unknown as {
+  __yahooFxCache: Map<string, CacheEntry<number>> | undefined;
+};
+if (!globalForFx.__yahooFxCache) {
+  globalForFx.__yahooFxCache = new Map<string, CacheEntry<number>>();
+}
+const fxCache = globalForFx.__yahooFxCache;
 
 interface DailyBar {
   date: string;
@@ -151,6 +164,25 @@ interface DailyBar {
   volume: number;
 }
 
+/**
+ * Validated chart bars → DailyBar[], newest first (scan-engine expects this order).
+ * Each bar's date is parsed once up front rather than twice per sort comparison,
+ * and the ISO day is taken by prefix instead of split('T')[0].
+ */
+function toDailyBarsNewestFirst(quotes: z.infer<typeof YahooChartBarSchema>[]): DailyBar[] {
+  return quotes
+    .map((bar) => ({ bar, ms: new Date(bar.date).getTime() }))
+    .sort((a, b) => b.ms - a.ms)
+    .map(({ bar, ms }) => ({
+      date: new Date(ms).toISOString().slice(0, 10),
+      open: bar.open,
+      high: bar.high,
+      low: bar.low,
+      close: bar.adjclose ?? bar.close,
+      volume: bar.volume,
+    }));
+}
+
 // ── Ticker translation: DB/T212 format → Yahoo Finance format ──
 // Trading 212 uses e.g. "GSKl" for London, Yahoo Finance uses "GSK.L"
 // Non-US tickers without exchange suffixes need explicit mapping.
@@ -202,13 +234,26 @@ const YAHOO_TICKER_MAP: Record<string, string> = {
   UCG: 'UCG.MI',
 };
 
+// Mapped symbol per raw ticker — the map/suffix rules are static, so each
+// ticker is resolved once rather than on every quote and history call
+const yahooTickerMemo = new Map<string, string>();
+
 /**
  * Convert a database/T212 ticker to its Yahoo Finance symbol.
  * Priority: explicit yahooTicker override → static map → T212 'l' suffix rule → passthrough.
  */
 export function toYahooTicker(ticker: string, yahooTickerOverride?: string | null): string {
   if (yahooTickerOverride) return yahooTickerOverride;
-  if (YAHOO_TICKER_MAP[ticker]) return YAHOO_TICKER_MAP[ticker];
+  const memo = yahooTickerMemo.get(ticker);
+  if (memo !== undefined) return memo;
+  const resolved = resolveYahooTicker(ticker);
+  yahooTickerMemo.set(ticker, resolved);
+  return resolved;
+}
+
+function resolveYahooTicker(ticker: string): string {
+  const mapped = YAHOO_TICKER_MAP[ticker];
+  if (mapped) return mapped;
   // UK stocks: T212 appends lowercase 'l' for London exchange
   if (/^[A-Z]{2,5}l$/.test(ticker)) {
     return ticker.slice(0, -1) + '.L';
@@ -276,10 +321,48 @@ export async function getDailyPrices(
   const cached = historicalCache.get(cacheKey);
   if (cached && cached.expiry > Date.now()) return cached.data;
 
+  // A fresh 'full' entry already contains the compact window (nightly and the
+  // scan pre-cache full history first) — slice it out instead of issuing a
+  // second chart request for the same ticker.
+  if (outputSize === 'compact') {
+    const full = historicalCache.get(`${ticker}:full`);
+    if (full && full.expiry > Date.now()) {
+      const bars = compactWindow(full.data);
+      historicalCache.set(cacheKey, { data: bars, expiry: full.expiry });
+      return bars;
+    }
+  }
+
+  // Share one in-flight request between concurrent callers for the same key
+  // (e.g. every ticker in a scan batch asks for SPY before the cache is warm).
+  const pending = historicalInflight.get(cacheKey);
+  if (pending) return pending;
+
+  const request = fetchYahooDailyPrices(ticker, outputSize, cacheKey)
+    .finally(() => historicalInflight.delete(cacheKey));
+  historicalInflight.set(cacheKey, request);
+  return request;
+}
+
+/** Newest-first bars on or after the compact request's period1 date. */
+function compactWindow(fullBars: DailyBar[]): DailyBar[] {
+  const period1 = new Date();
+  period1.setDate(period1.getDate() - COMPACT_LOOKBACK_DAYS);
+  const cutoff = period1.toISOString().split('T')[0];
+  let end = 0;
+  while (end < fullBars.length && fullBars[end].date >= cutoff) end++;
+  return fullBars.slice(0, end);
+}
+
+async function fetchYahooDailyPrices(
+  ticker: string,
+  outputSize: 'compact' | 'full',
+  cacheKey: string
+): Promise<DailyBar[]> {
   try {
     // compact = ~100 days, full = ~400 days (need 200+ for MA200)
     const period1 = new Date();
-    period1.setDate(period1.getDate() - (outputSize === 'full' ? 400 : 120));
+    period1.setDate(period1.getDate() - (outputSize === 'full' ? FULL_LOOKBACK_DAYS : COMPACT_LOOKBACK_DAYS));
 
     // Yahoo chart API treats period2 as EXCLUSIVE — setting it to today
     // excludes today's bar (returns only up to yesterday's close).
@@ -314,16 +397,7 @@ export async function getDailyPrices(
     const validBars = chartParsed.data.quotes;
 
     // Sort newest first (scan-engine expects this order)
-    const bars: DailyBar[] = validBars
-      .sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime())
-      .map((bar) => ({
-        date: new Date(bar.date).toISOString().split('T')[0],
-        open: bar.open,
-        high: bar.high,
-        low: bar.low,
-        close: bar.adjclose ?? bar.close,
-        volume: bar.volume,
-      }));
+    const bars = toDailyBarsNewestFirst(validBars);
 
     historicalCache.set(cacheKey, { data: bars, expiry: Date.now() + HISTORICAL_TTL });
     return bars;
@@ -378,16 +452,7 @@ export async function getWeeklyPrices(
     const validBars = chartParsed.data.quotes;
 
     // Sort newest first (consistent with daily bars)
-    const bars: DailyBar[] = validBars
-      .sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime())
-      .map((bar) => ({
-        date: new Date(bar.date).toISOString().split('T')[0],
-        open: bar.open,
-        high: bar.high,
-        low: bar.low,
-        close: bar.adjclose ?? bar.close,
-        volume: bar.volume,
-      }));
+    const bars = toDailyBarsNewestFirst(validBars);
 
     weeklyCache.set(cacheKey, { data: bars, expiry: Date.now() + HISTORICAL_TTL });
     return bars;
@@ -404,6 +469,18 @@ export function calculateMA(prices: number[], period: number): number {
   return slice.reduce((sum, p) => sum + p, 0) / period;
 }
 
+/**
+ * Simple MA of bar closes over the newest `period` bars (bars newest-first).
+ * Same result as calculateMA(bars.map(b => b.close), period) without
+ * materialising the close array.
+ */
+function closeMA(bars: { close: number }[], period: number): number {
+  if (bars.length < period) return 0;
+  let sum = 0;
+  for (let i = 0; i < period; i++) sum += bars[i].close;
+  return sum / period;
+}
+
 export function calculateEMA(prices: number[], period: number): number {
   if (prices.length < period) return 0;
   const multiplier = 2 / (period + 1);
@@ -443,44 +520,51 @@ export function calculateADX(
   // Insufficient data — return zeros so callers reject the ticker (adx < 20 filter)
   if (data.length < period * 2 + 1) return { adx: 0, plusDI: 0, minusDI: 0 };
 
-  // Data is sorted newest-first — compute DM/TR walking from oldest to newest
+  // Data is sorted newest-first — compute DM/TR walking from oldest to newest.
+  // Fixed-size Float64Arrays: the lengths are known up front, so the kernel
+  // runs over typed doubles with no push-growth and no slice() temporaries.
   const len = data.length;
-  const plusDMs: number[] = [];
-  const minusDMs: number[] = [];
-  const trs: number[] = [];
+  const n = len - 1;
+  const plusDMs = new Float64Array(n);
+  const minusDMs = new Float64Array(n);
+  const trs = new Float64Array(n);
 
   // Build arrays in chronological order (oldest first)
-  for (let i = len - 1; i > 0; i--) {
+  for (let i = len - 1, k = 0; i > 0; i--, k++) {
     const plusDM = data[i - 1].high - data[i].high;
     const minusDM = data[i].low - data[i - 1].low;
 
-    plusDMs.push(plusDM > minusDM && plusDM > 0 ? plusDM : 0);
-    minusDMs.push(minusDM > plusDM && minusDM > 0 ? minusDM : 0);
+    plusDMs[k] = plusDM > minusDM && plusDM > 0 ? plusDM : 0;
+    minusDMs[k] = minusDM > plusDM && minusDM > 0 ? minusDM : 0;
 
-    const tr = Math.max(
+    trs[k] = Math.max(
       data[i - 1].high - data[i - 1].low,
       Math.abs(data[i - 1].high - data[i].close),
       Math.abs(data[i - 1].low - data[i].close)
     );
-    trs.push(tr);
   }
 
   // Seed smoothed values with first `period` bars
-  let smoothPlusDM = plusDMs.slice(0, period).reduce((a, b) => a + b, 0);
-  let smoothMinusDM = minusDMs.slice(0, period).reduce((a, b) => a + b, 0);
-  let smoothTR = trs.slice(0, period).reduce((a, b) => a + b, 0);
+  let smoothPlusDM = 0;
+  let smoothMinusDM = 0;
+  let smoothTR = 0;
+  for (let k = 0; k < period; k++) {
+    smoothPlusDM += plusDMs[k];
+    smoothMinusDM += minusDMs[k];
+    smoothTR += trs[k];
+  }
 
-  // Collect DX values for ADX smoothing
-  const dxValues: number[] = [];
+  // Collect DX values for ADX smoothing — one from the seed, one per later bar
+  const dxValues = new Float64Array(n - period + 1);
 
   // First DX from the seed
   const plusDI0 = smoothTR > 0 ? (smoothPlusDM / smoothTR) * 100 : 0;
   const minusDI0 = smoothTR > 0 ? (smoothMinusDM / smoothTR) * 100 : 0;
   const diSum0 = plusDI0 + minusDI0;
-  dxValues.push(diSum0 > 0 ? (Math.abs(plusDI0 - minusDI0) / diSum0) * 100 : 0);
+  dxValues[0] = diSum0 > 0 ? (Math.abs(plusDI0 - minusDI0) / diSum0) * 100 : 0;
 
   // Continue smoothing DM/TR and collecting DX values
-  for (let i = period; i < plusDMs.length; i++) {
+  for (let i = period; i < n; i++) {
     smoothPlusDM = smoothPlusDM - smoothPlusDM / period + plusDMs[i];
     smoothMinusDM = smoothMinusDM - smoothMinusDM / period + minusDMs[i];
     smoothTR = smoothTR - smoothTR / period + trs[i];
@@ -488,7 +572,7 @@ export function calculateADX(
     const pDI = smoothTR > 0 ? (smoothPlusDM / smoothTR) * 100 : 0;
     const mDI = smoothTR > 0 ? (smoothMinusDM / smoothTR) * 100 : 0;
     const diSum = pDI + mDI;
-    dxValues.push(diSum > 0 ? (Math.abs(pDI - mDI) / diSum) * 100 : 0);
+    dxValues[i - period + 1] = diSum > 0 ? (Math.abs(pDI - mDI) / diSum) * 100 : 0;
   }
 
   // Final +DI / -DI from last smoothed values
@@ -499,7 +583,9 @@ export function calculateADX(
   if (dxValues.length < period) {
     return { adx: dxValues[dxValues.length - 1] || 20, plusDI, minusDI };
   }
-  let adx = dxValues.slice(0, period).reduce((a, b) => a + b, 0) / period;
+  let dxSeed = 0;
+  for (let i = 0; i < period; i++) dxSeed += dxValues[i];
+  let adx = dxSeed / period;
   for (let i = period; i < dxValues.length; i++) {
     adx = (adx * (period - 1) + dxValues[i]) / period;
   }
@@ -717,6 +803,8 @@ export async function getFearGreedIndex(): Promise<FearGreedData> {
 
 // ── Batch Quotes — efficient multi-ticker fetch ──
 // ── FX Rate fetch (e.g. USDGBP=X) ──
+const FX_QUOTE_FIELDS = ['regularMarketPrice'];
+
 export async function getFXRate(fromCurrency: string, toCurrency: string): Promise<number> {
   // Route to EODHD if configured
   if (isEodhd()) return eodhd.getFXRate(fromCurrency, toCurrency);
@@ -727,6 +815,21 @@ export async function getFXRate(fromCurrency: string, toCurrency: string): Promi
   const cached = fxCache.get(cacheKey);
   if (cached && cached.expiry > Date.now()) return cached.data;
 
+  try {
+    // Only the spot price is needed — ask Yahoo for that field alone rather
+    // than the full ~80-field quote payload
+    const result = await yf.quote(`${pair}=X`, { fields: FX_QUOTE_FIELDS });
+    const rate = result?.regularMarketPrice;
+    if (rate && rate > 0) {
+      fxCache.set(cacheKey, { data: rate, expiry: Date.now() + FX_TTL });
+      return rate;
+    }
+  } catch (error) {
+    console.warn(`[YF] FX rate (spot field) failed for ${pair}:`, (error as Error).message);
+  }
+
+  // Limited-field request failed or returned no price — retry with the full
+  // quote before falling back to the hardcoded table (it drives sizing)
   try {
     const result = await yf.quote(`${pair}=X`);
     const rate = result?.regularMarketPrice;
@@ -756,6 +859,14 @@ function isUKTicker(ticker: string): boolean {
   return ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(ticker);
 }
 
+/**
+ * Native price currency for display (matches what T212/Yahoo shows).
+ * UK tickers (.L suffix or T212 lowercase-l form) are quoted in GBX.
+ */
+export function displayCurrency(ticker: string, currency: string | null | undefined): string {
+  return isUKTicker(ticker) ? 'GBX' : (currency || 'USD').toUpperCase();
+}
+
 // ── Price Normalization ──
 // Yahoo Finance returns UK stocks (.L) in pence (GBX), not pounds (GBP).
 // Trading 212 also stores UK prices in GBX.
@@ -786,21 +897,24 @@ export async function normalizeBatchPricesToGBP(
   prices: Record<string, number>,
   stockCurrencies: Record<string, string | null>
 ): Promise<Record<string, number>> {
-  // Group by unique currency for efficient FX fetching
-  const fxRates = new Map<string, number>();
+  // Resolve each ticker's effective currency once: explicit stockCurrency takes
+  // priority, then fall back to GBX for UK tickers, USD otherwise. Both the FX
+  // prefetch and the conversion pass read from this list.
+  const entries = Object.entries(prices);
+  const currencies: string[] = new Array(entries.length);
   const currenciesNeeded = new Set<string>();
-
-  for (const [ticker] of Object.entries(prices)) {
-    // Determine effective currency: explicit stockCurrency takes priority,
-    // then fall back to GBX for UK tickers, USD otherwise
+  for (let i = 0; i < entries.length; i++) {
+    const ticker = entries[i][0];
     const currency = stockCurrencies[ticker]?.toUpperCase()
       || (isUKTicker(ticker) ? 'GBX' : 'USD');
+    currencies[i] = currency;
     if (currency !== 'GBP' && currency !== 'GBX' && currency !== 'GBp') {
       currenciesNeeded.add(currency);
     }
   }
 
   // Fetch all needed FX rates in parallel
+  const fxRates = new Map<string, number>();
   const fxEntries = await Promise.all(
     Array.from(currenciesNeeded).map(async (curr) => {
       const rate = await getFXRate(curr, 'GBP');
@@ -812,9 +926,9 @@ export async function normalizeBatchPricesToGBP(
   }
 
   const normalized: Record<string, number> = {};
-  for (const [ticker, price] of Object.entries(prices)) {
-    const currency = stockCurrencies[ticker]?.toUpperCase()
-      || (isUKTicker(ticker) ? 'GBX' : 'USD');
+  for (let i = 0; i < entries.length; i++) {
+    const [ticker, price] = entries[i];
+    const currency = currencies[i];
     if (currency === 'GBP') {
       normalized[ticker] = price;
     } else if (currency === 'GBX' || currency === 'GBp') {
@@ -847,14 +961,18 @@ export async function getBatchQuotes(tickers: string[]): Promise<Map<string, Sto
 
   if (uncached.length === 0) return results;
 
-  // Build yahoo ticker → original ticker reverse map
-  const yahooToOriginal = new Map<string, string>();
-  const yahooTickers: string[] = [];
+  // Build yahoo ticker → original tickers reverse map. Several app tickers can
+  // share one underlying (e.g. GSKl and GSK.L): each Yahoo symbol is requested
+  // once and the quote fanned out to every alias, rather than the later alias
+  // overwriting the earlier one.
+  const yahooToOriginals = new Map<string, string[]>();
   for (const ticker of uncached) {
     const yt = toYahooTicker(ticker);
-    yahooToOriginal.set(yt, ticker);
-    yahooTickers.push(yt);
+    const aliases = yahooToOriginals.get(yt);
+    if (!aliases) yahooToOriginals.set(yt, [ticker]);
+    else if (!aliases.includes(ticker)) aliases.push(ticker);
   }
+  const yahooTickers = Array.from(yahooToOriginals.keys());
 
   // True batch: yf.quote() accepts arrays — process in chunks of 50
   const BATCH_SIZE = 50;
@@ -864,10 +982,10 @@ export async function getBatchQuotes(tickers: string[]): Promise<Map<string, Sto
       const rawResults = await yf.quote(batch) as YahooQuoteResult[];
       for (const r of rawResults) {
         if (!r || !r.regularMarketPrice || !r.symbol) continue;
-        const originalTicker = yahooToOriginal.get(r.symbol) || r.symbol;
+        const originals = yahooToOriginals.get(r.symbol) ?? [r.symbol];
         const quote: StockQuote = {
           ticker: r.symbol,
-          name: r.shortName || r.longName || originalTicker,
+          name: r.shortName || r.longName || originals[0],
           price: r.regularMarketPrice,
           change: r.regularMarketChange || 0,
           changePercent: r.regularMarketChangePercent || 0,
@@ -877,17 +995,20 @@ export async function getBatchQuotes(tickers: string[]): Promise<Map<string, Sto
           low: r.regularMarketDayLow || r.regularMarketPrice,
           open: r.regularMarketOpen || r.regularMarketPrice,
         };
-        quoteCache.set(originalTicker, { data: quote, expiry: Date.now() + QUOTE_TTL });
-        results.set(originalTicker, quote);
+        const expiry = Date.now() + QUOTE_TTL;
+        for (const originalTicker of originals) {
+          quoteCache.set(originalTicker, { data: quote, expiry });
+          results.set(originalTicker, quote);
+        }
       }
     } catch (error) {
       console.error(`[YF] Batch quote failed for chunk ${i}-${i + batch.length}:`, (error as Error).message);
       // Fallback: fetch individually for this chunk
       for (const yt of batch) {
-        const originalTicker = yahooToOriginal.get(yt) || yt;
+        const originals = yahooToOriginals.get(yt) ?? [yt];
         try {
-          const quote = await getStockQuote(originalTicker);
-          if (quote) results.set(originalTicker, quote);
+          const quote = await getStockQuote(originals[0]);
+          if (quote) for (const originalTicker of originals) results.set(originalTicker, quote);
         } catch { /* skip */ }
       }
     }
@@ -932,6 +1053,26 @@ function computeDayRegime(
   return 'SIDEWAYS';
 }
 
+// ── Benchmark MA200 memo ──
+// getMarketRegime() runs from the scan, snapshot sync, modules route and
+// nightly, all against the same cached benchmark bars. Keyed by the newest
+// bar's date and close plus the bar count, so both a new daily bar and an
+// intraday update to today's close invalidate it.
+const benchmarkMaCache = new Map<string, { barKey: string; ma200: number }>();
+
+/**
+ * MA200 of a benchmark's closes, memoised per symbol. Callers holding the
+ * same benchmark bars (e.g. dual-regime panels) share the cached value.
+ */
+export function benchmarkMa200(ticker: string, bars: DailyBar[]): number {
+  const barKey = `${bars[0]?.date ?? ''}:${bars[0]?.close ?? ''}:${bars.length}`;
+  const cached = benchmarkMaCache.get(ticker);
+  if (cached && cached.barKey === barKey) return cached.ma200;
+  const ma200 = closeMA(bars, 200);
+  benchmarkMaCache.set(ticker, { barKey, ma200 });
+  return ma200;
+}
+
 export async function getMarketRegime(): Promise<'BULLISH' | 'SIDEWAYS' | 'BEARISH'> {
   try {
     // Fetch full history for both benchmarks in parallel
@@ -944,47 +1085,30 @@ export async function getMarketRegime(): Promise<'BULLISH' | 'SIDEWAYS' | 'BEARI
     // If VWRL data is unavailable, fall back to SPY-only with CHOP band
     const hasVwrl = vwrlData.length >= 200;
 
-    const spyCloses = spyData.map((d) => d.close);
-    const spyMa200 = calculateMA(spyCloses, 200);
-
-    let vwrlMa200 = 0;
-    if (hasVwrl) {
-      const vwrlCloses = vwrlData.map((d) => d.close);
-      vwrlMa200 = calculateMA(vwrlCloses, 200);
-    }
+    // MA200 is read straight off the newest 200 bars — the full ~400-bar
+    // close history is never needed here, so don't copy it into an array.
+    const spyMa200 = benchmarkMa200('SPY', spyData);
+    const vwrlMa200 = hasVwrl ? benchmarkMa200('VWRL.L', vwrlData) : 0;
 
     // --- 3-day stability check ---
     // Compute regime for each of the last 3 trading days.
-    // All 3 must agree for BULLISH confirmation; otherwise fall back to SIDEWAYS.
+    // All 3 must agree for confirmation; otherwise fall back to SIDEWAYS.
+    // (spyData has ≥200 bars here, so all 3 days are always present.)
     const STABILITY_DAYS = 3;
-    const regimes: ('BULLISH' | 'SIDEWAYS' | 'BEARISH')[] = [];
 
-    for (let day = 0; day < STABILITY_DAYS; day++) {
-      if (day >= spyData.length) break;
-      const spyClose = spyData[day].close;
-
-      if (hasVwrl && day < vwrlData.length) {
-        const vwrlClose = vwrlData[day].close;
-        regimes.push(computeDayRegime(spyClose, spyMa200, vwrlClose, vwrlMa200));
-      } else {
+    const dayRegime = (day: number): 'BULLISH' | 'SIDEWAYS' | 'BEARISH' =>
+      hasVwrl && day < vwrlData.length
+        ? computeDayRegime(spyData[day].close, spyMa200, vwrlData[day].close, vwrlMa200)
         // SPY-only with CHOP band fallback
-        regimes.push(singleBenchmarkRegime(spyClose, spyMa200));
-      }
-    }
+        : singleBenchmarkRegime(spyData[day].close, spyMa200);
 
-    // Today's raw regime
-    const todayRegime = regimes[0] ?? 'SIDEWAYS';
-
-    // Stability: all 3 days must show the same regime
-    if (regimes.length >= STABILITY_DAYS) {
-      const allSame = regimes.every((r) => r === todayRegime);
-      if (allSame) return todayRegime;
-      // Not stable — force SIDEWAYS (spec: "needs 3 for confirmation")
-      return 'SIDEWAYS';
+    // Today's raw regime; stop at the first day that disagrees
+    // (spec: "needs 3 for confirmation") instead of classifying every day first.
+    const todayRegime = dayRegime(0);
+    for (let day = 1; day < STABILITY_DAYS; day++) {
+      if (dayRegime(day) !== todayRegime) return 'SIDEWAYS';
     }
-
-    // Fewer than 3 days of data — conservative fallback
-    return 'SIDEWAYS';
+    return todayRegime;
   } catch {
     return 'SIDEWAYS';
   }
@@ -12,6 +12,20 @@ import { getDailyPrices, calculateMA } from '../market-data';
 
 const BREADTH_THRESHOLD = 40; // percent
 const RESTRICTED_MAX_POSITIONS = 4;
+const BREADTH_MA_PERIOD = 50;
+const BREADTH_SAMPLE_SIZE = 30;
+
+function sampleTickers(tickers: string[], n: number): string[] {
+  const pool = tickers.slice();
+  for (let i = 0; i < n; i++) {
+    const j = i + Math.floor(Math.random() * (pool.length - i));
+    const tmp = pool[i];
+    pool[i] = pool[j];
+    pool[j] = tmp;
+  }
+  pool.length = n;
+  return pool;
+}
 
 /**
  * Calculate market breadth: % of given tickers above their 50DMA.
@@ -22,9 +36,11 @@ export async function calculateBreadth(
 ): Promise<number> {
   if (tickers.length === 0) return 100;
 
-  // Sample max 30 tickers for performance (shuffled for representativeness)
-  const sampled = tickers.length > 30
-    ? [...tickers].sort(() => Math.random() - 0.5).slice(0, 30)
+  // Sample max 30 tickers for performance (random for representativeness).
+  // Partial Fisher–Yates: only the first 30 slots are shuffled, instead of
+  // sorting a full copy of the universe with a random comparator.
+  const sampled = tickers.length > BREADTH_SAMPLE_SIZE
+    ? sampleTickers(tickers, BREADTH_SAMPLE_SIZE)
     : tickers;
 
   let above50DMA = 0;
@@ -33,23 +49,26 @@ export async function calculateBreadth(
 
   for (let i = 0; i < sampled.length; i += BATCH_SIZE) {
     const batch = sampled.slice(i, i + BATCH_SIZE);
-    const results = await Promise.allSettled(
-      batch.map(async (ticker) => {
-        const bars = await getDailyPrices(ticker, 'compact');
-        if (bars.length < 50) return null;
-
-        const price = bars[0].close;
-        const closes = bars.map(b => b.close);
-        const ma50 = calculateMA(closes, 50);
-        return price > ma50;
-      })
+    // Only the network fetch can fail — contain that here so the breadth
+    // math below runs as plain checks instead of settled-promise unwrapping.
+    // 'compact' is shared with the scan/snapshot cache, so reuse it rather
+    // than requesting a shorter window that would miss the cache.
+    const batchBars = await Promise.all(
+      batch.map((ticker) =>
+        getDailyPrices(ticker, 'compact').catch(() => [])
+      )
     );
 
-    for (const r of results) {
-      if (r.status === 'fulfilled' && r.value !== null) {
-        checked++;
-        if (r.value) above50DMA++;
-      }
+    for (const bars of batchBars) {
+      if (bars.length < BREADTH_MA_PERIOD) continue;
+
+      const price = bars[0].close;
+      // Only the newest 50 closes feed the MA — don't copy the full window
+      const closes = bars.slice(0, BREADTH_MA_PERIOD).map(b => b.close);
+      const ma50 = calculateMA(closes, BREADTH_MA_PERIOD);
+
+      checked++;
+      if (price > ma50) above50DMA++;
     }
 
     if (i + BATCH_SIZE < sampled.length) {
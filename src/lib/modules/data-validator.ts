@@ -44,7 +44,8 @@ export function validateTickerData(
 
   // Check for price spikes (anomalies)
   let hasSpikeAnomaly = false;
-  for (let i = 0; i < Math.min(5, bars.length - 1); i++) {
+  const spikeWindow = Math.min(5, bars.length - 1);
+  for (let i = 0; i < spikeWindow; i++) {
     const dailyChange = Math.abs(
       ((bars[i].close - bars[i + 1].close) / bars[i + 1].close) * 100
     );
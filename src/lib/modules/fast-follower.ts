@@ -12,6 +12,7 @@ import { getDailyPrices, getPriorNDayHigh } from '../market-data';
 
 const MAX_DAYS_SINCE_EXIT = 10;
 const VOLUME_THRESHOLD = 2.0;
+const MS_PER_DAY = 1000 * 60 * 60 * 24;
 
 interface ClosedPositionForFF {
   ticker: string;
@@ -33,21 +34,26 @@ export async function scanFastFollowers(
   closedPositions: ClosedPositionForFF[],
   blockedTickers?: Set<string>
 ): Promise<FastFollowerSignal[]> {
-  const now = new Date();
+  const nowMs = Date.now();
 
-  const recentStopOuts = closedPositions.filter(p => {
-    if (p.exitReason !== 'STOP_HIT') return false;
+  // Exit date and days-since-exit are derived once here and carried
+  // through to the signal, rather than recomputed per ticker below.
+  const recentStopOuts: { pos: ClosedPositionForFF; exitDate: Date; daysSinceExit: number }[] = [];
+  for (const p of closedPositions) {
+    if (p.exitReason !== 'STOP_HIT') continue;
     // Whipsaw guard takes precedence — blocked tickers cannot re-enter
-    if (blockedTickers?.has(p.ticker)) return false;
+    if (blockedTickers?.has(p.ticker)) continue;
     const exitDate = p.exitDate instanceof Date ? p.exitDate : new Date(p.exitDate);
-    const daysSince = Math.floor((now.getTime() - exitDate.getTime()) / (1000 * 60 * 60 * 24));
-    return daysSince <= MAX_DAYS_SINCE_EXIT;
-  });
+    const daysSinceExit = Math.floor((nowMs - exitDate.getTime()) / MS_PER_DAY);
+    if (daysSinceExit <= MAX_DAYS_SINCE_EXIT) {
+      recentStopOuts.push({ pos: p, exitDate, daysSinceExit });
+    }
+  }
 
   if (recentStopOuts.length === 0) return [];
 
   const results = await Promise.allSettled(
-    recentStopOuts.map(async (pos): Promise<FastFollowerSignal | null> => {
+    recentStopOuts.map(async ({ pos, exitDate, daysSinceExit }): Promise<FastFollowerSignal | null> => {
       const bars = await getDailyPrices(pos.ticker, 'compact');
       if (bars.length < 20) return null;
 
@@ -57,8 +63,6 @@ export async function scanFastFollowers(
       const volume = bars[0].volume;
       const avgVolume20 = bars.slice(0, 20).reduce((s, b) => s + b.volume, 0) / 20;
 
-      const exitDate = pos.exitDate instanceof Date ? pos.exitDate : new Date(pos.exitDate);
-      const daysSinceExit = Math.floor((now.getTime() - exitDate.getTime()) / (1000 * 60 * 60 * 24));
       const reclaimedTwentyDayHigh = price >= twentyDayHigh;
       const volumeRatio = avgVolume20 > 0 ? volume / avgVolume20 : 0;
       const volumeOk = volumeRatio >= VOLUME_THRESHOLD;
@@ -37,42 +37,51 @@ export function runHeatCheck(
 ): HeatCheckResult[] {
   const results: HeatCheckResult[] = [];
 
-  // Group positions by cluster
-  const clusterPositions = new Map<string, PositionForHeat[]>();
+  // No candidates to check — skip aggregating positions entirely
+  if (candidates.length === 0) return results;
+
+  // Aggregate positions by cluster once — count and momentum sum per cluster —
+  // so each candidate maps to its cluster's stats instead of re-reducing them
+  const clusterStats = new Map<string, { count: number; momentumSum: number }>();
   for (const pos of positions) {
     if (!pos.cluster) continue;
-    const list = clusterPositions.get(pos.cluster) || [];
-    list.push(pos);
-    clusterPositions.set(pos.cluster, list);
+    const stats = clusterStats.get(pos.cluster);
+    if (stats) {
+      stats.count++;
+      stats.momentumSum += pos.rMultiple;
+    } else {
+      clusterStats.set(pos.cluster, { count: 1, momentumSum: pos.rMultiple });
+    }
   }
 
   // Check each candidate against its cluster
   for (const candidate of candidates) {
     if (!candidate.cluster) continue;
 
-    const existing = clusterPositions.get(candidate.cluster) || [];
+    const stats = clusterStats.get(candidate.cluster);
+    const positionsInCluster = stats ? stats.count : 0;
 
-    if (existing.length < HEAT_THRESHOLD) {
+    if (!stats || positionsInCluster < HEAT_THRESHOLD) {
       results.push({
         cluster: candidate.cluster,
-        positionsInCluster: existing.length,
+        positionsInCluster,
         avgMomentum: 0,
         candidateTicker: candidate.ticker,
         candidateMomentum: candidate.rankScore,
         blocked: false,
-        reason: `${existing.length}/${HEAT_THRESHOLD} positions in ${candidate.cluster} — no heat check needed`,
+        reason: `${positionsInCluster}/${HEAT_THRESHOLD} positions in ${candidate.cluster} — no heat check needed`,
       });
       continue;
     }
 
-    const avgMomentum = existing.reduce((sum, p) => sum + p.rMultiple, 0) / existing.length;
+    const avgMomentum = stats.momentumSum / positionsInCluster;
     const threshold = avgMomentum * (1 + MOMENTUM_PREMIUM);
     const candidateMomentum = candidate.rankScore / 100; // normalize
     const blocked = candidateMomentum <= threshold;
 
     results.push({
       cluster: candidate.cluster,
-      positionsInCluster: existing.length,
+      positionsInCluster,
       avgMomentum,
       candidateTicker: candidate.ticker,
       candidateMomentum: candidate.rankScore,
@@ -50,39 +50,63 @@ export function findSwapSuggestions(
 ): SwapSuggestion[] {
   const suggestions: SwapSuggestion[] = [];
 
-  // Group positions by cluster
-  const clusterPositions = new Map<string, PositionForSwap[]>();
+  // No portfolio value means every cluster sits at 0% — none can be near cap
+  if (totalPortfolioValue <= 0) return suggestions;
+
+  // Per-cluster value and weakest holding (lowest R-multiple) in one pass —
+  // the swap loop below needs nothing else from a cluster's positions.
+  // Values sum in position order; ties keep the first-seen weakest. The
+  // held-ticker set is filled in the same pass.
+  const clusterStats = new Map<string, { value: number; weakest: PositionForSwap }>();
+  const heldTickers = new Set<string>();
   for (const pos of positions) {
+    heldTickers.add(pos.ticker);
     if (!pos.cluster) continue;
-    const list = clusterPositions.get(pos.cluster) || [];
-    list.push(pos);
-    clusterPositions.set(pos.cluster, list);
+    const stats = clusterStats.get(pos.cluster);
+    if (stats) {
+      stats.value += pos.value;
+      if (pos.rMultiple < stats.weakest.rMultiple) stats.weakest = pos;
+    } else {
+      clusterStats.set(pos.cluster, { value: pos.value, weakest: pos });
+    }
   }
 
-  for (const [cluster, clusterPos] of Array.from(clusterPositions)) {
-    const clusterValue = clusterPos.reduce((s: number, p: PositionForSwap) => s + p.value, 0);
-    const clusterPct = totalPortfolioValue > 0 ? clusterValue / totalPortfolioValue : 0;
+  // Only suggest swaps if cluster is near or at cap (≥80%) — profile-aware.
+  // The threshold is resolved once, so each cluster is a single compare.
+  const effectiveClusterCap = riskProfile ? getProfileCaps(riskProfile).clusterCap : CLUSTER_CAP;
+  const nearCapPct = effectiveClusterCap * 0.8;
 
-    // Only suggest swaps if cluster is near or at cap (≥80%) — profile-aware
-    const effectiveClusterCap = riskProfile ? getProfileCaps(riskProfile).clusterCap : CLUSTER_CAP;
-    if (clusterPct < effectiveClusterCap * 0.8) continue;
-
-    // Find weakest position in cluster (lowest R-multiple)
-    const weakest = clusterPos.reduce((w: PositionForSwap, p: PositionForSwap) => (p.rMultiple < w.rMultiple ? p : w));
+  // Clusters eligible for a swap, keyed to their weakest holding. Resolved
+  // before the candidate pass so only these clusters get indexed.
+  const swapClusters = new Map<string, PositionForSwap>();
+  clusterStats.forEach(({ value: clusterValue, weakest }, cluster) => {
+    if (clusterValue / totalPortfolioValue < nearCapPct) return;
 
     // Guard: weak position must be genuinely weak, not just "less strong"
-    if (weakest.rMultiple >= WEAK_R_THRESHOLD) continue;
-    if (WEAK_MUST_BE_NEGATIVE && weakest.rMultiple >= 0) continue;
-
-    // Find strongest READY candidate in same cluster
-    const clusterCandidates = candidates
-      .filter(c => c.cluster === cluster && c.status === 'READY')
-      .filter(c => !positions.some(p => p.ticker === c.ticker)) // not already held
-      .filter(c => c.rankScore >= MIN_CANDIDATE_RANK) // must be a quality candidate
-      .sort((a, b) => b.rankScore - a.rankScore);
-
-    if (clusterCandidates.length > 0) {
-      const strongest = clusterCandidates[0];
+    if (weakest.rMultiple >= WEAK_R_THRESHOLD) return;
+    if (WEAK_MUST_BE_NEGATIVE && weakest.rMultiple >= 0) return;
+
+    swapClusters.set(cluster, weakest);
+  });
+  if (swapClusters.size === 0) return suggestions;
+
+  // Index the strongest eligible READY candidate per swap cluster in one pass,
+  // so each cluster lookup below is O(1) instead of re-scanning candidates.
+  // Ties keep the first-seen candidate (same as the previous stable sort).
+  const bestByCluster = new Map<string, CandidateForSwap>();
+  for (const c of candidates) {
+    if (c.status !== 'READY') continue;
+    if (c.rankScore < MIN_CANDIDATE_RANK) continue; // must be a quality candidate
+    if (!swapClusters.has(c.cluster)) continue;      // cluster not at cap
+    if (heldTickers.has(c.ticker)) continue;         // not already held
+    const best = bestByCluster.get(c.cluster);
+    if (!best || c.rankScore > best.rankScore) bestByCluster.set(c.cluster, c);
+  }
+
+  swapClusters.forEach((weakest, cluster) => {
+    // Strongest READY candidate in same cluster
+    const strongest = bestByCluster.get(cluster);
+    if (strongest) {
       suggestions.push({
         cluster,
         weakTicker: weakest.ticker,
@@ -92,7 +116,7 @@ export function findSwapSuggestions(
         reason: `Swap ${weakest.ticker} (${weakest.rMultiple.toFixed(1)}R) → ${strongest.ticker} (score ${strongest.rankScore.toFixed(0)}) in ${cluster}`,
       });
     }
-  }
+  });
 
   return suggestions;
 }
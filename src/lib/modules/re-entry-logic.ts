@@ -13,6 +13,7 @@ import { getDailyPrices, getPriorNDayHigh } from '../market-data';
 
 const COOLDOWN_DAYS = 5;
 const MIN_EXIT_R = 0.5; // Must have exited at > 0.5R profit
+const MS_PER_DAY = 1000 * 60 * 60 * 24;
 
 interface ClosedPositionForReEntry {
   ticker: string;
@@ -27,56 +28,66 @@ interface ClosedPositionForReEntry {
 export async function scanReEntrySignals(
   closedPositions: ClosedPositionForReEntry[]
 ): Promise<ReEntrySignal[]> {
-  const now = new Date();
+  const nowMs = Date.now();
 
-  const eligible = closedPositions.filter(p => {
-    if (!p.exitProfitR || p.exitProfitR < MIN_EXIT_R) return false;
+  // Parse each exit date once — the filter and the signal builder both need
+  // the parsed date and day count, so carry them through instead of re-deriving.
+  const eligible: { pos: ClosedPositionForReEntry; exitDate: Date; daysSinceExit: number }[] = [];
+  for (const p of closedPositions) {
+    if (!p.exitProfitR || p.exitProfitR < MIN_EXIT_R) continue;
     // Not stop-hit exits (those go through fast-follower)
-    if (p.exitReason === 'STOP_HIT') return false;
+    if (p.exitReason === 'STOP_HIT') continue;
+    // Empty string dates are skipped up front rather than parsed into Invalid Date
+    if (!p.exitDate) continue;
     const exitDate = p.exitDate instanceof Date ? p.exitDate : new Date(p.exitDate);
-    const daysSinceExit = Math.floor(
-      (now.getTime() - exitDate.getTime()) / (1000 * 60 * 60 * 24)
-    );
-    return daysSinceExit <= 30; // Skip >30 day old exits early
-  });
+    const daysSinceExit = Math.floor((nowMs - exitDate.getTime()) / MS_PER_DAY);
+    // Skip >30 day old exits early (and unparseable dates, which yield NaN)
+    if (!Number.isFinite(daysSinceExit) || daysSinceExit > 30) continue;
+    eligible.push({ pos: p, exitDate, daysSinceExit });
+  }
 
   if (eligible.length === 0) return [];
 
-  const results = await Promise.allSettled(
-    eligible.map(async (pos): Promise<ReEntrySignal | null> => {
-      const exitDate = pos.exitDate instanceof Date ? pos.exitDate : new Date(pos.exitDate);
-      const daysSinceExit = Math.floor(
-        (now.getTime() - exitDate.getTime()) / (1000 * 60 * 60 * 24)
-      );
-      const cooldownComplete = daysSinceExit >= COOLDOWN_DAYS;
-
-      const bars = await getDailyPrices(pos.ticker, 'compact');
+  // Evaluate the 20-day-high reclaim once per ticker — repeat exits of the
+  // same name share one price check instead of one fetch per closed position.
+  const tickers = Array.from(new Set(eligible.map(e => e.pos.ticker)));
+  const reclaimed = await Promise.allSettled(
+    tickers.map(async (ticker): Promise<boolean | null> => {
+      const bars = await getDailyPrices(ticker, 'compact');
       if (bars.length < 20) return null;
 
       const price = bars[0].close;
       // Exclude today's bar so "reclaimed 20-day high" isn't trivially true on breakout days
       const twentyDayHigh = getPriorNDayHigh(bars, 20);
-      const reclaimedTwentyDayHigh = price >= twentyDayHigh;
-
-      const isEligible = cooldownComplete && reclaimedTwentyDayHigh;
-
-      return {
-        ticker: pos.ticker,
-        exitDate: exitDate.toISOString().split('T')[0],
-        exitProfitR: pos.exitProfitR || 0,
-        daysSinceExit,
-        cooldownComplete,
-        reclaimedTwentyDayHigh,
-        eligible: isEligible,
-        reason: isEligible
-          ? `RE-ENTRY: ${pos.ticker} exited at +${pos.exitProfitR?.toFixed(1)}R, cooldown ${daysSinceExit}d, reclaimed 20d high`
-          : `${!cooldownComplete ? `Cooldown: ${COOLDOWN_DAYS - daysSinceExit}d remaining` : ''} ${!reclaimedTwentyDayHigh ? 'Below 20d high' : ''}`.trim(),
-      };
+      return price >= twentyDayHigh;
     })
   );
+  const reclaimedByTicker = new Map<string, boolean>();
+  reclaimed.forEach((r, i) => {
+    if (r.status === 'fulfilled' && r.value !== null) reclaimedByTicker.set(tickers[i], r.value);
+  });
+
+  const signals: ReEntrySignal[] = [];
+  for (const { pos, exitDate, daysSinceExit } of eligible) {
+    const reclaimedTwentyDayHigh = reclaimedByTicker.get(pos.ticker);
+    if (reclaimedTwentyDayHigh === undefined) continue; // no usable price data
+
+    const cooldownComplete = daysSinceExit >= COOLDOWN_DAYS;
+    const isEligible = cooldownComplete && reclaimedTwentyDayHigh;
+
+    signals.push({
+      ticker: pos.ticker,
+      exitDate: exitDate.toISOString().slice(0, 10), // YYYY-MM-DD prefix
+      exitProfitR: pos.exitProfitR || 0,
+      daysSinceExit,
+      cooldownComplete,
+      reclaimedTwentyDayHigh,
+      eligible: isEligible,
+      reason: isEligible
+        ? `RE-ENTRY: ${pos.ticker} exited at +${pos.exitProfitR?.toFixed(1)}R, cooldown ${daysSinceExit}d, reclaimed 20d high`
+        : `${!cooldownComplete ? `Cooldown: ${COOLDOWN_DAYS - daysSinceExit}d remaining` : ''} ${!reclaimedTwentyDayHigh ? 'Below 20d high' : ''}`.trim(),
+    });
+  }
 
-  return results
-    .filter((r): r is PromiseFulfilledResult<ReEntrySignal | null> => r.status === 'fulfilled')
-    .map(r => r.value)
-    .filter((v): v is ReEntrySignal => v !== null);
+  return signals;
 }
@@ -53,10 +53,15 @@ export function checkSuperClusterCaps(
 
   for (const pos of positions) {
     const sc = pos.superCluster || 'UNCATEGORIZED';
-    const group = scGroups.get(sc) || { value: 0, tickers: [] };
-    group.value += pos.value;
-    group.tickers.push(pos.ticker);
-    scGroups.set(sc, group);
+    // Only a handful of super-clusters exist — allocate/set on the first
+    // position in each and update the existing group in place after that
+    const group = scGroups.get(sc);
+    if (group) {
+      group.value += pos.value;
+      group.tickers.push(pos.ticker);
+    } else {
+      scGroups.set(sc, { value: pos.value, tickers: [pos.ticker] });
+    }
   }
 
   // With fewer than MIN_POSITIONS_FOR_CAP positions,
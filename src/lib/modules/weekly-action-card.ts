@@ -42,6 +42,11 @@ export function generateActionCard(input: ActionCardInput): WeeklyActionCard {
   const weekStart = new Date(now);
   weekStart.setDate(now.getDate() - now.getDay()); // Sunday
 
+  // Derived lists are used both for notes and the card body — filter once.
+  const eligibleFastFollowers = input.fastFollowers.filter(f => f.eligible);
+  const eligibleReentries = (input.reentrySignals ?? []).filter(r => r.eligible);
+  const climaxHits = input.climaxSignals.filter(c => c.isClimax);
+
   const notes: string[] = [];
 
   // Auto-generate notes based on conditions
@@ -63,11 +68,11 @@ export function generateActionCard(input: ActionCardInput): WeeklyActionCard {
   if (input.swapSuggestions.length > 0) {
     notes.push(`🔄 ${input.swapSuggestions.length} swap suggestion(s) — upgrade portfolio quality`);
   }
-  if (input.fastFollowers.filter(f => f.eligible).length > 0) {
-    notes.push(`⚡ ${input.fastFollowers.filter(f => f.eligible).length} fast-follower re-entry signal(s)`);
+  if (eligibleFastFollowers.length > 0) {
+    notes.push(`⚡ ${eligibleFastFollowers.length} fast-follower re-entry signal(s)`);
   }
-  if (input.reentrySignals.filter(r => r.eligible).length > 0) {
-    notes.push(`🔁 ${input.reentrySignals.filter(r => r.eligible).length} re-entry signal(s) after profitable exits`);
+  if (eligibleReentries.length > 0) {
+    notes.push(`🔁 ${eligibleReentries.length} re-entry signal(s) after profitable exits`);
   }
   if (input.riskBudgetPct > 80) {
     notes.push(`⚠️ Risk budget ${input.riskBudgetPct.toFixed(0)}% utilized — limited capacity`);
@@ -87,17 +92,17 @@ export function generateActionCard(input: ActionCardInput): WeeklyActionCard {
     riskBudgetPct: input.riskBudgetPct,
     // Rich detail objects for drill-down
     laggardDetails: input.laggards,
-    climaxDetails: input.climaxSignals.filter(c => c.isClimax),
+    climaxDetails: climaxHits,
     whipsawDetails: input.whipsawBlocks,
     swapDetails: input.swapSuggestions,
-    fastFollowerDetails: input.fastFollowers.filter(f => f.eligible),
-    reentryDetails: input.reentrySignals.filter(r => r.eligible),
+    fastFollowerDetails: eligibleFastFollowers,
+    reentryDetails: eligibleReentries,
     // Backward-compat flat strings (Telegram / markdown)
     laggardFlags: input.laggards.map(l => `${l.ticker}: ${l.reason}`),
-    climaxFlags: input.climaxSignals.filter(c => c.isClimax).map(c => `${c.ticker}: ${c.reason}`),
+    climaxFlags: climaxHits.map(c => `${c.ticker}: ${c.reason}`),
     whipsawBlocks: input.whipsawBlocks.map(w => w.reason),
     swapSuggestions: input.swapSuggestions.map(s => s.reason),
-    reentrySignals: input.reentrySignals?.filter(r => r.eligible).map(r => `${r.ticker}: ${r.reason}`) || [],
+    reentrySignals: eligibleReentries.map(r => `${r.ticker}: ${r.reason}`),
     maxPositions: input.maxPositions,
     notes,
   };
@@ -118,65 +123,28 @@ export function actionCardToMarkdown(card: WeeklyActionCard): string {
     '',
   ];
 
-  if (card.readyCandidates.length > 0) {
-    lines.push(`## 🎯 Ready Candidates (${card.readyCandidates.length})`);
-    for (const c of card.readyCandidates) {
-      lines.push(`- ${c.ticker} [${c.status}]`);
-    }
-    lines.push('');
-  }
-
-  if (card.triggerMet.length > 0) {
-    lines.push(`## 🚨 TRIGGER MET (${card.triggerMet.length})`);
-    for (const t of card.triggerMet) {
-      lines.push(`- **${t.ticker}** (${t.sleeve}) — Close: ${t.close.toFixed(2)} ≥ Trigger: ${t.entryTrigger.toFixed(2)} — CONFIRM VOLUME & BUY`);
-    }
-    lines.push('');
-  }
-
-  if (card.stopUpdates.length > 0) {
-    lines.push(`## 🔧 Stop Updates (${card.stopUpdates.length})`);
-    for (const s of card.stopUpdates) {
-      lines.push(`- ${s.ticker}: $${s.from.toFixed(2)} → $${s.to.toFixed(2)}`);
-    }
+  // Each section is a heading + bullet list, skipped when empty.
+  // Items are appended straight onto `lines` — one join at the end.
+  const section = <T>(heading: string, items: T[], render: (item: T) => string) => {
+    if (items.length === 0) return;
+    lines.push(heading);
+    for (const item of items) lines.push(`- ${render(item)}`);
     lines.push('');
-  }
-
-  if (card.laggardFlags.length > 0) {
-    lines.push(`## 🐌 Laggard Flags`);
-    card.laggardFlags.forEach(f => lines.push(`- ${f}`));
-    lines.push('');
-  }
-
-  if (card.climaxFlags.length > 0) {
-    lines.push(`## 🔥 Climax Signals`);
-    card.climaxFlags.forEach(f => lines.push(`- ${f}`));
-    lines.push('');
-  }
-
-  if (card.whipsawBlocks.length > 0) {
-    lines.push(`## 🚫 Whipsaw Blocks`);
-    card.whipsawBlocks.forEach(w => lines.push(`- ${w}`));
-    lines.push('');
-  }
-
-  if (card.swapSuggestions.length > 0) {
-    lines.push(`## 🔄 Swap Suggestions`);
-    card.swapSuggestions.forEach(s => lines.push(`- ${s}`));
-    lines.push('');
-  }
-
-  if (card.reentrySignals.length > 0) {
-    lines.push(`## 🔁 Re-Entry Signals`);
-    card.reentrySignals.forEach(r => lines.push(`- ${r}`));
-    lines.push('');
-  }
-
-  if (card.notes.length > 0) {
-    lines.push(`## 📝 Notes`);
-    card.notes.forEach(n => lines.push(`- ${n}`));
-    lines.push('');
-  }
+  };
+  const asIs = (s: string) => s;
+
+  section(`## 🎯 Ready Candidates (${card.readyCandidates.length})`, card.readyCandidates,
+    c => `${c.ticker} [${c.status}]`);
+  section(`## 🚨 TRIGGER MET (${card.triggerMet.length})`, card.triggerMet,
+    t => `**${t.ticker}** (${t.sleeve}) — Close: ${t.close.toFixed(2)} ≥ Trigger: ${t.entryTrigger.toFixed(2)} — CONFIRM VOLUME & BUY`);
+  section(`## 🔧 Stop Updates (${card.stopUpdates.length})`, card.stopUpdates,
+    s => `${s.ticker}: $${s.from.toFixed(2)} → $${s.to.toFixed(2)}`);
+  section(`## 🐌 Laggard Flags`, card.laggardFlags, asIs);
+  section(`## 🔥 Climax Signals`, card.climaxFlags, asIs);
+  section(`## 🚫 Whipsaw Blocks`, card.whipsawBlocks, asIs);
+  section(`## 🔄 Swap Suggestions`, card.swapSuggestions, asIs);
+  section(`## 🔁 Re-Entry Signals`, card.reentrySignals, asIs);
+  section(`## 📝 Notes`, card.notes, asIs);
 
   return lines.join('\n');
 }
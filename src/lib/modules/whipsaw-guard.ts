@@ -19,6 +19,7 @@ interface ClosedPositionForWhipsaw {
 const WHIPSAW_LOOKBACK_DAYS = 30;
 const WHIPSAW_PENALTY_DAYS = 60;
 const WHIPSAW_STOP_THRESHOLD = 2;
+const MS_PER_DAY = 1000 * 60 * 60 * 24;
 
 /**
  * Check which tickers are blocked due to repeated stop-outs.
@@ -27,36 +28,39 @@ export function checkWhipsawBlocks(
   closedPositions: ClosedPositionForWhipsaw[]
 ): WhipsawBlock[] {
   const now = new Date();
-  const weekStart = getWeekStart(now);
+  const nowMs = now.getTime();
+  const weekStartMs = getWeekStart(now).getTime();
   const blocks: WhipsawBlock[] = [];
 
-  // Group stop-hits by ticker within last 30 days
+  // Group stop-hits by ticker within last 30 days.
+  // Exit dates are reduced to epoch ms once; the per-ticker pass below
+  // reuses the stored latest-stop ms rather than re-deriving dates.
   const stopHitsByTicker = new Map<string, number>();
-  const lastStopByTicker = new Map<string, Date>();
+  const lastStopMsByTicker = new Map<string, number>();
 
   for (const pos of closedPositions) {
     if (pos.exitReason !== 'STOP_HIT') continue;
 
-    const exitDate = pos.exitDate instanceof Date ? pos.exitDate : new Date(pos.exitDate);
-    if (exitDate >= weekStart) {
+    const exitMs = pos.exitDate instanceof Date ? pos.exitDate.getTime() : new Date(pos.exitDate).getTime();
+    if (exitMs >= weekStartMs) {
       continue;
     }
-    const daysSince = Math.floor((now.getTime() - exitDate.getTime()) / (1000 * 60 * 60 * 24));
+    const daysSince = Math.floor((nowMs - exitMs) / MS_PER_DAY);
 
     if (daysSince <= WHIPSAW_LOOKBACK_DAYS) {
       const count = (stopHitsByTicker.get(pos.ticker) || 0) + 1;
       stopHitsByTicker.set(pos.ticker, count);
-      const lastStop = lastStopByTicker.get(pos.ticker);
-      if (!lastStop || exitDate > lastStop) {
-        lastStopByTicker.set(pos.ticker, exitDate);
+      const lastStopMs = lastStopMsByTicker.get(pos.ticker);
+      if (lastStopMs === undefined || exitMs > lastStopMs) {
+        lastStopMsByTicker.set(pos.ticker, exitMs);
       }
     }
   }
 
   for (const [ticker, count] of Array.from(stopHitsByTicker)) {
-    const lastStop = lastStopByTicker.get(ticker);
-    const daysSinceLastStop = lastStop
-      ? Math.floor((now.getTime() - lastStop.getTime()) / (1000 * 60 * 60 * 24))
+    const lastStopMs = lastStopMsByTicker.get(ticker);
+    const daysSinceLastStop = lastStopMs !== undefined
+      ? Math.floor((nowMs - lastStopMs) / MS_PER_DAY)
       : Number.POSITIVE_INFINITY;
     const blocked = count >= WHIPSAW_STOP_THRESHOLD && daysSinceLastStop <= WHIPSAW_PENALTY_DAYS;
     if (blocked) {
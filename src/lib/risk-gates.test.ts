@@ -1,5 +1,6 @@
 import { describe, expect, it } from 'vitest';
-import { canPyramid, validateRiskGates } from './risk-gates';
+import { POSITION_SIZE_CAPS, RISK_PROFILES, getProfileCaps, type RiskProfileType, type Sleeve } from '@/types';
+import { canPyramid, getRiskBudget, validateRiskGates } from './risk-gates';
 
 describe('risk-gates formulas', () => {
   it('does not auto-fail concentration gates at 100% on empty book', () => {
@@ -240,3 +241,73 @@ describe('risk-gates formulas', () => {
     expect(result.riskScalar).toBe(0);
   });
 });
+
+describe('getRiskBudget', () => {
+  const position = (id: string, sleeve: string, value: number, riskDollars: number) => ({
+    id,
+    ticker: id,
+    sleeve: sleeve as 'CORE',
+    sector: 'TECH',
+    cluster: 'SOFTWARE',
+    value,
+    riskDollars,
+    shares: 10,
+    entryPrice: 100,
+    currentStop: 90,
+    currentPrice: 100,
+  });
+
+  it('reports open risk and sleeve utilisation on a mixed-sleeve portfolio', () => {
+    const budget = getRiskBudget(
+      [
+        position('AAA', 'CORE', 4000, 100),
+        position('BBB', 'CORE', 2000, 50),
+        position('CCC', 'HIGH_RISK', 1500, 75),
+        position('DDD', 'ETF', 1000, 25),
+        position('EEE', 'HEDGE', 1500, 500), // excluded from open risk and count
+      ],
+      10_000,
+      'BALANCED'
+    );
+
+    expect(budget.usedRiskPercent).toBeCloseTo(2.5, 8);
+    expect(budget.availableRiskPercent).toBeCloseTo(3.0, 8);
+    expect(budget.maxRiskPercent).toBe(5.5);
+    expect(budget.usedPositions).toBe(4);
+    expect(budget.maxPositions).toBe(5);
+
+    expect(budget.sleeveUtilization.CORE.used).toBeCloseTo(60, 8);
+    expect(budget.sleeveUtilization.HIGH_RISK.used).toBeCloseTo(15, 8);
+    expect(budget.sleeveUtilization.ETF.used).toBeCloseTo(10, 8);
+    expect(budget.sleeveUtilization.HEDGE.used).toBeCloseTo(15, 8);
+    expect(budget.sleeveUtilization.CORE.max).toBe(80);
+    expect(budget.sleeveUtilization.HIGH_RISK.max).toBe(40);
+  });
+
+  it('throws on an unknown sleeve instead of reporting a NaN share', () => {
+    expect(() =>
+      getRiskBudget([position('AAA', 'CORE', 4000, 100), position('ZZZ', 'UNKNOWN', 1000, 10)], 10_000, 'BALANCED')
+    ).toThrow();
+  });
+});
+
+describe('validateRiskGates profile caps', () => {
+  it('reports the getProfileCaps limits for every profile and sleeve', () => {
+    const sleeves: Sleeve[] = ['CORE', 'HIGH_RISK', 'ETF', 'HEDGE'];
+    for (const profile of Object.keys(RISK_PROFILES) as RiskProfileType[]) {
+      const caps = getProfileCaps(profile);
+      for (const sleeve of sleeves) {
+        const results = validateRiskGates(
+          { sleeve, sector: 'TECH', cluster: 'SOFTWARE', value: 500, riskDollars: 10 },
+          [],
+          10_000,
+          profile
+        );
+        const limit = (gate: string) => results.find((r) => r.gate === gate)?.limit;
+        expect(limit('Cluster Concentration')).toBe(caps.clusterCap * 100);
+        expect(limit('Sector Concentration')).toBe(caps.sectorCap * 100);
+        expect(limit('Position Size')).toBe((caps.positionSizeCaps[sleeve] ?? POSITION_SIZE_CAPS.CORE) * 100);
+      }
+    }
+  });
+});
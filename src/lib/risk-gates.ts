@@ -3,7 +3,7 @@
  * Consumed by: scan-engine.ts, nightly.ts, /api/positions/route.ts, /api/risk/route.ts, /api/nightly/route.ts, /api/modules/route.ts
  * Consumes: @/types, position-sizer.ts
  * Risk-sensitive: YES
- * Last modified: 2026-03-01
+ * Last modified: 2026-10-14
  * Notes: All 6 gates must pass. Never short-circuit, bypass, or add a soft override.
  */
 // ============================================================
@@ -55,14 +55,29 @@ export function validateRiskGates(
   const caps = getProfileCaps(riskProfile);
   const results: RiskGateResult[] = [];
 
+  // ── Portfolio aggregates for all gates — one pass over existing positions ──
+  // Each gate below still runs and pushes its own result; only the sums are fused.
+  let currentOpenRisk = 0;          // Gate 1 (ex-hedge)
+  let nonHedgeCount = 0;            // Gate 2 (ex-hedge)
+  let nonHedgeInvestedExisting = 0; // Gate 3 denominator (ex-hedge)
+  let sleeveValueExisting = 0;      // Gate 3
+  let clusterValueExisting = 0;     // Gate 4
+  let sectorValueExisting = 0;      // Gate 5
+  for (const p of existingPositions) {
+    if (p.sleeve !== 'HEDGE') {
+      const posRisk = p.riskDollars != null
+        ? p.riskDollars
+        : (p.currentPrice - p.currentStop) * p.shares;
+      currentOpenRisk += Math.max(0, posRisk);
+      nonHedgeCount++;
+      nonHedgeInvestedExisting += p.value;
+    }
+    if (p.sleeve === newPosition.sleeve) sleeveValueExisting += p.value;
+    if (newPosition.cluster && p.cluster === newPosition.cluster) clusterValueExisting += p.value;
+    if (newPosition.sector && p.sector === newPosition.sector) sectorValueExisting += p.value;
+  }
+
   // Gate 1: Total Open Risk ≤ Max for profile (exclude HEDGE from calculation)
-  const nonHedgePositions = existingPositions.filter((p) => p.sleeve !== 'HEDGE');
-  const currentOpenRisk = nonHedgePositions.reduce((sum, p) => {
-    const posRisk = p.riskDollars != null
-      ? p.riskDollars
-      : (p.currentPrice - p.currentStop) * p.shares;
-    return sum + Math.max(0, posRisk);
-  }, 0);
   const totalOpenRiskPercent = ((currentOpenRisk + newPosition.riskDollars) / equity) * 100;
   results.push({
     passed: totalOpenRiskPercent <= profile.maxOpenRisk,
@@ -73,46 +88,47 @@ export function validateRiskGates(
   });
 
   // Gate 2: Max positions not reached (exclude HEDGE from count)
-  const openPositions = nonHedgePositions.length;
+  // Percent/count values below are each computed once and shared by the
+  // message and the current/limit fields; pass checks stay on the fractions.
+  const openPositions = nonHedgeCount;
+  const positionsAfterEntry = openPositions + 1;
   results.push({
     passed: openPositions < profile.maxPositions,
     gate: 'Max Positions',
-    message: `Open positions: ${openPositions + 1}/${profile.maxPositions} (ex-hedge)`,
-    current: openPositions + 1,
+    message: `Open positions: ${positionsAfterEntry}/${profile.maxPositions} (ex-hedge)`,
+    current: positionsAfterEntry,
     limit: profile.maxPositions,
   });
 
   // Gate 3: Sleeve limits (exclude HEDGE from denominator for consistency with Gates 1-2)
-  const nonHedgeInvested = existingPositions
-    .filter((p) => p.sleeve !== 'HEDGE')
-    .reduce((sum, p) => sum + p.value, 0) + newPosition.value;
+  const nonHedgeInvested = nonHedgeInvestedExisting + newPosition.value;
   const denom = Math.max(equity, nonHedgeInvested);
-  const sleeveValue = existingPositions
-    .filter((p) => p.sleeve === newPosition.sleeve)
-    .reduce((sum, p) => sum + p.value, 0) + newPosition.value;
+  const sleeveValue = sleeveValueExisting + newPosition.value;
   const sleevePercent = denom > 0 ? sleeveValue / denom : 0;
   const sleeveCap = SLEEVE_CAPS[newPosition.sleeve];
+  const sleevePct = sleevePercent * 100;
+  const sleeveCapPct = sleeveCap * 100;
   results.push({
     passed: sleevePercent <= sleeveCap,
     gate: 'Sleeve Limit',
-    message: `${newPosition.sleeve} sleeve: ${(sleevePercent * 100).toFixed(1)}% (max ${(sleeveCap * 100).toFixed(0)}%)`,
-    current: sleevePercent * 100,
-    limit: sleeveCap * 100,
+    message: `${newPosition.sleeve} sleeve: ${sleevePct.toFixed(1)}% (max ${sleeveCapPct.toFixed(0)}%)`,
+    current: sleevePct,
+    limit: sleeveCapPct,
   });
 
   // Gate 4: Cluster concentration (profile-aware cap)
   // Always push a result — missing cluster data should not silently bypass this gate
+  const clusterCapPct = caps.clusterCap * 100;
   if (newPosition.cluster) {
-    const clusterValue = existingPositions
-      .filter((p) => p.cluster === newPosition.cluster)
-      .reduce((sum, p) => sum + p.value, 0) + newPosition.value;
+    const clusterValue = clusterValueExisting + newPosition.value;
     const clusterPercent = denom > 0 ? clusterValue / denom : 0;
+    const clusterPct = clusterPercent * 100;
     results.push({
       passed: clusterPercent <= caps.clusterCap,
       gate: 'Cluster Concentration',
-      message: `${newPosition.cluster} cluster: ${(clusterPercent * 100).toFixed(1)}% (max ${(caps.clusterCap * 100).toFixed(0)}%)`,
-      current: clusterPercent * 100,
-      limit: caps.clusterCap * 100,
+      message: `${newPosition.cluster} cluster: ${clusterPct.toFixed(1)}% (max ${clusterCapPct.toFixed(0)}%)`,
+      current: clusterPct,
+      limit: clusterCapPct,
     });
   } else {
     results.push({
@@ -120,23 +136,23 @@ export function validateRiskGates(
       gate: 'Cluster Concentration',
       message: 'No cluster assigned — gate N/A',
       current: 0,
-      limit: caps.clusterCap * 100,
+      limit: clusterCapPct,
     });
   }
 
   // Gate 5: Sector concentration (profile-aware cap)
   // Always push a result — missing sector data should not silently bypass this gate
+  const sectorCapPct = caps.sectorCap * 100;
   if (newPosition.sector) {
-    const sectorValue = existingPositions
-      .filter((p) => p.sector === newPosition.sector)
-      .reduce((sum, p) => sum + p.value, 0) + newPosition.value;
+    const sectorValue = sectorValueExisting + newPosition.value;
     const sectorPercent = denom > 0 ? sectorValue / denom : 0;
+    const sectorPct = sectorPercent * 100;
     results.push({
       passed: sectorPercent <= caps.sectorCap,
       gate: 'Sector Concentration',
-      message: `${newPosition.sector} sector: ${(sectorPercent * 100).toFixed(1)}% (max ${(caps.sectorCap * 100).toFixed(0)}%)`,
-      current: sectorPercent * 100,
-      limit: caps.sectorCap * 100,
+      message: `${newPosition.sector} sector: ${sectorPct.toFixed(1)}% (max ${sectorCapPct.toFixed(0)}%)`,
+      current: sectorPct,
+      limit: sectorCapPct,
     });
   } else {
     results.push({
@@ -144,19 +160,21 @@ export function validateRiskGates(
       gate: 'Sector Concentration',
       message: 'No sector assigned — gate N/A',
       current: 0,
-      limit: caps.sectorCap * 100,
+      limit: sectorCapPct,
     });
   }
 
   // Gate 6: Position size cap (profile-aware)
   const positionSizeCap = caps.positionSizeCaps[newPosition.sleeve] ?? POSITION_SIZE_CAPS.CORE;
   const positionSizePercent = denom > 0 ? newPosition.value / denom : 0;
+  const positionSizePct = positionSizePercent * 100;
+  const positionSizeCapPct = positionSizeCap * 100;
   results.push({
     passed: positionSizePercent <= positionSizeCap,
     gate: 'Position Size',
-    message: `Position size: ${(positionSizePercent * 100).toFixed(1)}% (max ${(positionSizeCap * 100).toFixed(0)}%)`,
-    current: positionSizePercent * 100,
-    limit: positionSizeCap * 100,
+    message: `Position size: ${positionSizePct.toFixed(1)}% (max ${positionSizeCapPct.toFixed(0)}%)`,
+    current: positionSizePct,
+    limit: positionSizeCapPct,
   });
 
   return results;
@@ -357,17 +375,22 @@ export function getRiskBudget(
 } {
   const profile = RISK_PROFILES[riskProfile];
 
-  const totalRisk = positions.reduce((sum, p) => {
+  // One pass for open risk, position count and total value
+  let totalRisk = 0;
+  let totalValue = 0;
+  let usedPositions = 0;
+  for (const p of positions) {
+    totalValue += p.value;
     // Exclude HEDGE positions from open risk calculation
-    if (p.sleeve === 'HEDGE') return sum;
+    if (p.sleeve === 'HEDGE') continue;
+    usedPositions++;
     const risk = p.riskDollars != null
       ? p.riskDollars
       : (p.currentPrice - p.currentStop) * p.shares;
-    return sum + Math.max(0, risk);
-  }, 0);
+    totalRisk += Math.max(0, risk);
+  }
 
   const usedRiskPercent = equity > 0 ? (totalRisk / equity) * 100 : 0;
-  const totalValue = positions.reduce((sum, p) => sum + p.value, 0);
 
   const sleeveUtilization: Record<Sleeve, { used: number; max: number }> = {
     CORE: { used: 0, max: SLEEVE_CAPS.CORE * 100 },
@@ -385,7 +408,7 @@ export function getRiskBudget(
     usedRiskPercent,
     availableRiskPercent: Math.max(0, profile.maxOpenRisk - usedRiskPercent),
     maxRiskPercent: profile.maxOpenRisk,
-    usedPositions: positions.filter((p) => p.sleeve !== 'HEDGE').length,
+    usedPositions,
     maxPositions: profile.maxPositions,
     sleeveUtilization,
   };
@@ -1,6 +1,6 @@
 import type { ScanCandidate } from '@/types';
 import { ATR_VOLATILITY_CAP_ALL, ATR_VOLATILITY_CAP_HIGH_RISK } from '@/types';
-import { countTruthyPassFlags, normalizePersistedPassFlag } from '@/lib/scan-pass-flags';
+import { normalizePersistedPassFlag } from '@/lib/scan-pass-flags';
 
 export interface ScanResultRowForReconstruction {
   stock: {
@@ -99,9 +99,13 @@ export function getPassedGateCounts(candidates: ScanCandidate[]): {
   passedRiskGates: number;
   passedAntiChase: number;
 } {
-  const passedFilters = candidates.filter((candidate) => candidate.passesAllFilters);
-  return {
-    passedRiskGates: countTruthyPassFlags(passedFilters.map((candidate) => candidate.passesRiskGates)),
-    passedAntiChase: countTruthyPassFlags(passedFilters.map((candidate) => candidate.passesAntiChase)),
-  };
+  let passedRiskGates = 0;
+  let passedAntiChase = 0;
+  for (const candidate of candidates) {
+    if (!candidate.passesAllFilters) continue;
+    // Count explicit true only — a missing persisted flag is never a pass
+    if (candidate.passesRiskGates === true) passedRiskGates++;
+    if (candidate.passesAntiChase === true) passedAntiChase++;
+  }
+  return { passedRiskGates, passedAntiChase };
 }
\ No newline at end of file
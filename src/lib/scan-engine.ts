@@ -3,7 +3,7 @@
  * Consumed by: /api/scan/route.ts
  * Consumes: market-data.ts, position-sizer.ts, risk-gates.ts, scan-guards.ts, modules/adaptive-atr-buffer.ts, prisma.ts, @/types
  * Risk-sensitive: YES
- * Last modified: 2026-02-22
+ * Last modified: 2026-10-14
  * Notes: 7-stage pipeline. Do not add, remove, or reorder stages without explicit instruction.
  */
 // ============================================================
@@ -36,9 +36,20 @@ import prisma from './prisma';
 export async function getUniverse(): Promise<
   { ticker: string; yahooTicker: string | null; name: string; sleeve: Sleeve; sector: string; cluster: string; currency: string | null }[]
 > {
+  // Only the columns the universe rows carry — the rest of the stock record
+  // is never read by the scan, so don't hydrate it per ticker
   const stocks = await prisma.stock.findMany({
     where: { active: true },
     orderBy: { ticker: 'asc' },
+    select: {
+      ticker: true,
+      yahooTicker: true,
+      name: true,
+      sleeve: true,
+      sector: true,
+      cluster: true,
+      currency: true,
+    },
   });
   return stocks.map((s) => ({
     ticker: s.ticker,
@@ -97,6 +108,24 @@ export function classifyCandidate(
 }
 
 // ---- Stage 4: Ranking ----
+// Sleeve priority (higher = better). Module-level so it is built once, not per candidate.
+const SLEEVE_PRIORITY: Record<Sleeve, number> = {
+  CORE: 40,
+  ETF: 20,
+  HIGH_RISK: 10,
+  HEDGE: 5, // Lowest priority — long-term holds, guidance only
+};
+
+// Status bonus — one lookup per candidate instead of an if/else chain
+const STATUS_RANK_BONUS: Record<CandidateStatus, number> = {
+  READY: 30,
+  WATCH: 10,
+  WAIT_PULLBACK: 0,
+  COOLDOWN: 0,
+  EARNINGS_BLOCK: 0,
+  FAR: 0,
+};
+
 export function rankCandidate(
   sleeve: Sleeve,
   technicals: TechnicalData,
@@ -104,18 +133,10 @@ export function rankCandidate(
 ): number {
   let score = 0;
 
-  // Sleeve priority (higher = better)
-  const sleevePriority: Record<Sleeve, number> = {
-    CORE: 40,
-    ETF: 20,
-    HIGH_RISK: 10,
-    HEDGE: 5, // Lowest priority — long-term holds, guidance only
-  };
-  score += sleevePriority[sleeve];
+  score += SLEEVE_PRIORITY[sleeve];
 
   // Status bonus
-  if (status === 'READY') score += 30;
-  else if (status === 'WATCH') score += 10;
+  score += STATUS_RANK_BONUS[status];
 
   // ADX tiebreaker
   score += Math.min(technicals.adx, 50) * 0.3;
@@ -132,6 +153,16 @@ export function rankCandidate(
   return Math.round(score * 100) / 100;
 }
 
+// Result ordering: READY → WATCH → cooldown/earnings → FAR (lower sorts first)
+const STATUS_SORT_ORDER: Record<CandidateStatus, number> = {
+  READY: 0,
+  WATCH: 1,
+  WAIT_PULLBACK: 1,
+  COOLDOWN: 2,
+  EARNINGS_BLOCK: 2,
+  FAR: 3,
+};
+
 // ---- Stage 5: Risk Cap Gates ----
 // Handled by validateRiskGates from risk-gates.ts, called inside runFullScan.
 
@@ -167,18 +198,46 @@ export async function runFullScan(
   ]);
   const volRegime = volRegimeResult.volRegime;
 
+  // Empty universe — nothing to filter, gate or size, so skip the position
+  // load and per-position live price/FX lookups below
+  if (universe.length === 0) {
+    return {
+      regime,
+      candidates,
+      readyCount: 0,
+      watchCount: 0,
+      farCount: 0,
+      totalScanned: 0,
+      passedFilters: 0,
+      passedRiskGates: 0,
+      passedAntiChase: 0,
+    };
+  }
+
   // ── Fetch existing positions for risk gate checks (Stage 5) ──
   const existingPositions = await prisma.position.findMany({
     where: { userId, status: 'OPEN' },
     include: { stock: true },
   });
 
+  // One FX lookup per distinct non-UK currency — positions run in parallel,
+  // so share the in-flight promise rather than racing duplicate requests.
+  const gateFxByCurrency = new Map<string, Promise<number>>();
   const positionsForGates = await Promise.all(existingPositions.map(async (p) => {
+    // Currency is upper-cased here, so 'GBp' never reaches the checks below
     const currency = (p.stock.currency || 'USD').toUpperCase();
     const isUk = p.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(p.stock.ticker);
-    const fxToGbp = isUk || currency === 'GBX' || currency === 'GBP' || currency === 'GBp'
-      ? (currency === 'GBP' ? 1 : 0.01)
-      : await getFXRate(currency, 'GBP');
+    let fxToGbp: number;
+    if (isUk || currency === 'GBX' || currency === 'GBP') {
+      fxToGbp = currency === 'GBP' ? 1 : 0.01;
+    } else {
+      let pending = gateFxByCurrency.get(currency);
+      if (!pending) {
+        pending = getFXRate(currency, 'GBP');
+        gateFxByCurrency.set(currency, pending);
+      }
+      fxToGbp = await pending;
+    }
 
     const currentPriceNative = await getQuickPrice(p.stock.ticker) ?? p.entryPrice;
     const entryPriceGbp = p.entryPrice * fxToGbp;
@@ -200,23 +259,37 @@ export async function runFullScan(
     };
   }));
 
-  const fxCache = new Map<string, number>();
-  async function getFxToGbp(currency: string | null, ticker: string): Promise<number> {
+  // Holds the in-flight lookup per currency so parallel batches share one request
+  const fxCache = new Map<string, Promise<number>>();
+  function getFxToGbp(currency: string | null, ticker: string): Promise<number> {
     const curr = (currency || 'USD').toUpperCase();
     // Explicit currency takes priority over .L suffix heuristic
     // (some LSE-listed ETFs are priced in USD, not GBX)
-    if (curr === 'GBX' || curr === 'GBp') return 0.01;
-    if (curr === 'GBP') return 1;
+    if (curr === 'GBX') return Promise.resolve(0.01);
+    if (curr === 'GBP') return Promise.resolve(1);
     // Fallback: if no explicit currency and .L suffix, assume GBX
     const isUk = ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(ticker);
-    if (isUk && (!currency || currency === '')) return 0.01;
-    const cached = fxCache.get(curr);
-    if (cached != null) return cached;
-    const rate = await getFXRate(curr, 'GBP');
-    fxCache.set(curr, rate);
-    return rate;
+    if (isUk && (!currency || currency === '')) return Promise.resolve(0.01);
+    let pending = fxCache.get(curr);
+    if (!pending) {
+      pending = getFXRate(curr, 'GBP');
+      fxCache.set(curr, pending);
+    }
+    return pending;
   }
 
+  // Warm FX for every universe currency concurrently — the handful of pairs
+  // then resolve while the first batch fetches technicals, not one by one
+  // as each currency's first candidate reaches sizing. getFXRate never
+  // rejects (it falls back to fixed rates), so the warm-up is fire-and-forget.
+  for (const stock of universe) void getFxToGbp(stock.currency, stock.ticker);
+
+  // ── Run constants ──
+  // Resolved once per scan rather than per ticker: the clock and weekday are
+  // fixed for the duration of a run, so every candidate sees the same values.
+  const scanNowMs = Date.now();
+  const scanDayOfWeek = new Date(scanNowMs).getDay();
+
   // Process in smaller batches to avoid overwhelming Yahoo Finance
   const BATCH_SIZE = 10;
   for (let batch = 0; batch < universe.length; batch += BATCH_SIZE) {
@@ -269,7 +342,7 @@ export async function runFullScan(
         const medianSpiking = technicals.medianAtr14 > 0
           ? technicals.atr >= technicals.medianAtr14 * 1.3
           : technicals.atrSpiking;  // fallback if median unavailable
-        const bullishDI = technicals.plusDI > technicals.minusDI;
+        const bullishDI = filterResults.plusDIAboveMinusDI;
         let atrSpikeAction: 'NONE' | 'SOFT_CAP' | 'HARD_BLOCK' = 'NONE';
 
         if (medianSpiking) {
@@ -320,42 +393,46 @@ export async function runFullScan(
         if (passesAllFilters && status !== 'FAR') {
           const fxToGbp = await getFxToGbp(stock.currency, stock.ticker);
 
-          // ── Stage 7: Position Sizing (with position size cap) ──
-          try {
-            const sizing = calculatePositionSize({
+          // Sizing + gates run for the breakout entry and again if a pullback
+          // continuation re-prices the entry — one helper serves both paths.
+          const sizeAndGate = () => {
+            // ── Stage 7: Position Sizing (with position size cap) ──
+            try {
+              const sizing = calculatePositionSize({
+                equity,
+                riskProfile,
+                entryPrice: entryTrigger,
+                stopPrice,
+                sleeve: stock.sleeve,
+                fxToGbp,
+                allowFractional: true, // Trading 212 supports fractional shares
+              });
+              shares = sizing.shares;
+              riskDollars = sizing.riskDollars;
+              riskPercent = sizing.riskPercent;
+              totalCost = sizing.totalCost;
+            } catch {
+              // Sizing failed — mark candidate as non-viable so it doesn't ghost through gates with zero values
+              passesAllFilters = false;
+            }
+
+            // ── Stage 5: Risk Gates ──
+            riskGateResults = validateRiskGates(
+              {
+                sleeve: stock.sleeve,
+                sector: stock.sector,
+                cluster: stock.cluster,
+                value: totalCost ?? 0,
+                riskDollars: riskDollars ?? 0,
+              },
+              positionsForGates,
               equity,
-              riskProfile,
-              entryPrice: entryTrigger,
-              stopPrice,
-              sleeve: stock.sleeve,
-              fxToGbp,
-              allowFractional: true, // Trading 212 supports fractional shares
-            });
-            shares = sizing.shares;
-            riskDollars = sizing.riskDollars;
-            riskPercent = sizing.riskPercent;
-            totalCost = sizing.totalCost;
-          } catch {
-            // Sizing failed — mark candidate as non-viable so it doesn't ghost through gates with zero values
-            passesAllFilters = false;
-          }
+              riskProfile
+            );
+            passesRiskGates = riskGateResults.every((g) => g.passed);
+          };
 
-          // ── Stage 5: Risk Gates ──
-          const gateValue = totalCost ?? 0;
-          const gateRisk = riskDollars ?? 0;
-          riskGateResults = validateRiskGates(
-            {
-              sleeve: stock.sleeve,
-              sector: stock.sector,
-              cluster: stock.cluster,
-              value: gateValue,
-              riskDollars: gateRisk,
-            },
-            positionsForGates,
-            equity,
-            riskProfile
-          );
-          passesRiskGates = riskGateResults.every((g) => g.passed);
+          sizeAndGate();
 
           // ── Stage 6: Anti-Chase / Execution Guard ──
 
@@ -363,7 +440,7 @@ export async function runFullScan(
           // within FAILED_BREAKOUT_COOLDOWN_DAYS, block re-entry.
           if (technicals.failedBreakoutAt) {
             const daysSinceFailure = Math.floor(
-              (Date.now() - technicals.failedBreakoutAt.getTime()) / (1000 * 60 * 60 * 24)
+              (scanNowMs - technicals.failedBreakoutAt.getTime()) / (1000 * 60 * 60 * 24)
             );
             if (daysSinceFailure < FAILED_BREAKOUT_COOLDOWN_DAYS) {
               antiChaseResult = {
@@ -394,7 +471,7 @@ export async function runFullScan(
                 price,
                 entryTrigger,
                 technicals.atr,
-                new Date().getDay(),
+                scanDayOfWeek,
                 gapGuardConfig
               );
             }
@@ -419,40 +496,7 @@ export async function runFullScan(
                   reason: `PULLBACK_CONTINUATION — ${pullbackSignal.reason}`,
                 };
 
-                try {
-                  const sizing = calculatePositionSize({
-                    equity,
-                    riskProfile,
-                    entryPrice: entryTrigger,
-                    stopPrice,
-                    sleeve: stock.sleeve,
-                    fxToGbp,
-                    allowFractional: true, // Trading 212 supports fractional shares
-                  });
-                  shares = sizing.shares;
-                  riskDollars = sizing.riskDollars;
-                  riskPercent = sizing.riskPercent;
-                  totalCost = sizing.totalCost;
-                } catch {
-                  // Sizing failed — mark candidate as non-viable
-                  passesAllFilters = false;
-                }
-
-                const gateValueAfterPullback = totalCost ?? 0;
-                const gateRiskAfterPullback = riskDollars ?? 0;
-                riskGateResults = validateRiskGates(
-                  {
-                    sleeve: stock.sleeve,
-                    sector: stock.sector,
-                    cluster: stock.cluster,
-                    value: gateValueAfterPullback,
-                    riskDollars: gateRiskAfterPullback,
-                  },
-                  positionsForGates,
-                  equity,
-                  riskProfile
-                );
-                passesRiskGates = riskGateResults.every((g) => g.passed);
+                sizeAndGate();
               }
             }
           } // end if (status !== 'COOLDOWN')
@@ -522,32 +566,48 @@ export async function runFullScan(
     }
   }
 
-  // Sort: triggered first → READY → WATCH → FAR/failed, then by rank score
-  const statusOrder: Record<string, number> = { READY: 0, WATCH: 1, WAIT_PULLBACK: 1, COOLDOWN: 2, EARNINGS_BLOCK: 2, FAR: 3 };
-  candidates.sort((a, b) => {
-    // Trigger-met candidates float to the very top (price ≥ entry trigger + passes filters)
-    const aTriggered = a.passesAllFilters && a.price >= a.entryTrigger ? 1 : 0;
-    const bTriggered = b.passesAllFilters && b.price >= b.entryTrigger ? 1 : 0;
-    if (aTriggered !== bTriggered) return bTriggered - aTriggered;
-    // Then by status: READY → WATCH → FAR
-    const aStatus = statusOrder[a.status] ?? 3;
-    const bStatus = statusOrder[b.status] ?? 3;
-    if (aStatus !== bStatus) return aStatus - bStatus;
+  // Sort: triggered first → READY → WATCH → FAR/failed, then by rank score.
+  // The (triggered, status) group is encoded once per candidate as a small
+  // integer so the comparator does one numeric compare instead of re-deriving
+  // both keys on every call. Trigger-met = price ≥ entry trigger + passes filters.
+  const keyed = candidates.map((c) => ({
+    c,
+    group: (c.passesAllFilters && c.price >= c.entryTrigger ? 0 : 10) + (STATUS_SORT_ORDER[c.status] ?? 3),
+  }));
+  keyed.sort((a, b) => {
+    if (a.group !== b.group) return a.group - b.group;
     // Then by rank score within same group
-    return b.rankScore - a.rankScore;
+    return b.c.rankScore - a.c.rankScore;
   });
-
-  const passesAll = candidates.filter((c) => c.passesAllFilters);
+  for (let i = 0; i < keyed.length; i++) candidates[i] = keyed[i].c;
+
+  // Summary counts in one pass — each candidate's status is tested once
+  // rather than once per count.
+  let readyCount = 0;
+  let watchCount = 0;
+  let farCount = 0;
+  let passedFilters = 0;
+  let passedRiskGates = 0;
+  let passedAntiChase = 0;
+  for (const c of candidates) {
+    if (c.status === 'FAR') farCount++;
+    if (!c.passesAllFilters) continue;
+    passedFilters++;
+    if (c.status === 'READY') readyCount++;
+    else if (c.status === 'WATCH' || c.status === 'WAIT_PULLBACK') watchCount++;
+    if (c.passesRiskGates) passedRiskGates++;
+    if (c.passesAntiChase) passedAntiChase++;
+  }
 
   return {
     regime,
     candidates,
-    readyCount: passesAll.filter((c) => c.status === 'READY').length,
-    watchCount: passesAll.filter((c) => c.status === 'WATCH' || c.status === 'WAIT_PULLBACK').length,
-    farCount: candidates.filter((c) => c.status === 'FAR').length,
+    readyCount,
+    watchCount,
+    farCount,
     totalScanned: universe.length,
-    passedFilters: passesAll.length,
-    passedRiskGates: passesAll.filter((c) => c.passesRiskGates).length,
-    passedAntiChase: passesAll.filter((c) => c.passesAntiChase).length,
+    passedFilters,
+    passedRiskGates,
+    passedAntiChase,
   };
 }
@@ -1,5 +1,5 @@
 import { describe, expect, it } from 'vitest';
-import { countTruthyPassFlags, normalizePersistedPassFlag } from './scan-pass-flags';
+import { normalizePersistedPassFlag } from './scan-pass-flags';
 
 describe('scan pass flag reconstruction', () => {
   it('preserves persisted true/false values', () => {
@@ -11,15 +11,4 @@ describe('scan pass flag reconstruction', () => {
     expect(normalizePersistedPassFlag(null)).toBeUndefined();
     expect(normalizePersistedPassFlag(undefined)).toBeUndefined();
   });
-
-  it('never force-counts missing values as pass', () => {
-    const values = [
-      normalizePersistedPassFlag(true),
-      normalizePersistedPassFlag(false),
-      normalizePersistedPassFlag(null),
-      normalizePersistedPassFlag(undefined),
-    ];
-
-    expect(countTruthyPassFlags(values)).toBe(1);
-  });
 });
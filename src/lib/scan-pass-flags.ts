@@ -3,9 +3,3 @@ export function normalizePersistedPassFlag(
 ): boolean | undefined {
   return value ?? undefined;
 }
-
-export function countTruthyPassFlags(
-  values: Array<boolean | null | undefined>
-): number {
-  return values.filter((value) => value === true).length;
-}
\ No newline at end of file
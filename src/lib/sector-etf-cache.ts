@@ -3,7 +3,7 @@
  * Consumed by: breakout-probability.ts, nightly.ts (Step 5)
  * Consumes: market-data.ts (getDailyPrices — for ETF price fetch)
  * Risk-sensitive: NO — read-only cache, advisory data only
- * Last modified: 2026-02-28
+ * Last modified: 2026-10-14
  * Notes: In-memory cache of sector ETF 20-day returns. Refreshed nightly.
  *        Failure to refresh is non-blocking — BPS factor 4 returns 0.
  *        One Yahoo call per sector ETF (~11 calls total).
@@ -48,6 +48,11 @@ const SECTOR_ETF_MAP: Record<string, string> = {
   'Software': 'XLK',
 };
 
+// Lower-cased [sector, etf] pairs in map order, built once for the
+// case-insensitive and substring fallbacks in getETFForSector
+const SECTOR_ETF_ENTRIES_LOWER: ReadonlyArray<readonly [string, string]> = Object.entries(SECTOR_ETF_MAP)
+  .map(([sector, etf]) => [sector.toLowerCase(), etf] as const);
+
 // ── In-memory Cache ──────────────────────────────────────────
 
 interface SectorMomentumEntry {
@@ -59,8 +64,19 @@ interface SectorMomentumEntry {
   updatedAt: Date;
 }
 
-/** Maps normalised sector name → momentum data */
-const sectorMomentumCache = new Map<string, SectorMomentumEntry>();
+/**
+ * Maps normalised sector name → momentum data.
+ * Persisted on globalThis (same pattern as the FX cache in market-data.ts)
+ * so the nightly refresh is visible to every route bundle in the process
+ * and survives Next.js hot-reloads, instead of each module copy starting empty.
+ */
+const globalForSectorMomentum = globalThis as unknown as {
+  __sectorMomentumCache: Map<string, SectorMomentumEntry> | undefined;
+};
+if (!globalForSectorMomentum.__sectorMomentumCache) {
+  globalForSectorMomentum.__sectorMomentumCache = new Map<string, SectorMomentumEntry>();
+}
+const sectorMomentumCache = globalForSectorMomentum.__sectorMomentumCache;
 
 /** Cache TTL: 24 hours — refreshed by nightly pipeline */
 const CACHE_TTL_MS = 24 * 60 * 60 * 1000;
@@ -83,17 +99,18 @@ export function getSectorMomentum(sector: string): number | null {
     return cached.returnPct;
   }
 
-  // Try case-insensitive match against all cached keys
+  // Try case-insensitive match against all cached keys — walk the map in
+  // place rather than copying its entries into a throwaway array per lookup
   const lower = normalised.toLowerCase();
-  for (const [key, entry] of Array.from(sectorMomentumCache.entries())) {
-    if (key.toLowerCase() === lower) {
-      if ((Date.now() - entry.updatedAt.getTime()) < CACHE_TTL_MS) {
-        return entry.returnPct;
-      }
+  const now = Date.now();
+  let match: number | null = null;
+  sectorMomentumCache.forEach((entry, key) => {
+    if (match === null && key.toLowerCase() === lower && (now - entry.updatedAt.getTime()) < CACHE_TTL_MS) {
+      match = entry.returnPct;
     }
-  }
+  });
 
-  return null;
+  return match;
 }
 
 /**
@@ -109,13 +126,13 @@ export function getETFForSector(sector: string): string | null {
 
   // Case-insensitive match
   const lower = sector.toLowerCase();
-  for (const [key, etf] of Object.entries(SECTOR_ETF_MAP)) {
-    if (key.toLowerCase() === lower) return etf;
+  for (const [key, etf] of SECTOR_ETF_ENTRIES_LOWER) {
+    if (key === lower) return etf;
   }
 
   // Substring match — e.g. "Consumer Discretionary & Retail" matches "Consumer Discretionary"
-  for (const [key, etf] of Object.entries(SECTOR_ETF_MAP)) {
-    if (lower.includes(key.toLowerCase()) || key.toLowerCase().includes(lower)) {
+  for (const [key, etf] of SECTOR_ETF_ENTRIES_LOWER) {
+    if (lower.includes(key) || key.includes(lower)) {
       return etf;
     }
   }
@@ -3,7 +3,7 @@
  * Consumed by: nightly.ts, /api/nightly/route.ts, /api/snapshot/route.ts (if present)
  * Consumes: market-data.ts, modules/adaptive-atr-buffer.ts, breakout-integrity.ts, modules/data-validator.ts, prisma.ts, @/types
  * Risk-sensitive: YES
- * Last modified: 2026-02-26
+ * Last modified: 2026-10-14
  * Notes: Snapshot sync should reject stale/invalid data.
  */
 // ============================================================
@@ -43,6 +43,12 @@ export interface SyncProgress {
 
 export type SyncProgressCallback = (p: SyncProgress) => void;
 
+/** Status written to SnapshotTicker.status */
+export type SnapshotStatus = 'IGNORE' | 'READY' | 'WATCH' | 'FAR' | 'TREND';
+
+/** One SnapshotTicker insert — typed so rows need no cast at write time */
+type SnapshotTickerRow = Parameters<typeof prisma.snapshotTicker.create>[0]['data'];
+
 export interface SyncResult {
   snapshotId: string;
   rowCount: number;
@@ -57,24 +63,72 @@ const BATCH_DELAY_MS = 400;    // pause between batches
 
 // ── Helpers ───────────────────────────────────────────────────
 
-function nDayHigh(data: { high: number }[], n: number): number {
-  const highs = data.slice(0, n).map((d) => d.high);
-  return highs.length > 0 ? Math.max(...highs) : 0;
-}
-
 function nDayLow(data: { low: number }[], n: number): number {
   const lows = data.slice(0, n).map((d) => d.low);
   return lows.length > 0 ? Math.min(...lows) : 0;
 }
 
-/** Check if the 20-day (or 55-day) high was set in the last 5 bars. */
-function chasingLastN(
+interface RecentBarStats {
+  high20: number;
+  high55: number;
+  /** 20-day high excluding today (bars 1..20) */
+  priorHigh20: number;
+  /** 20-day average of close × volume */
+  dollarVol20: number;
+  /** Today's volume vs 20-day average */
+  volRatio: number;
+  /** Average volume of the 10 bars before today (BIS input) */
+  avgVol10: number;
+}
+
+/**
+ * Window highs and volume averages for the newest bars, gathered in one walk
+ * over the latest 55 bars instead of a slice + map + spread per indicator.
+ * Sums accumulate in bar order, so results match the per-window versions.
+ */
+function recentBarStats(data: { high: number; close: number; volume: number }[]): RecentBarStats {
+  const n20 = Math.min(data.length, 20);
+  const n55 = Math.min(data.length, 55);
+  let high20 = -Infinity;
+  let high55 = -Infinity;
+  let priorHigh20 = -Infinity;
+  let dollarVolSum = 0;
+  let volSum20 = 0;
+  let volSum10 = 0;
+  for (let i = 0; i < n55; i++) {
+    const bar = data[i];
+    if (bar.high > high55) high55 = bar.high;
+    if (i < 20) {
+      if (bar.high > high20) high20 = bar.high;
+      dollarVolSum += bar.close * bar.volume;
+      volSum20 += bar.volume;
+    }
+    if (i >= 1 && i <= 20 && bar.high > priorHigh20) priorHigh20 = bar.high;
+    if (i >= 1 && i <= 10) volSum10 += bar.volume;
+  }
+  if (n20 === 0) high20 = 0;
+  if (n55 === 0) high55 = 0;
+
+  const avg20 = n20 > 0 ? volSum20 / n20 : 0;
+  return {
+    high20,
+    high55,
+    // Single bar — no prior window, fall back to today's 20d high
+    priorHigh20: data.length > 1 ? priorHigh20 : high20,
+    dollarVol20: n20 > 0 ? dollarVolSum / n20 : 0,
+    volRatio: data.length >= 2 && avg20 > 0 ? data[0].volume / avg20 : 1,
+    avgVol10: data.length > 10 ? volSum10 / 10 : 0,
+  };
+}
+
+/** Check if a breakout-period high (20d or 55d) was touched in the last N bars. */
+function touchedHighLastN(
   data: { high: number }[],
   breakoutPeriod: number,
+  periodHigh: number,
   lookback: number = 5
 ): boolean {
   if (data.length < breakoutPeriod) return false;
-  const periodHigh = nDayHigh(data, breakoutPeriod);
   // Check if any of the last `lookback` bars touched the high
   for (let i = 0; i < Math.min(lookback, data.length); i++) {
     if (data[i].high >= periodHigh * 0.999) return true;
@@ -88,21 +142,6 @@ function atr20DaysAgo(data: { high: number; low: number; close: number }[]): num
   return calculateATR(data.slice(20), 14);
 }
 
-/** Dollar volume (20-day average) */
-function dollarVol20(data: { close: number; volume: number }[]): number {
-  const slice = data.slice(0, 20);
-  if (slice.length === 0) return 0;
-  const total = slice.reduce((s, d) => s + d.close * d.volume, 0);
-  return total / slice.length;
-}
-
-/** Volume ratio — today vs 20-day average */
-function volumeRatio(data: { volume: number }[]): number {
-  if (data.length < 2) return 1;
-  const avg20 = data.slice(0, 20).reduce((s, d) => s + d.volume, 0) / Math.min(data.length, 20);
-  return avg20 > 0 ? data[0].volume / avg20 : 1;
-}
-
 /** Relative strength vs SPY over 3 months (%) */
 async function rsVsBenchmark(
   closes: number[],
@@ -115,6 +154,33 @@ async function rsVsBenchmark(
   return (stockReturn - spyReturn) * 100;
 }
 
+/**
+ * Snapshot status classification (aligned with scan-engine classifyCandidate).
+ * Uses distance to ENTRY TRIGGER (not raw 20d high) to match scan engine.
+ */
+export function classifySnapshotStatus(input: {
+  close: number;
+  ma200: number;
+  adx: number;
+  plusDI: number;
+  minusDI: number;
+  entryTrigger: number;
+  distTo20: number;
+}): SnapshotStatus {
+  const { close, ma200, adx, plusDI, minusDI, entryTrigger, distTo20 } = input;
+  const distToTrigger = entryTrigger > 0 ? ((entryTrigger - close) / close) * 100 : 0;
+  const priceAboveMa200 = ma200 > 0 && close > ma200;
+  const bullishDI = plusDI > minusDI;
+
+  // Trend override
+  if (priceAboveMa200 && adx >= 20 && bullishDI && distTo20 > 5) return 'TREND';
+
+  if (!priceAboveMa200 || !bullishDI) return 'IGNORE';
+  if (distToTrigger <= 2) return 'READY';
+  if (distToTrigger <= 3) return 'WATCH';
+  return 'FAR';
+}
+
 // ── Main sync function ────────────────────────────────────────
 
 export async function syncSnapshot(
@@ -167,10 +233,16 @@ export async function syncSnapshot(
     ? Math.abs(spyPrice - spyMa200) / spyMa200 > 0.02
     : true; // Default to stable when data is unavailable
 
-  // 4. Get open positions for cluster exposure calc
+  // 4. Get open positions for cluster exposure calc — only the columns the
+  // risk aggregation reads, not full position + stock rows
   const openPositions = await prisma.position.findMany({
     where: { status: 'OPEN' },
-    include: { stock: true },
+    select: {
+      entryPrice: true,
+      currentStop: true,
+      shares: true,
+      stock: { select: { sleeve: true, currency: true, cluster: true, superCluster: true } },
+    },
   });
 
   // Get user equity
@@ -183,18 +255,25 @@ export async function syncSnapshot(
   const superClusterRisk = new Map<string, number>();
   let totalRisk = 0;
 
-  for (const pos of openPositions) {
-    // Skip HEDGE — excluded from risk calculations
-    if ((pos.stock as { sleeve?: string }).sleeve === 'HEDGE') continue;
+  // Skip HEDGE — excluded from risk calculations
+  const riskPositions = openPositions.filter((pos) => pos.stock.sleeve !== 'HEDGE');
+
+  // Resolve one GBP rate per distinct currency up front (in parallel) instead
+  // of awaiting getFXRate() serially for every open position.
+  const positionCurrency = (pos: (typeof openPositions)[number]) => (pos.stock.currency || 'USD').toUpperCase();
+  const fxCurrencies = Array.from(new Set(riskPositions.map(positionCurrency)))
+    .filter((c) => c !== 'GBP' && c !== 'GBX');
+  const fxToGbpByCurrency = new Map<string, number>([['GBP', 1], ['GBX', 0.01]]);
+  await Promise.all(fxCurrencies.map(async (currency) => {
+    let rate: number;
+    try { rate = await getFXRate(currency, 'GBP'); } catch { rate = 0.79; }
+    fxToGbpByCurrency.set(currency, rate);
+  }));
+
+  for (const pos of riskPositions) {
     const rawRisk = Math.max(0, (pos.entryPrice - pos.currentStop) * pos.shares);
     // Approximate GBP conversion
-    const currency = (pos.stock.currency || 'USD').toUpperCase();
-    let fxToGbp = 1;
-    if (currency !== 'GBP' && currency !== 'GBX') {
-      try { fxToGbp = await getFXRate(currency, 'GBP'); } catch { fxToGbp = 0.79; }
-    } else if (currency === 'GBX') {
-      fxToGbp = 0.01;
-    }
+    const fxToGbp = fxToGbpByCurrency.get(positionCurrency(pos)) ?? 1;
     const riskGbp = rawRisk * fxToGbp;
     totalRisk += riskGbp;
 
@@ -205,6 +284,16 @@ export async function syncSnapshot(
     superClusterRisk.set(superCluster, (superClusterRisk.get(superCluster) || 0) + riskGbp);
   }
 
+  // Exposure as % of equity, converted once per group — every ticker in a
+  // cluster shares the same value, so the per-ticker rows just look it up
+  const toEquityPct = (risks: Map<string, number>): Map<string, number> => {
+    const pct = new Map<string, number>();
+    risks.forEach((risk, key) => pct.set(key, equity > 0 ? (risk / equity) * 100 : 0));
+    return pct;
+  };
+  const clusterRiskPctByCluster = toEquityPct(clusterRisk);
+  const superClusterRiskPctByGroup = toEquityPct(superClusterRisk);
+
   // Early-warning thresholds for snapshot display (not hard trading gates)
   const maxClusterPct = SNAPSHOT_CLUSTER_WARNING;
   const maxSuperClusterPct = SNAPSHOT_SUPER_CLUSTER_WARNING;
@@ -221,13 +310,13 @@ export async function syncSnapshot(
   // 6. Process each stock in batches
   const failed: string[] = [];
   let done = 0;
-  const batchData: Record<string, unknown>[] = [];
+  const batchData: SnapshotTickerRow[] = [];
 
   for (let i = 0; i < stocks.length; i += BATCH_SIZE) {
     const batch = stocks.slice(i, i + BATCH_SIZE);
 
     const results = await Promise.allSettled(
-      batch.map(async (stock) => {
+      batch.map(async (stock): Promise<SnapshotTickerRow | null> => {
         try {
           // Batch daily + weekly fetch together to avoid separate API calls
           const [daily, weekly] = await Promise.all([
@@ -255,10 +344,11 @@ export async function syncSnapshot(
           const efficiency = calculateTrendEfficiency(closes, 20);
 
           // ── Highs / distances ──
-          const high20 = nDayHigh(daily, 20);
-          const high55 = nDayHigh(daily, 55);
+          // Window highs and volume averages come from one pass over the newest bars
+          const recent = recentBarStats(daily);
+          const { high20, high55 } = recent;
           // Prior 20d high (excl today) — for USE_PRIOR_20D_HIGH_FOR_TRIGGER env var
-          const priorHigh20 = daily.length > 1 ? nDayHigh(daily.slice(1), 20) : high20;
+          const priorHigh20 = recent.priorHigh20;
           const distTo20 = high20 > 0 ? ((high20 - close) / close) * 100 : 0;
           const distTo55 = high55 > 0 ? ((high55 - close) / close) * 100 : 0;
 
@@ -270,8 +360,8 @@ export async function syncSnapshot(
           const stopLevel = entryTrigger - atr14 * ATR_STOP_MULTIPLIER;
 
           // ── Chasing detection ──
-          const chasing20 = chasingLastN(daily, 20, 5);
-          const chasing55 = chasingLastN(daily, 55, 5);
+          const chasing20 = touchedHighLastN(daily, 20, high20, 5);
+          const chasing55 = touchedHighLastN(daily, 55, high55, 5);
 
           // ── ATR spike / collapse / compression ──
           const atrOld = atr20DaysAgo(daily);
@@ -281,15 +371,12 @@ export async function syncSnapshot(
           const atrCompressionRatio = atrOld && atrOld > 0 ? atr14 / atrOld : null;
 
           // ── Volume ──
-          const volRatio = volumeRatio(daily);
-          const dVol20 = dollarVol20(daily);
+          const volRatio = recent.volRatio;
+          const dVol20 = recent.dollarVol20;
           const liquidityOk = dVol20 > 500_000;
 
           // ── Breakout Integrity Score ──
-          const avgVol10 = daily.length > 10
-            ? daily.slice(1, 11).reduce((s, d) => s + d.volume, 0) / 10
-            : 0;
-          const bisScore = calcBIS(daily[0], avgVol10);
+          const bisScore = calcBIS(daily[0], recent.avgVol10);
 
           // ── Relative strength ──
           const rsPct = await rsVsBenchmark(closes, spyCloses);
@@ -299,33 +386,16 @@ export async function syncSnapshot(
             ? calculateADX(weekly, 14).adx
             : 0;
 
-          // ── Status classification (aligned with scan-engine classifyCandidate) ──
-          // Uses distance to ENTRY TRIGGER (not raw 20d high) to match scan engine
-          const distToTrigger = entryTrigger > 0 ? ((entryTrigger - close) / close) * 100 : 0;
-          let status: string;
-          const priceAboveMa200 = ma200 > 0 && close > ma200;
-          const bullishDI = plusDI > minusDI;
-
-          if (!priceAboveMa200 || !bullishDI) {
-            status = 'IGNORE';
-          } else if (distToTrigger <= 2) {
-            status = 'READY';
-          } else if (distToTrigger <= 3) {
-            status = 'WATCH';
-          } else {
-            status = 'FAR';
-          }
-
-          // Trend override
-          if (priceAboveMa200 && adx >= 20 && bullishDI && distTo20 > 5) {
-            status = 'TREND';
-          }
+          // ── Status classification ──
+          const status = classifySnapshotStatus({
+            close, ma200, adx, plusDI, minusDI, entryTrigger, distTo20,
+          });
 
           // ── Cluster exposure ──
           const cluster = stock.cluster || 'General';
           const superCluster = stock.superCluster || 'Other';
-          const clusterRiskPct = equity > 0 ? ((clusterRisk.get(cluster) || 0) / equity) * 100 : 0;
-          const superClusterRiskPct = equity > 0 ? ((superClusterRisk.get(superCluster) || 0) / equity) * 100 : 0;
+          const clusterRiskPct = clusterRiskPctByCluster.get(cluster) ?? 0;
+          const superClusterRiskPct = superClusterRiskPctByGroup.get(superCluster) ?? 0;
 
           // ── Build raw JSON (all key-value pairs) ──
           const rawJson = JSON.stringify({
@@ -438,9 +508,7 @@ export async function syncSnapshot(
     const chunk = batchData.slice(b, b + WRITE_BATCH_SIZE);
     await prisma.$transaction(
       chunk.map((d) =>
-        prisma.snapshotTicker.create({
-          data: d as Parameters<typeof prisma.snapshotTicker.create>[0]['data'],
-        })
+        prisma.snapshotTicker.create({ data: d })
       )
     );
   }
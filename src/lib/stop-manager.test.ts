@@ -32,6 +32,11 @@ describe('stop-manager formulas', () => {
     expect(stop).toBe(140);
   });
 
+  it('falls back to the lock floor when the LOCK_1R_TRAIL inputs are not finite', () => {
+    expect(calculateProtectionStop(100, 10, 'LOCK_1R_TRAIL', NaN, 5)).toBe(110);
+    expect(calculateProtectionStop(100, 10, 'LOCK_1R_TRAIL', 150, NaN)).toBe(110);
+  });
+
   it('recommends breakeven upgrade when +1.5R is reached', () => {
     const rec = calculateStopRecommendation(116, 100, 10, 90, 'INITIAL');
     expect(rec).not.toBeNull();
@@ -39,6 +44,12 @@ describe('stop-manager formulas', () => {
     expect(rec?.newStop).toBe(100);
   });
 
+  it('treats an unknown stored protection level as below INITIAL', () => {
+    const rec = calculateStopRecommendation(116, 100, 10, 90, 'LEGACY' as ProtectionLevel);
+    expect(rec?.newLevel).toBe('BREAKEVEN');
+    expect(rec?.newStop).toBe(100);
+  });
+
   it('returns null when recommended level is not an upgrade', () => {
     const rec = calculateStopRecommendation(118, 100, 10, 100, 'BREAKEVEN');
     expect(rec).toBeNull();
@@ -315,4 +326,86 @@ describe('calculateTrailingATRStop regressions', () => {
 
     spy.mockRestore();
   });
+
+  it('ignores NaN bars instead of letting them poison the ratchet', async () => {
+    const chronological = Array.from({ length: 30 }, (_, idx) => ({
+      date: isoDay(idx + 1),
+      high: idx === 18 ? NaN : 102.5,
+      low: 97.5,
+      close: idx === 22 ? NaN : 100,
+    }));
+
+    const bars = newestFirstFromChronological(chronological);
+    const entryDate = new Date(`${isoDay(15)}T00:00:00.000Z`);
+
+    const spy = vi.spyOn(marketData, 'getDailyPrices');
+    spy.mockResolvedValueOnce(bars as Awaited<ReturnType<typeof marketData.getDailyPrices>>);
+
+    const result = await calculateTrailingATRStop('NAN_BARS', 100, entryDate, 80, 2.0);
+    expect(result).not.toBeNull();
+    // Same stop as the all-finite constant-TR series — bad bars are skipped
+    expect(result?.highestClose).toBe(100);
+    expect(result?.trailingStop).toBe(90);
+
+    spy.mockRestore();
+  });
+
+  it('matches a per-window reference ATR walk on a long series with bad bars', async () => {
+    // Deterministic random walk (LCG) — 400 sessions with a few NaN bars
+    let seed = 42;
+    const rand = () => {
+      seed = (seed * 1664525 + 1013904223) % 4294967296;
+      return seed / 4294967296;
+    };
+    const chronological: Array<{ date: string; high: number; low: number; close: number }> = [];
+    let close = 100;
+    for (let idx = 0; idx < 400; idx++) {
+      close = Math.max(5, close * (1 + (rand() - 0.48) * 0.04));
+      const range = close * (0.005 + rand() * 0.03);
+      const bad = idx === 120 || idx === 121 || idx === 260;
+      chronological.push({
+        date: new Date(Date.UTC(2024, 0, 1 + idx)).toISOString().split('T')[0],
+        high: bad ? NaN : close + range / 2,
+        low: close - range / 2,
+        close: idx === 300 ? NaN : close,
+      });
+    }
+    const entryPrice = chronological[50].close;
+    const currentStop = entryPrice * 0.9;
+    const entryDate = new Date(`${chronological[50].date}T00:00:00.000Z`);
+
+    // Reference: fresh slice + sum per bar, ratchets via plain comparisons
+    const startIdx = 50 - 14;
+    const relevant = chronological.slice(startIdx);
+    let refHighest = entryPrice;
+    let refStop = currentStop;
+    for (let i = 14; i < relevant.length; i++) {
+      const window = relevant.slice(i - 14, i + 1);
+      let sum = 0;
+      for (let j = 1; j < window.length; j++) {
+        sum += Math.max(
+          window[j].high - window[j].low,
+          Math.abs(window[j].high - window[j - 1].close),
+          Math.abs(window[j].low - window[j - 1].close)
+        );
+      }
+      const atr = sum / 14;
+      if (relevant[i].close > refHighest) refHighest = relevant[i].close;
+      const candidate = refHighest - 2.0 * atr;
+      if (candidate > refStop) refStop = candidate;
+    }
+
+    const spy = vi.spyOn(marketData, 'getDailyPrices');
+    spy.mockResolvedValueOnce(
+      newestFirstFromChronological(chronological) as Awaited<ReturnType<typeof marketData.getDailyPrices>>
+    );
+
+    const result = await calculateTrailingATRStop('LONG', entryPrice, entryDate, currentStop, 2.0);
+    expect(result).not.toBeNull();
+    expect(result?.highestClose).toBe(refHighest);
+    // Exact match — both sum each 14-bar window in the same order
+    expect(result?.trailingStop).toBe(Math.round(refStop * 100) / 100);
+
+    spy.mockRestore();
+  });
 });
@@ -3,7 +3,7 @@
  * Consumed by: nightly.ts, /api/stops/route.ts, /api/stops/sync/route.ts, /api/stops/t212/route.ts, /api/nightly/route.ts, /api/modules/route.ts, /api/positions/hedge/route.ts
  * Consumes: prisma.ts, market-data.ts, @/types
  * Risk-sensitive: YES
- * Last modified: 2026-02-19
+ * Last modified: 2026-10-14
  * Notes: Stops NEVER decrease. Monotonic enforcement is the most important rule in the system.
  */
 // ============================================================
@@ -24,6 +24,25 @@ export class StopLossError extends Error {
   }
 }
 
+/**
+ * NaN-safe max: a non-finite operand is treated as missing and the other is
+ * returned. Lets stop ratchets stay a single max() without isFinite cascades,
+ * and guarantees a bad ATR/price sample can never poison a stop.
+ */
+function maxFinite(current: number, candidate: number): number {
+  if (!Number.isFinite(candidate)) return current;
+  if (!Number.isFinite(current)) return candidate;
+  return Math.max(current, candidate);
+}
+
+// Protection ladder order — built once; looked up per position on every stop pass
+const PROTECTION_LEVEL_RANK: Record<ProtectionLevel, number> = {
+  INITIAL: 0,
+  BREAKEVEN: 1,
+  LOCK_08R: 2,
+  LOCK_1R_TRAIL: 3,
+};
+
 /**
  * Determines the appropriate protection level based on R-multiple
  */
@@ -72,11 +91,9 @@ export function calculateProtectionStop(
       return entryPrice + 0.5 * initialRisk; // Lock +0.5R above entry
     case 'LOCK_1R_TRAIL': {
       const lockFloor = entryPrice + 1.0 * initialRisk; // Lock +1R above entry
-      if (currentPrice != null && currentATR != null && currentATR > 0) {
-        const trailingStop = currentPrice - 2 * currentATR;
-        return Math.max(lockFloor, trailingStop);
-      }
-      return lockFloor;
+      if (currentPrice == null || currentATR == null || !(currentATR > 0)) return lockFloor;
+      // Non-finite trailing candidate falls back to the lock floor
+      return maxFinite(lockFloor, currentPrice - 2 * currentATR);
     }
     default:
       return entryPrice - initialRisk;
@@ -105,10 +122,10 @@ export function calculateStopRecommendation(
   const rMultiple = (currentPrice - entryPrice) / initialRisk;
   const recommendedLevel = getProtectionLevel(rMultiple);
 
-  // Only upgrade protection, never downgrade
-  const levelOrder: ProtectionLevel[] = ['INITIAL', 'BREAKEVEN', 'LOCK_08R', 'LOCK_1R_TRAIL'];
-  const currentIdx = levelOrder.indexOf(currentLevel);
-  const recommendedIdx = levelOrder.indexOf(recommendedLevel);
+  // Only upgrade protection, never downgrade.
+  // Unknown levels (bad DB value) rank below INITIAL so any real level is an upgrade.
+  const currentIdx = PROTECTION_LEVEL_RANK[currentLevel] ?? -1;
+  const recommendedIdx = PROTECTION_LEVEL_RANK[recommendedLevel];
 
   if (recommendedIdx <= currentIdx) return null;
 
@@ -204,10 +221,26 @@ export async function generateStopRecommendations(
     reason: string;
   }[]
 > {
-  const positions = await prisma.position.findMany({
+  // Load only the fields the stop pass reads, then normalise each row once
+  const rows = await prisma.position.findMany({
     where: { userId, status: 'OPEN' },
-    include: { stock: { select: { ticker: true } } },
+    select: {
+      id: true,
+      entryPrice: true,
+      initialRisk: true,
+      currentStop: true,
+      protectionLevel: true,
+      stock: { select: { ticker: true } },
+    },
   });
+  const positions = rows.map((row) => ({
+    id: row.id,
+    ticker: row.stock.ticker,
+    entryPrice: row.entryPrice,
+    initialRisk: row.initialRisk,
+    currentStop: row.currentStop,
+    protectionLevel: (row.protectionLevel as ProtectionLevel) ?? 'INITIAL',
+  }));
 
   const recommendations: {
     positionId: string;
@@ -219,7 +252,7 @@ export async function generateStopRecommendations(
   }[] = [];
 
   for (const position of positions) {
-    const currentPrice = currentPrices.get(position.stock.ticker);
+    const currentPrice = currentPrices.get(position.ticker);
     if (!currentPrice) continue;
 
     const rec = calculateStopRecommendation(
@@ -227,14 +260,14 @@ export async function generateStopRecommendations(
       position.entryPrice,
       position.initialRisk,
       position.currentStop,
-      (position.protectionLevel as ProtectionLevel) ?? 'INITIAL',
-      currentATRs?.get(position.stock.ticker)
+      position.protectionLevel,
+      currentATRs?.get(position.ticker)
     );
 
     if (rec) {
       recommendations.push({
         positionId: position.id,
-        ticker: position.stock.ticker,
+        ticker: position.ticker,
         currentStop: position.currentStop,
         ...rec,
       });
@@ -272,9 +305,6 @@ export async function calculateTrailingATRStop(
     const bars = await getDailyPrices(ticker, 'full');
     if (bars.length < 20) return null;
 
-    // bars are sorted newest-first; reverse for chronological processing
-    const chronological = [...bars].reverse();
-
     // Sanity check: if the DB entry price is wildly different from recent Yahoo prices,
     // the position data is likely corrupted (e.g. currency mismatch on import).
     // Skip trailing ATR calculation to avoid producing nonsensical stop values.
@@ -288,48 +318,51 @@ export async function calculateTrailingATRStop(
       }
     }
 
+    // bars are sorted newest-first. Walk them chronologically by index rather
+    // than copying + reversing the whole history and slicing it again:
+    // chronological position k is bars[n - 1 - k].
+    const n = bars.length;
+
     // Find bars since entry date
     const entryDateStr = entryDate.toISOString().split('T')[0];
-    const entryIdx = chronological.findIndex(b => b.date >= entryDateStr);
-    if (entryIdx < 0) return null;
+    let entryIdx = 0;
+    while (entryIdx < n && bars[n - 1 - entryIdx].date < entryDateStr) entryIdx++;
+    if (entryIdx === n) return null;
 
     // Need at least 14 bars before entry for ATR calc
     const startIdx = Math.max(0, entryIdx - 14);
-    const relevantBars = chronological.slice(startIdx);
+    const relevantCount = n - startIdx;
+    const relevantBar = (j: number) => bars[n - 1 - startIdx - j];
 
     let highestClose = entryPrice;
     let trailingStop = currentStop;
 
     // Walk forward from entry, calculating ATR and trailing stop at each bar
-    for (let i = 14; i < relevantBars.length; i++) {
-      const bar = relevantBars[i];
+    for (let i = 14; i < relevantCount; i++) {
+      const bar = relevantBar(i);
       if (bar.date < entryDateStr) continue;
 
-      // Calculate rolling 14-period ATR
-      const atrSlice = relevantBars.slice(i - 14, i + 1);
-      const trs: number[] = [];
-      for (let j = 1; j < atrSlice.length; j++) {
-        const tr = Math.max(
-          atrSlice[j].high - atrSlice[j].low,
-          Math.abs(atrSlice[j].high - atrSlice[j - 1].close),
-          Math.abs(atrSlice[j].low - atrSlice[j - 1].close)
+      // Calculate rolling 14-period ATR — true ranges are summed in place
+      // over bars (i-13 .. i), no per-bar slice or intermediate TR array.
+      let trSum = 0;
+      for (let j = i - 13; j <= i; j++) {
+        const cur = relevantBar(j);
+        const prevClose = relevantBar(j - 1).close;
+        trSum += Math.max(
+          cur.high - cur.low,
+          Math.abs(cur.high - prevClose),
+          Math.abs(cur.low - prevClose)
         );
-        trs.push(tr);
       }
-      const atr = trs.reduce((s, v) => s + v, 0) / trs.length;
+      const atr = trSum / 14;
 
-      // Track highest close since entry
-      if (bar.close > highestClose) {
-        highestClose = bar.close;
-      }
+      // Track highest close since entry, then ratchet the stop.
+      // Both are running maxima over finite samples.
+      highestClose = maxFinite(highestClose, bar.close);
 
       // Trailing stop = highestClose - (multiplier × ATR)
-      const candidateStop = highestClose - atrMultiplier * atr;
-
-      // Monotonic: only ratchet up
-      if (candidateStop > trailingStop) {
-        trailingStop = candidateStop;
-      }
+      // Monotonic: only ratchet up (a non-finite candidate is ignored)
+      trailingStop = maxFinite(trailingStop, highestClose - atrMultiplier * atr);
     }
 
     // Current ATR (most recent 14 bars)
@@ -368,7 +401,13 @@ export async function generateTrailingStopRecommendations(
 }[]> {
   const positions = await prisma.position.findMany({
     where: { userId, status: 'OPEN' },
-    include: { stock: { select: { ticker: true, currency: true } } },
+    select: {
+      id: true,
+      entryPrice: true,
+      entryDate: true,
+      currentStop: true,
+      stock: { select: { ticker: true, currency: true } },
+    },
   });
 
   const recommendations: {
@@ -382,29 +421,33 @@ export async function generateTrailingStopRecommendations(
     priceCurrency: string;
   }[] = [];
 
-  for (const position of positions) {
-    const result = await calculateTrailingATRStop(
-      position.stock.ticker,
-      position.entryPrice,
-      position.entryDate,
-      position.currentStop
-    );
-
-    const isUK = position.stock.ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(position.stock.ticker);
-    const priceCurrency = isUK ? 'GBX' : (position.stock.currency || 'USD').toUpperCase();
-
-    if (result && result.shouldUpdate) {
-      recommendations.push({
-        positionId: position.id,
-        ticker: position.stock.ticker,
-        currentStop: position.currentStop,
-        trailingStop: result.trailingStop,
-        highestClose: result.highestClose,
-        currentATR: result.currentATR,
-        reason: `Trailing ATR stop: High ${result.highestClose.toFixed(2)} − 2×ATR(${result.currentATR.toFixed(2)}) = ${result.trailingStop.toFixed(2)}`,
-        priceCurrency,
-      });
-    }
+  // Positions are independent — evaluate them concurrently (bar fetches still
+  // go through the rate-limited chart queue) and collect in position order.
+  // calculateTrailingATRStop never rejects; failures come back as null.
+  const results = await Promise.all(
+    positions.map((p) => calculateTrailingATRStop(p.stock.ticker, p.entryPrice, p.entryDate, p.currentStop))
+  );
+
+  for (let i = 0; i < positions.length; i++) {
+    // Read each field once into locals
+    const { id, currentStop, stock: { ticker, currency } } = positions[i];
+    const result = results[i];
+    if (!result || !result.shouldUpdate) continue;
+
+    const { trailingStop, highestClose, currentATR } = result;
+    // Display fields are only built for positions that produce a recommendation
+    const isUK = ticker.endsWith('.L') || /^[A-Z]{2,5}l$/.test(ticker);
+    const priceCurrency = isUK ? 'GBX' : (currency || 'USD').toUpperCase();
+    recommendations.push({
+      positionId: id,
+      ticker,
+      currentStop,
+      trailingStop,
+      highestClose,
+      currentATR,
+      reason: `Trailing ATR stop: High ${highestClose.toFixed(2)} − 2×ATR(${currentATR.toFixed(2)}) = ${trailingStop.toFixed(2)}`,
+      priceCurrency,
+    });
   }
 
   return recommendations;
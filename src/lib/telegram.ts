@@ -10,14 +10,14 @@ interface TelegramMessage {
   parseMode?: 'HTML' | 'Markdown' | 'MarkdownV2';
 }
 
+const HTML_ESCAPES: Record<string, string> = { '&': '&amp;', '<': '&lt;', '>': '&gt;' };
+
 /**
- * Escape HTML special characters for Telegram parse_mode=HTML
+ * Escape HTML special characters for Telegram parse_mode=HTML.
+ * Single regex pass; strings with nothing to escape are returned as-is.
  */
 function escapeHtml(text: string): string {
-  return text
-    .replace(/&/g, '&amp;')
-    .replace(/</g, '&lt;')
-    .replace(/>/g, '&gt;');
+  return /[&<>]/.test(text) ? text.replace(/[&<>]/g, (ch) => HTML_ESCAPES[ch]) : text;
 }
 
 /**
@@ -36,18 +36,21 @@ export async function sendTelegramMessage(message: TelegramMessage): Promise<boo
   if (message.text.length <= MAX_LEN) {
     chunks.push(message.text);
   } else {
-    // Split on newline boundaries to avoid breaking HTML tags
-    let remaining = message.text;
-    while (remaining.length > 0) {
-      if (remaining.length <= MAX_LEN) {
-        chunks.push(remaining);
+    // Split on newline boundaries to avoid breaking HTML tags.
+    // Walk a cursor over the original text so each chunk is sliced once,
+    // rather than re-copying the whole remaining tail after every split.
+    const text = message.text;
+    let start = 0;
+    while (start < text.length) {
+      if (text.length - start <= MAX_LEN) {
+        chunks.push(text.slice(start));
         break;
       }
       // Find last newline within limit
-      let splitIdx = remaining.lastIndexOf('\n', MAX_LEN);
+      let splitIdx = text.lastIndexOf('\n', start + MAX_LEN) - start;
       if (splitIdx <= 0) splitIdx = MAX_LEN; // fallback: hard split
-      chunks.push(remaining.slice(0, splitIdx));
-      remaining = remaining.slice(splitIdx + 1);
+      chunks.push(text.slice(start, start + splitIdx));
+      start += splitIdx + 1;
     }
   }
 
@@ -471,12 +474,12 @@ ${alertsText}
   return sendTelegramMessage({ text });
 }
 
+const CURRENCY_SYMBOLS = new Map<string, string>([['GBP', '£'], ['GBX', '£'], ['EUR', '€']]);
+
+// Called once per report row — codes normally arrive upper-case already,
+// so only fall back to toUpperCase() on a miss.
 function currencySymbol(currency: string): string {
-  switch (currency.toUpperCase()) {
-    case 'GBP': case 'GBX': return '£';
-    case 'EUR': return '€';
-    default: return '$';
-  }
+  return CURRENCY_SYMBOLS.get(currency) ?? CURRENCY_SYMBOLS.get(currency.toUpperCase()) ?? '$';
 }
 
 /**
@@ -5,13 +5,32 @@ export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs));
 }
 
+// Building an Intl.NumberFormat costs far more than calling format() on one,
+// and tables call these helpers per cell — so each formatter is built once
+// per currency / precision and reused.
+const currencyFormatters = new Map<string, Intl.NumberFormat>();
+const numberFormatters = new Map<number, Intl.NumberFormat>();
+const PENCE_FORMATTER = new Intl.NumberFormat('en-GB', {
+  minimumFractionDigits: 2,
+  maximumFractionDigits: 2,
+});
+
+function currencyFormatter(currency: string): Intl.NumberFormat {
+  let formatter = currencyFormatters.get(currency);
+  if (!formatter) {
+    formatter = new Intl.NumberFormat('en-GB', {
+      style: 'currency',
+      currency,
+      minimumFractionDigits: 2,
+      maximumFractionDigits: 2,
+    });
+    currencyFormatters.set(currency, formatter);
+  }
+  return formatter;
+}
+
 export function formatCurrency(value: number, currency = 'GBP'): string {
-  return new Intl.NumberFormat('en-GB', {
-    style: 'currency',
-    currency,
-    minimumFractionDigits: 2,
-    maximumFractionDigits: 2,
-  }).format(value);
+  return currencyFormatter(currency).format(value);
 }
 
 /**
@@ -20,17 +39,9 @@ export function formatCurrency(value: number, currency = 'GBP'): string {
  */
 export function formatPrice(value: number, priceCurrency = 'GBP'): string {
   if (priceCurrency === 'GBX' || priceCurrency === 'GBp') {
-    return `${new Intl.NumberFormat('en-GB', {
-      minimumFractionDigits: 2,
-      maximumFractionDigits: 2,
-    }).format(value)}p`;
+    return `${PENCE_FORMATTER.format(value)}p`;
   }
-  return new Intl.NumberFormat('en-GB', {
-    style: 'currency',
-    currency: priceCurrency,
-    minimumFractionDigits: 2,
-    maximumFractionDigits: 2,
-  }).format(value);
+  return currencyFormatter(priceCurrency).format(value);
 }
 
 export function formatPercent(value: number, decimals = 2): string {
@@ -39,10 +50,15 @@ export function formatPercent(value: number, decimals = 2): string {
 }
 
 export function formatNumber(value: number, decimals = 0): string {
-  return new Intl.NumberFormat('en-US', {
-    minimumFractionDigits: decimals,
-    maximumFractionDigits: decimals,
-  }).format(value);
+  let formatter = numberFormatters.get(decimals);
+  if (!formatter) {
+    formatter = new Intl.NumberFormat('en-US', {
+      minimumFractionDigits: decimals,
+      maximumFractionDigits: decimals,
+    });
+    numberFormatters.set(decimals, formatter);
+  }
+  return formatter.format(value);
 }
 
 export function formatR(rMultiple: number): string {